@@ -3,9 +3,11 @@ Main application package for PNCP API Client.
 """
 from flask import Flask
 from app.config.settings import config
-from app.extensions import redis_client
+from app.extensions import redis_client, metrics, request_timing, json_codec, cache_stats, compression, assets, page_cache, profiler, admission, outbound_governor
 from app.api.blueprints import register_blueprints
 from app.config.logging_config import setup_logging
+from app.utils.health import health_prober
+from app.core.services.tender_feed import tender_feed
 import os
 
 
@@ -37,6 +39,18 @@ def create_app(config_name: str = 'development') -> Flask:
     
     # Initialize extensions
     redis_client.init_app(app)
+    metrics.init_app(app)
+    request_timing.init_app(app)
+    json_codec.init_app(app)
+    cache_stats.init_app(app)
+    compression.init_app(app)
+    assets.init_app(app)
+    page_cache.init_app(app)
+    profiler.init_app(app)
+    admission.init_app(app)
+    outbound_governor.init_app(app)
+    health_prober.init_app(app)
+    tender_feed.init_app(app)
     
     # Register blueprints
     register_blueprints(app)
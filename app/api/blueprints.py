@@ -5,6 +5,9 @@ from flask import Flask
 from app.api.routes.main import main_bp
 from app.api.routes.api import api_bp
 from app.api.routes.proxy import proxy_bp
+from app.api.routes.metrics import metrics_bp
+from app.api.routes.admin import admin_bp
+from app.api.routes.assets import assets_bp
 
 
 def register_blueprints(app: Flask) -> None:
@@ -16,4 +19,7 @@ def register_blueprints(app: Flask) -> None:
     """
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp)
-    app.register_blueprint(proxy_bp)
\ No newline at end of file
+    app.register_blueprint(proxy_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(assets_bp)
\ No newline at end of file
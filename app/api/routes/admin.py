@@ -0,0 +1,104 @@
+"""
+Admin routes for PNCP API Client.
+"""
+import os
+from flask import Blueprint, request, jsonify, send_from_directory
+import logging
+from app.extensions import cache_stats, profiler
+from app.core.services.invalidation import cache_invalidator
+from app.utils.auth import admin_required
+
+# Create blueprint
+admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@admin_bp.route('/profiler/start', methods=['POST'])
+@admin_required
+def start_profiler():
+    """Profile every thread of the worker serving this request for a time window."""
+    try:
+        seconds = float(request.args.get('seconds', 30))
+    except ValueError:
+        return jsonify({"error": "Invalid seconds value"}), 400
+    
+    if not profiler.start_window(seconds):
+        return jsonify({"error": "A profiling window is already running in this worker"}), 409
+    
+    return jsonify({
+        "status": "started",
+        "seconds": min(seconds, profiler.max_window),
+        "worker_pid": os.getpid()
+    }), 202
+
+
+@admin_bp.route('/profiler/captures')
+@admin_required
+def list_profiler_captures():
+    """List saved profiler captures."""
+    return jsonify({"captures": profiler.list_captures()}), 200
+
+
+@admin_bp.route('/profiler/captures/<name>')
+@admin_required
+def download_profiler_capture(name):
+    """Download a profiler capture in collapsed-stack format."""
+    if not profiler.is_valid_capture_name(name):
+        return jsonify({"error": "Invalid capture name"}), 400
+    
+    return send_from_directory(
+        os.path.abspath(profiler.output_dir),
+        name,
+        mimetype='text/plain',
+        as_attachment=True
+    )
+
+
+@admin_bp.route('/cache/purge', methods=['POST'])
+@admin_required
+def purge_cache():
+    """
+    Purge cache entries by tag, or all of them.
+    
+    Body: {"tags": ["uf:SP", "data:202403", "ns:open_tenders"]} or {"all": true}
+    """
+    payload = request.get_json(silent=True) or {}
+    
+    if payload.get('all') is True:
+        if not cache_invalidator.purge_all():
+            return jsonify({"error": "Cache unavailable"}), 503
+        return jsonify({"status": "purged", "all": True}), 200
+    
+    tags = payload.get('tags')
+    if not isinstance(tags, list) or not tags:
+        return jsonify({"error": "Provide a non-empty list of tags or all: true"}), 400
+    
+    try:
+        purged = cache_invalidator.purge(tags)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    logger.info(f"Cache purged by admin: {purged}")
+    return jsonify({"status": "purged", "deleted": purged, "total": sum(purged.values())}), 200
+
+
+@admin_bp.route('/cache/stats')
+@admin_required
+def get_cache_stats():
+    """Report cache hits, misses, fills and hot keys by namespace for the worker serving this request."""
+    try:
+        top = min(max(int(request.args.get('top', 20)), 1), 1000)
+    except ValueError:
+        return jsonify({"error": "Invalid top value"}), 400
+    
+    return jsonify(cache_stats.report(top)), 200
+
+
+@admin_bp.route('/cache/stats/reset', methods=['POST'])
+@admin_required
+def reset_cache_stats():
+    """Clear the cache counters of the worker serving this request."""
+    cache_stats.reset()
+    return jsonify({"status": "reset", "worker_pid": os.getpid()}), 200
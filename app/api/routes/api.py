@@ -6,9 +6,12 @@ import requests
 from datetime import datetime, timedelta
 import logging
 from app.extensions import redis_client
+from app.extensions.admission import admission
 from app.extensions.rate_limiter import rate_limiter
 from app.core.services.pncp_service import PNCPService
-from app.utils.health import HealthChecker
+from app.core.services.saved_searches import saved_searches
+from app.core.services.tender_feed import tender_feed
+from app.utils.health import health_prober
 
 # Create blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -18,7 +21,6 @@ logger = logging.getLogger(__name__)
 
 # Initialize services
 pncp_service = PNCPService()
-health_checker = HealthChecker()
 
 
 @api_bp.route('/test')
@@ -29,47 +31,35 @@ def test_api():
 
 @api_bp.route('/health')
 def health_check():
-    """Comprehensive health check endpoint."""
-    try:
-        # Check all system components
-        redis_health = health_checker.check_redis_health()
-        pncp_api_health = health_checker.check_pncp_api_health()
-        cache_stats = health_checker.get_cache_statistics()
-        
-        # Determine overall status
-        overall_status = "healthy"
-        if redis_health["status"] != "healthy" or pncp_api_health["status"] not in ["healthy", "degraded"]:
-            overall_status = "degraded"
-        if redis_health["status"] == "unhealthy" and pncp_api_health["status"] == "unhealthy":
-            overall_status = "unhealthy"
-        
-        health_data = {
-            "status": overall_status,
-            "timestamp": datetime.now().isoformat(),
-            "version": "1.0.0",
-            "services": {
-                "redis": redis_health,
-                "pncp_api": pncp_api_health
-            },
-            "cache": cache_stats,
-            "uptime": "Service running"
-        }
-        
-        # Return appropriate HTTP status code
-        status_code = 200 if overall_status == "healthy" else 503
-        return jsonify(health_data), status_code
-        
-    except Exception as e:
-        logger.error(f"Error in health check: {str(e)}")
+    """System health status from the latest background probe."""
+    snapshot = health_prober.snapshot()
+    if snapshot is None:
         return jsonify({
-            "status": "error",
-            "timestamp": datetime.now().isoformat(),
-            "error": str(e)
-        }), 500
+            "overall_status": "starting",
+            "timestamp": datetime.now().isoformat()
+        }), 503
+    
+    # Degraded still serves traffic (e.g. from cache), so only hard failures are 503
+    status_code = 503 if snapshot["overall_status"] in ["unhealthy", "critical"] else 200
+    return jsonify(snapshot), status_code
+
+
+@api_bp.route('/health/live')
+def liveness():
+    """Liveness probe: the worker is up and answering requests."""
+    return jsonify({"status": "alive"}), 200
+
+
+@api_bp.route('/health/ready')
+def readiness():
+    """Readiness probe: the worker can serve data from cache or the PNCP API."""
+    ready, reason = health_prober.is_ready()
+    return jsonify({"status": "ready" if ready else "not_ready", "reason": reason}), 200 if ready else 503
 
 
 @api_bp.route('/licitacoes/abertas')
 @rate_limiter.limit(max_requests=30, window=60)  # 30 requests per minute
+@admission.limit('licitacoes')
 def get_open_tenders():
     """Get open tenders from PNCP API with Redis caching and rate limiting."""
     try:
@@ -79,7 +69,14 @@ def get_open_tenders():
         return jsonify({"error": str(e)}), 500
 
 
+@api_bp.route('/licitacoes/stream')
+def stream_new_tenders():
+    """Server-Sent Events stream of newly published tenders matching the filters."""
+    return tender_feed.stream_response(request.args)
+
+
 @api_bp.route('/licitacoes/detalhes/<path:numeroControlePNCP>')
+@admission.limit('detalhes')
 def get_tender_details(numeroControlePNCP):
     """Get details for a specific tender."""
     try:
@@ -89,7 +86,45 @@ def get_tender_details(numeroControlePNCP):
         return jsonify({"error": str(e)}), 500
 
 
+@api_bp.route('/licitacoes/lote', methods=['POST'])
+@rate_limiter.limit(max_requests=10, window=60)  # 10 batches per minute
+@admission.limit('lote', eager=True)  # PNCP is called while the body streams
+def get_tenders_batch():
+    """Resolve many tenders at once (NDJSON stream, one line per tender)."""
+    try:
+        return pncp_service.get_tenders_batch(request.get_json(silent=True))
+    except Exception as e:
+        logger.error(f"Error in get_tenders_batch: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@api_bp.route('/buscas', methods=['GET'])
+def list_saved_searches():
+    """List the saved searches of this browser with their count of new tenders."""
+    return saved_searches.list(request.headers.get('X-Client-Id'))
+
+
+@api_bp.route('/buscas', methods=['POST'])
+@rate_limiter.limit(max_requests=20, window=60)  # 20 searches saved per minute
+def create_saved_search():
+    """Save a search for this browser."""
+    return saved_searches.create(request.headers.get('X-Client-Id'), request.get_json(silent=True))
+
+
+@api_bp.route('/buscas/<search_id>/visto', methods=['POST'])
+def view_saved_search(search_id):
+    """Get the tenders found for a saved search since it was last viewed, and reset its counter."""
+    return saved_searches.view(request.headers.get('X-Client-Id'), search_id)
+
+
+@api_bp.route('/buscas/<search_id>', methods=['DELETE'])
+def delete_saved_search(search_id):
+    """Delete a saved search."""
+    return saved_searches.delete(request.headers.get('X-Client-Id'), search_id)
+
+
 @api_bp.route('/estatisticas/modalidades')
+@admission.limit('estatisticas')
 def get_modalidade_stats():
     """Get statistics by modality from real PNCP API with Redis caching."""
     try:
@@ -100,6 +135,7 @@ def get_modalidade_stats():
 
 
 @api_bp.route('/estatisticas/uf')
+@admission.limit('estatisticas')
 def get_uf_stats():
     """Get statistics by UF from real PNCP API with Redis caching."""
     try:
@@ -110,6 +146,7 @@ def get_uf_stats():
 
 
 @api_bp.route('/estatisticas/tipo_orgao')
+@admission.limit('estatisticas')
 def get_tipo_orgao_stats():
     """Get statistics by organization type from real PNCP API with Redis caching."""
     try:
@@ -120,6 +157,7 @@ def get_tipo_orgao_stats():
 
 
 @api_bp.route('/estatisticas/contratos')
+@admission.limit('estatisticas')
 def get_contratos_stats():
     """Get contracts statistics from real PNCP API with Redis caching."""
     try:
@@ -130,6 +168,7 @@ def get_contratos_stats():
 
 
 @api_bp.route('/estatisticas/atas')
+@admission.limit('estatisticas')
 def get_atas_stats():
     """Get price registration records statistics from real PNCP API with Redis caching."""
     try:
@@ -140,6 +179,7 @@ def get_atas_stats():
 
 
 @api_bp.route('/estatisticas/planos')
+@admission.limit('estatisticas')
 def get_planos_stats():
     """Get procurement plans statistics from real PNCP API with Redis caching."""
     try:
@@ -147,31 +187,3 @@ def get_planos_stats():
     except Exception as e:
         logger.error(f"Error in get_planos_stats: {str(e)}")
         return jsonify({"error": str(e)}), 500
-
-
-@api_bp.route('/health')
-def get_health():
-    """Get system health status."""
-    try:
-        from app.utils.health import HealthChecker
-        health_data = HealthChecker.get_system_health()
-        
-        # Determine HTTP status code based on overall status
-        status_code = 200
-        if health_data["overall_status"] == "unhealthy":
-            status_code = 503  # Service Unavailable
-        elif health_data["overall_status"] == "critical":
-            status_code = 503  # Service Unavailable
-        elif health_data["overall_status"] == "degraded":
-            status_code = 200  # OK but with warnings
-        
-        return jsonify(health_data), status_code
-    except Exception as e:
-        logger.error(f"Error in get_health: {str(e)}")
-        return jsonify({
-            "overall_status": "error",
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
-
-
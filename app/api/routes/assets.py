@@ -0,0 +1,33 @@
+"""
+Static asset bundle routes for PNCP API Client.
+"""
+import mimetypes
+from flask import Blueprint, abort, send_from_directory
+from app.extensions import assets
+
+# Create blueprint
+assets_bp = Blueprint('assets', __name__)
+
+
+@assets_bp.route('/static/dist/<path:filename>')
+def dist_file(filename):
+    """Serve a fingerprinted bundle, precompressed when the client accepts it."""
+    if filename.endswith(('.gz', '.br')) or filename == 'manifest.json':
+        abort(404)
+
+    served, encoding = assets.select_variant(filename)
+    response = send_from_directory(
+        assets.dist_dir,
+        served,
+        mimetype=mimetypes.guess_type(filename)[0],
+        max_age=assets.max_age
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+        # send_file names the precompressed copy, which must stay transparent
+        response.headers.pop('Content-Disposition', None)
+    response.vary.add('Accept-Encoding')
+    # The URL changes with the content, so browsers never need to revalidate
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,18 @@
+"""
+Metrics routes for PNCP API Client.
+"""
+from flask import Blueprint, Response, jsonify
+from app.extensions import metrics
+
+# Create blueprint
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics')
+def prometheus_metrics():
+    """Expose application metrics in the Prometheus text format."""
+    if not metrics.enabled:
+        return jsonify({"error": "Metrics are disabled"}), 503
+    
+    payload, content_type = metrics.render()
+    return Response(payload, headers={'Content-Type': content_type})
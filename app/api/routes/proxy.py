@@ -1,10 +1,12 @@
 """
 Proxy routes for PNCP API Client.
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 import requests
 import logging
 from app.config.settings import config
+from app.core.services.upstream import upstream_client
+from app.extensions.admission import admission
 
 # Create blueprint
 proxy_bp = Blueprint('proxy', __name__, url_prefix='/api')
@@ -16,7 +18,23 @@ logger = logging.getLogger(__name__)
 current_config = config['default']()
 
 
+def passthrough(upstream_response: requests.Response) -> Response:
+    """
+    Return an upstream response as is.
+    
+    The body is relayed without being decoded and encoded again; only the
+    status and content type are kept (requests has already undone any
+    transfer compression, which the compression extension reapplies).
+    """
+    return Response(
+        upstream_response.content,
+        status=upstream_response.status_code,
+        content_type=upstream_response.headers.get('Content-Type') or 'application/json'
+    )
+
+
 @proxy_bp.route('/pncp/<path:endpoint>')
+@admission.limit('proxy')
 def proxy_pncp_api(endpoint):
     """Proxy endpoint to query PNCP API."""
     try:
@@ -24,8 +42,8 @@ def proxy_pncp_api(endpoint):
         params = request.args.to_dict()
         
         logger.info(f"Proxying request to {url} with params: {params}")
-        response = requests.get(url, params=params, timeout=30)
-        return jsonify(response.json()), response.status_code
+        response = upstream_client.get(url, "proxy_pncp", params=params, timeout=30)
+        return passthrough(response)
     except requests.exceptions.Timeout:
         return jsonify({"error": "Request timeout"}), 504
     except Exception as e:
@@ -34,6 +52,7 @@ def proxy_pncp_api(endpoint):
 
 
 @proxy_bp.route('/consulta/<path:endpoint>')
+@admission.limit('proxy')
 def proxy_consulta_api(endpoint):
     """Proxy endpoint to query Consulta API."""
     try:
@@ -41,8 +60,8 @@ def proxy_consulta_api(endpoint):
         params = request.args.to_dict()
         
         logger.info(f"Proxying request to {url} with params: {params}")
-        response = requests.get(url, params=params, timeout=30)
-        return jsonify(response.json()), response.status_code
+        response = upstream_client.get(url, "proxy_consulta", params=params, timeout=30)
+        return passthrough(response)
     except requests.exceptions.Timeout:
         return jsonify({"error": "Request timeout"}), 504
     except Exception as e:
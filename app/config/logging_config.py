@@ -51,6 +51,10 @@ def setup_logging(app: Flask) -> None:
     app.logger.addHandler(log_handler)
     app.logger.setLevel(log_level)
     
+    # Slow request log (see app.extensions.request_timing). It propagates to
+    # the app logger; SLOW_REQUEST_LOG_FILE additionally keeps a JSON file.
+    setup_slow_request_logging(app, formatter)
+    
     # Configure third-party loggers
     logging.getLogger('werkzeug').setLevel(log_level)
     logging.getLogger('requests').setLevel(logging.WARNING)
@@ -66,6 +70,36 @@ def setup_logging(app: Flask) -> None:
         )
 
 
+def setup_slow_request_logging(app: Flask, formatter: logging.Formatter) -> None:
+    """
+    Configure the structured slow request logger.
+    
+    Args:
+        app: Flask application instance
+        formatter: Formatter used when no JSON formatter is available
+    """
+    slow_logger = logging.getLogger('app.slow_requests')
+    slow_logger.setLevel(logging.WARNING)
+    slow_logger.handlers = []
+    
+    log_file = app.config.get('SLOW_REQUEST_LOG_FILE')
+    if not log_file:
+        return
+    
+    file_handler = logging.FileHandler(log_file)
+    if JSON_LOGGING_AVAILABLE:
+        file_handler.setFormatter(jsonlogger.JsonFormatter(
+            '%(asctime)s %(levelname)s %(name)s %(message)s',
+            rename_fields={
+                'levelname': 'level',
+                'asctime': 'timestamp'
+            }
+        ))
+    else:
+        file_handler.setFormatter(formatter)
+    slow_logger.addHandler(file_handler)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a configured logger instance.
@@ -20,6 +20,144 @@ class Config:
     REDIS_PORT: int = int(os.environ.get('REDIS_PORT') or 6379)
     REDIS_DB: int = int(os.environ.get('REDIS_DB') or 0)
     REDIS_PASSWORD: Optional[str] = os.environ.get('REDIS_PASSWORD') or None
+    # Seconds to wait for a free pooled connection (REDIS_POOL_SIZE is set below,
+    # from the threads that use Redis)
+    REDIS_POOL_TIMEOUT: float = float(os.environ.get('REDIS_POOL_TIMEOUT') or 2)
+    # Reconnect backoff while Redis is unreachable (doubles from min up to max seconds)
+    REDIS_RECONNECT_BACKOFF_MIN: float = float(os.environ.get('REDIS_RECONNECT_BACKOFF_MIN') or 1)
+    REDIS_RECONNECT_BACKOFF_MAX: float = float(os.environ.get('REDIS_RECONNECT_BACKOFF_MAX') or 60)
+    
+    # Cache invalidation: lifetime of the tag sets (at least the longest entry TTL),
+    # keys deleted per UNLINK and namespaces a flush never touches
+    CACHE_TAG_TTL: int = int(os.environ.get('CACHE_TAG_TTL') or 172800)
+    CACHE_PURGE_BATCH_SIZE: int = int(os.environ.get('CACHE_PURGE_BATCH_SIZE') or 500)
+    CACHE_PROTECTED_NAMESPACES: str = os.environ.get('CACHE_PROTECTED_NAMESPACES') or 'ratelimit,lock,saved_search'
+    
+    # Cache TTLs by namespace while the query window includes today, and of windows that
+    # ended in the past (recent ones until they settle, then closed ones), in seconds
+    CACHE_TTL_DEFAULT: int = int(os.environ.get('CACHE_TTL_DEFAULT') or 600)
+    CACHE_TTL_OPEN_TENDERS: int = int(os.environ.get('CACHE_TTL_OPEN_TENDERS') or 600)
+    CACHE_TTL_STATS: int = int(os.environ.get('CACHE_TTL_STATS') or 900)
+    CACHE_TTL_PLANOS_STATS: int = int(os.environ.get('CACHE_TTL_PLANOS_STATS') or 21600)
+    CACHE_TTL_RECENT_PAST: int = int(os.environ.get('CACHE_TTL_RECENT_PAST') or 3600)
+    CACHE_TTL_CLOSED_PAST: int = int(os.environ.get('CACHE_TTL_CLOSED_PAST') or 86400)
+    CACHE_TTL_SETTLE_DAYS: int = int(os.environ.get('CACHE_TTL_SETTLE_DAYS') or 3)
+    
+    # Negative cache: seconds to remember answers without data, by kind (0 disables a kind)
+    NEGATIVE_CACHE_TTL_BAD_REQUEST: int = int(os.environ.get('NEGATIVE_CACHE_TTL_BAD_REQUEST') or 300)
+    NEGATIVE_CACHE_TTL_NOT_FOUND: int = int(os.environ.get('NEGATIVE_CACHE_TTL_NOT_FOUND') or 300)
+    NEGATIVE_CACHE_TTL_EMPTY: int = int(os.environ.get('NEGATIVE_CACHE_TTL_EMPTY') or 60)
+    NEGATIVE_CACHE_TTL_UPSTREAM_ERROR: int = int(os.environ.get('NEGATIVE_CACHE_TTL_UPSTREAM_ERROR') or 15)
+    
+    # Per-namespace cache analytics and hot key tracking (counters kept in the top-k sketch)
+    CACHE_STATS_ENABLED: bool = (os.environ.get('CACHE_STATS_ENABLED') or 'true').lower() == 'true'
+    CACHE_HOT_KEYS_CAPACITY: int = int(os.environ.get('CACHE_HOT_KEYS_CAPACITY') or 100)
+    
+    # Connections kept alive per PNCP host and worker
+    UPSTREAM_POOL_SIZE: int = int(os.environ.get('UPSTREAM_POOL_SIZE') or 20)
+    
+    # Admission control of upstream-bound routes, per worker: slots, wait queue and
+    # wait (seconds), slots per route ("route=limit" pairs override the default),
+    # Retry-After of shed requests and lifetime of the stale copies served instead
+    ADMISSION_ENABLED: bool = (os.environ.get('ADMISSION_ENABLED') or 'true').lower() == 'true'
+    ADMISSION_MAX_CONCURRENT: int = int(os.environ.get('ADMISSION_MAX_CONCURRENT') or 4)
+    ADMISSION_QUEUE_SIZE: int = int(os.environ.get('ADMISSION_QUEUE_SIZE') or 2)
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT') or 2)
+    ADMISSION_ROUTE_MAX_CONCURRENT: int = int(os.environ.get('ADMISSION_ROUTE_MAX_CONCURRENT') or 3)
+    ADMISSION_ROUTE_LIMITS: str = os.environ.get('ADMISSION_ROUTE_LIMITS') or 'lote=1,proxy=2'
+    ADMISSION_RETRY_AFTER: int = int(os.environ.get('ADMISSION_RETRY_AFTER') or 5)
+    ADMISSION_STALE_TTL: int = int(os.environ.get('ADMISSION_STALE_TTL') or 86400)
+    
+    # Fleet-wide budget of requests to PNCP (token bucket in Redis): refill per second,
+    # burst, share of the burst kept from warmer and backfill calls, and how long
+    # interactive and background calls wait for a token (seconds)
+    GOVERNOR_ENABLED: bool = (os.environ.get('GOVERNOR_ENABLED') or 'true').lower() == 'true'
+    GOVERNOR_RATE: float = float(os.environ.get('GOVERNOR_RATE') or 10)
+    GOVERNOR_BURST: int = int(os.environ.get('GOVERNOR_BURST') or 20)
+    GOVERNOR_WARMER_RESERVE: float = float(os.environ.get('GOVERNOR_WARMER_RESERVE') or 0.3)
+    GOVERNOR_BACKFILL_RESERVE: float = float(os.environ.get('GOVERNOR_BACKFILL_RESERVE') or 0.6)
+    GOVERNOR_MAX_WAIT: float = float(os.environ.get('GOVERNOR_MAX_WAIT') or 1)
+    GOVERNOR_BACKGROUND_MAX_WAIT: float = float(os.environ.get('GOVERNOR_BACKGROUND_MAX_WAIT') or 30)
+    
+    # Tender details (compra, items, documents and results aggregated from PNCP)
+    TENDER_DETAILS_OPEN_TTL: int = int(os.environ.get('TENDER_DETAILS_OPEN_TTL') or 600)
+    TENDER_DETAILS_CLOSED_TTL: int = int(os.environ.get('TENDER_DETAILS_CLOSED_TTL') or 86400)
+    TENDER_DETAILS_ITEMS_PAGE_SIZE: int = int(os.environ.get('TENDER_DETAILS_ITEMS_PAGE_SIZE') or 100)
+    TENDER_DETAILS_MAX_ITEMS: int = int(os.environ.get('TENDER_DETAILS_MAX_ITEMS') or 1000)
+    TENDER_DETAILS_MAX_WORKERS: int = int(os.environ.get('TENDER_DETAILS_MAX_WORKERS') or 8)
+    
+    # Bulk tender lookup (POST /api/licitacoes/lote)
+    TENDER_BATCH_MAX_IDS: int = int(os.environ.get('TENDER_BATCH_MAX_IDS') or 500)
+    TENDER_BATCH_CONCURRENCY: int = int(os.environ.get('TENDER_BATCH_CONCURRENCY') or 4)
+    
+    # Redis connections per worker: one per gunicorn thread, per details and batch
+    # fan-out thread, plus the live feed's pub/sub connection
+    REDIS_POOL_SIZE: int = int(os.environ.get('REDIS_POOL_SIZE') or (
+        int(os.environ.get('GUNICORN_THREADS') or 16) + TENDER_DETAILS_MAX_WORKERS + TENDER_BATCH_CONCURRENCY + 1
+    ))
+    
+    # Live feed of new tenders (SSE): leader poll, pub/sub channel and stream limits per worker
+    TENDER_FEED_ENABLED: bool = (os.environ.get('TENDER_FEED_ENABLED') or 'true').lower() == 'true'
+    TENDER_FEED_POLL_INTERVAL_SECONDS: float = float(os.environ.get('TENDER_FEED_POLL_INTERVAL_SECONDS') or 30)
+    TENDER_FEED_PAGES: int = int(os.environ.get('TENDER_FEED_PAGES') or 2)
+    TENDER_FEED_PAGE_SIZE: int = int(os.environ.get('TENDER_FEED_PAGE_SIZE') or 50)
+    TENDER_FEED_CHANNEL: str = os.environ.get('TENDER_FEED_CHANNEL') or 'tender_feed'
+    TENDER_FEED_SEEN_TTL: int = int(os.environ.get('TENDER_FEED_SEEN_TTL') or 172800)
+    TENDER_FEED_HEARTBEAT_SECONDS: float = float(os.environ.get('TENDER_FEED_HEARTBEAT_SECONDS') or 15)
+    TENDER_FEED_MAX_STREAM_SECONDS: float = float(os.environ.get('TENDER_FEED_MAX_STREAM_SECONDS') or 300)
+    TENDER_FEED_MAX_CLIENTS: int = int(os.environ.get('TENDER_FEED_MAX_CLIENTS') or 8)
+    TENDER_FEED_QUEUE_SIZE: int = int(os.environ.get('TENDER_FEED_QUEUE_SIZE') or 100)
+    
+    # Saved searches: retention since last listed, limit per browser and new tender ids kept per search
+    SAVED_SEARCH_TTL: int = int(os.environ.get('SAVED_SEARCH_TTL') or 7776000)
+    SAVED_SEARCH_MAX_PER_CLIENT: int = int(os.environ.get('SAVED_SEARCH_MAX_PER_CLIENT') or 20)
+    SAVED_SEARCH_MAX_MATCHES: int = int(os.environ.get('SAVED_SEARCH_MAX_MATCHES') or 50)
+    
+    # Cursor pagination snapshots of the open tenders listing
+    CURSOR_SNAPSHOT_TTL: int = int(os.environ.get('CURSOR_SNAPSHOT_TTL') or 600)
+    CURSOR_SNAPSHOT_MAX_PAGES: int = int(os.environ.get('CURSOR_SNAPSHOT_MAX_PAGES') or 20)
+    CURSOR_SNAPSHOT_PAGE_SIZE: int = int(os.environ.get('CURSOR_SNAPSHOT_PAGE_SIZE') or 50)
+    CURSOR_SNAPSHOT_LOCAL_ENTRIES: int = int(os.environ.get('CURSOR_SNAPSHOT_LOCAL_ENTRIES') or 8)
+    
+    # Metrics (Prometheus) configuration
+    METRICS_ENABLED: bool = (os.environ.get('METRICS_ENABLED') or 'true').lower() == 'true'
+    
+    # Request timing (Server-Timing header and slow request log)
+    SERVER_TIMING_ENABLED: bool = (os.environ.get('SERVER_TIMING_ENABLED') or 'true').lower() == 'true'
+    SLOW_REQUEST_THRESHOLD_MS: float = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS') or 2000)
+    SLOW_REQUEST_LOG_FILE: Optional[str] = os.environ.get('SLOW_REQUEST_LOG_FILE') or None
+    
+    # JSON codec (orjson when installed, stdlib json otherwise)
+    JSON_FAST_ENABLED: bool = (os.environ.get('JSON_FAST_ENABLED') or 'true').lower() == 'true'
+    
+    # Response compression (gzip, and brotli when installed)
+    COMPRESSION_ENABLED: bool = (os.environ.get('COMPRESSION_ENABLED') or 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE: int = int(os.environ.get('COMPRESSION_MIN_SIZE') or 1024)
+    COMPRESSION_GZIP_LEVEL: int = int(os.environ.get('COMPRESSION_GZIP_LEVEL') or 6)
+    COMPRESSION_BROTLI_QUALITY: int = int(os.environ.get('COMPRESSION_BROTLI_QUALITY') or 5)
+    
+    # Static asset bundles (built by scripts/build_assets.py; unset = enabled outside debug)
+    ASSETS_USE_BUNDLES: Optional[str] = os.environ.get('ASSETS_USE_BUNDLES') or None
+    ASSETS_MAX_AGE: int = int(os.environ.get('ASSETS_MAX_AGE') or 31536000)
+    
+    # In-memory cache of the rendered HTML pages (unset = enabled outside debug)
+    PAGE_CACHE_ENABLED: Optional[str] = os.environ.get('PAGE_CACHE_ENABLED') or None
+    
+    # Admin API (disabled unless a token is configured)
+    ADMIN_TOKEN: Optional[str] = os.environ.get('ADMIN_TOKEN') or None
+    
+    # Sampling profiler
+    PROFILER_OUTPUT_DIR: str = os.environ.get('PROFILER_OUTPUT_DIR') or '/tmp/pncp_profiles'
+    PROFILER_SAMPLE_RATE: float = float(os.environ.get('PROFILER_SAMPLE_RATE') or 0.0)
+    PROFILER_INTERVAL_MS: float = float(os.environ.get('PROFILER_INTERVAL_MS') or 10)
+    PROFILER_MAX_WINDOW_SECONDS: int = int(os.environ.get('PROFILER_MAX_WINDOW_SECONDS') or 300)
+    PROFILER_MAX_CAPTURES: int = int(os.environ.get('PROFILER_MAX_CAPTURES') or 100)
+    
+    # Background health prober
+    HEALTH_PROBE_ENABLED: bool = (os.environ.get('HEALTH_PROBE_ENABLED') or 'true').lower() == 'true'
+    HEALTH_PROBE_INTERVAL_SECONDS: float = float(os.environ.get('HEALTH_PROBE_INTERVAL_SECONDS') or 15)
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = float(os.environ.get('HEALTH_PROBE_TIMEOUT_SECONDS') or 5)
+    HEALTH_PROBE_WINDOW: int = int(os.environ.get('HEALTH_PROBE_WINDOW') or 20)
 
 
 class DevelopmentConfig(Config):
@@ -35,6 +173,10 @@ class TestingConfig(Config):
     TESTING: bool = True
     DEBUG: bool = True
     ENV: str = 'testing'
+    HEALTH_PROBE_ENABLED: bool = False
+    TENDER_FEED_ENABLED: bool = False
+    ADMISSION_ENABLED: bool = False
+    GOVERNOR_ENABLED: bool = False
 
 
 class ProductionConfig(Config):
@@ -0,0 +1,224 @@
+"""
+Schema-driven slotted models for PNCP records.
+"""
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+from app.extensions.json_codec import json_codec
+
+M = TypeVar('M', bound='Model')
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse a PNCP ISO timestamp, returning None when invalid."""
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+class Field:
+    """
+    One attribute of a model and how it maps to the upstream JSON.
+
+    Args:
+        name: Attribute name (and key in to_dict)
+        source: Upstream key, or a tuple of keys tried in order (defaults to name)
+        model: Nested model class
+        many: Whether the value is a list of ``model``
+        timestamp: Whether the value is an ISO timestamp decoded to datetime
+        decode: Conversion applied to non-null upstream values (e.g. bool)
+        default: Value when the key is missing or null
+    """
+
+    __slots__ = ('name', 'sources', 'default', 'model', 'many', 'timestamp', 'decode')
+
+    def __init__(self, name: str, source: Union[str, Tuple[str, ...], None] = None,
+                 model: Optional[Type['Model']] = None, many: bool = False, timestamp: bool = False,
+                 decode: Optional[Callable[[Any], Any]] = None, default: Any = None):
+        self.name = name
+        if source is None:
+            source = name
+        self.sources = source if isinstance(source, tuple) else (source,)
+        self.default = default
+        self.model = model
+        self.many = many
+        self.timestamp = timestamp
+        self.decode = decode
+
+    def missing(self) -> Any:
+        """Value for a missing key (a new list for list fields)."""
+        return [] if self.many else self.default
+
+
+def field_names(schema: Tuple[Field, ...]) -> Tuple[str, ...]:
+    """Slot names of a schema."""
+    return tuple(f.name for f in schema)
+
+
+def _encode_expression(model: Type['Model'], obj: str, namespace: Dict[str, Any], depth: int = 0) -> str:
+    """
+    Source of a dict literal encoding ``obj``, an instance of ``model``.
+
+    Nested models are inlined rather than called through their to_dict, so
+    a tender with its items and their results is encoded by one generated
+    expression. A model with a hand-written to_dict is still called.
+    """
+    items = []
+    for f in model.SCHEMA:
+        attr = f'{obj}.{f.name}'
+        if f.model is not None and f.many:
+            var = f'item{depth}'
+            nested = _nested_expression(f.model, var, namespace, depth + 1)
+            # Skipping the comprehension for empty lists is most of the cost of sparse lists
+            items.append(f'{f.name!r}: [{nested} for {var} in {attr}] if {attr} else []')
+        elif f.model is not None:
+            nested = _nested_expression(f.model, attr, namespace, depth + 1)
+            items.append(f'{f.name!r}: None if {attr} is None else {nested}')
+        elif f.timestamp:
+            items.append(f'{f.name!r}: None if {attr} is None else {attr}.isoformat()')
+        else:
+            items.append(f'{f.name!r}: {attr}')
+    return '{' + ', '.join(items) + '}'
+
+
+def _nested_expression(model: Type['Model'], obj: str, namespace: Dict[str, Any], depth: int) -> str:
+    """Source encoding a nested model: inlined, or a call of its own to_dict."""
+    if model.__dict__.get('_generated_to_dict'):
+        return _encode_expression(model, obj, namespace, depth)
+    name = f'encode_{model.__name__}'
+    namespace[name] = model.to_dict
+    return f'{name}({obj})'
+
+
+def _compile(cls: Type['Model']) -> None:
+    """
+    Generate the decoder and encoder of a model class from its schema.
+
+    Like dataclasses does for __init__, the code is generated once per
+    class, so decoding and encoding run straight-line attribute accesses
+    instead of looping over the schema for every record.
+    """
+    namespace: Dict[str, Any] = {'new': object.__new__, 'parse_datetime': parse_datetime}
+    decode_lines = ['def from_pncp(cls, data):', '    obj = new(cls)', '    get = data.get']
+
+    for index, f in enumerate(cls.SCHEMA):
+        namespace[f'default_{index}'] = f.default
+        if f.model is not None:
+            namespace[f'decode_{index}'] = f.model.from_pncp
+        elif f.decode is not None:
+            namespace[f'decode_{index}'] = f.decode
+
+        decode_lines.append(f'    value = get({f.sources[0]!r})')
+        for source in f.sources[1:]:
+            decode_lines.append(f'    if value is None: value = get({source!r})')
+
+        if f.model is not None and f.many:
+            decoded = f'[decode_{index}(item) for item in value if item.__class__ is dict]'
+            decode_lines.append(f'    obj.{f.name} = {decoded} if value.__class__ is list else []')
+            continue
+
+        if f.model is not None:
+            decoded = f'decode_{index}(value) if value.__class__ is dict else None'
+        elif f.timestamp:
+            decoded = 'parse_datetime(value)'
+        elif f.decode is not None:
+            decoded = f'decode_{index}(value)'
+        else:
+            decoded = 'value'
+
+        if decoded == 'value' and f.default is None:
+            decode_lines.append(f'    obj.{f.name} = value')
+        else:
+            decode_lines.append(f'    obj.{f.name} = default_{index} if value is None else {decoded}')
+
+    decode_lines.append('    return obj')
+    encode = _encode_expression(cls, 'self', namespace)
+    source = '\n'.join(decode_lines) + '\n\n' + f'def to_dict(self):\n    return {encode}\n'
+    exec(source, namespace)
+    cls._decode = namespace['from_pncp']
+    # Subclasses may still wrap these with their own from_pncp/to_dict
+    cls._generated_to_dict = 'to_dict' not in cls.__dict__
+    if cls._generated_to_dict:
+        cls.to_dict = namespace['to_dict']
+
+
+class Model:
+    """
+    Base class of the PNCP record models.
+
+    Subclasses declare a ``SCHEMA`` of fields and ``__slots__ =
+    field_names(SCHEMA)``: instances hold no per-object ``__dict__``, and
+    the decoder and encoder are compiled once per class from the schema
+    instead of being written out by hand.
+    """
+
+    __slots__ = ()
+    SCHEMA: Tuple[Field, ...] = ()
+
+    # Compiled per class by __init_subclass__
+    _names: Tuple[str, ...] = ()
+    _values: Callable[['Model'], Tuple[Any, ...]]
+    _fields: Dict[str, Field] = {}
+    _decode: Callable[[Type['Model'], Dict[str, Any]], 'Model']
+    _generated_to_dict = False
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._names = field_names(cls.SCHEMA)
+        cls._fields = {f.name: f for f in cls.SCHEMA}
+        # attrgetter with one name returns a bare value rather than a tuple
+        getter = attrgetter(*cls._names)
+        cls._values = getter if len(cls._names) > 1 else (lambda obj: (getter(obj),))
+        _compile(cls)
+
+    def __init__(self, **values: Any):
+        for name, f in self._fields.items():
+            setattr(self, name, values.pop(name) if name in values else f.missing())
+        if values:
+            raise TypeError(f"{type(self).__name__} got unexpected fields: {', '.join(values)}")
+
+    @classmethod
+    def from_pncp(cls: Type[M], data: Dict[str, Any]) -> M:
+        """
+        Build a model from a decoded upstream record.
+
+        Missing and null keys take the field default; unknown keys are ignored.
+        """
+        return cls._decode(cls, data)
+
+    @classmethod
+    def decode(cls: Type[M], raw: Union[bytes, str]) -> Union[M, List[M]]:
+        """
+        Build models straight from an upstream JSON body.
+
+        Args:
+            raw: JSON object or array of objects
+
+        Returns:
+            Model, or list of models for an array
+        """
+        data = json_codec.loads(raw)
+        if isinstance(data, list):
+            return [cls.from_pncp(item) for item in data if isinstance(item, dict)]
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object or array for {cls.__name__}")
+        return cls.from_pncp(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the model (and nested models) to a dictionary (generated per class)."""
+        # Only reached on a class _compile did not run for, i.e. Model itself
+        raise TypeError(f"{type(self).__name__} has no compiled to_dict; declare a SCHEMA on a Model subclass")
+
+    def encode(self) -> bytes:
+        """Serialize the model to compact UTF-8 JSON."""
+        return json_codec.dumps(self.to_dict())
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values(self) == other._values(other)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={value!r}" for name, value in zip(self._names, self._values(self)))
+        return f"{type(self).__name__}({fields})"
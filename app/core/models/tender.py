@@ -2,70 +2,105 @@
 Tender model for PNCP API Client.
 """
 from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, field
-from datetime import datetime
+from app.core.models.base import Field, Model, field_names
 
 
-@dataclass
-class OrgaoEntidade:
+class OrgaoEntidade(Model):
     """Organization entity model."""
-    cnpj: Optional[str] = None
-    razaoSocial: Optional[str] = None
-    ufSigla: Optional[str] = None
+    SCHEMA = (
+        Field('cnpj'),
+        Field('razaoSocial'),
+        Field('ufSigla'),
+    )
+    __slots__ = field_names(SCHEMA)
 
 
-@dataclass
-class ItemLicitacao:
-    """Item in a tender model."""
-    numeroItem: Optional[int] = None
-    descricao: Optional[str] = None
-    quantidade: Optional[float] = None
-    valorUnitario: Optional[float] = None
-    valorTotal: Optional[float] = None
+class ResultadoItem(Model):
+    """Result (awarded supplier) of a tender item."""
+    SCHEMA = (
+        Field('sequencialResultado'),
+        Field('niFornecedor'),
+        Field('nomeRazaoSocialFornecedor'),
+        Field('quantidadeHomologada'),
+        Field('valorUnitarioHomologado'),
+        Field('valorTotalHomologado'),
+    )
+    __slots__ = field_names(SCHEMA)
 
 
-@dataclass
-class Tender:
+class ItemLicitacao(Model):
+    """Item in a tender model (results are attached separately by the detail engine)."""
+    SCHEMA = (
+        Field('numeroItem'),
+        Field('descricao'),
+        Field('quantidade'),
+        Field('valorUnitario', source=('valorUnitario', 'valorUnitarioEstimado')),
+        Field('valorTotal'),
+        Field('unidadeMedida'),
+        Field('situacaoCompraItem'),
+        Field('situacaoCompraItemNome'),
+        Field('temResultado', decode=bool, default=False),
+        Field('resultados', model=ResultadoItem, many=True),
+    )
+    __slots__ = field_names(SCHEMA)
+
+
+class Documento(Model):
+    """Document attached to a tender."""
+    SCHEMA = (
+        Field('sequencialDocumento'),
+        Field('titulo'),
+        Field('tipoDocumentoNome'),
+        Field('url', source=('url', 'uri')),
+        Field('dataPublicacaoPncp', timestamp=True),
+    )
+    __slots__ = field_names(SCHEMA)
+
+
+class Tender(Model):
     """Tender model."""
-    numeroCompra: Optional[str] = None
-    processo: Optional[str] = None
-    orgaoEntidade: Optional[OrgaoEntidade] = None
-    objetoCompra: Optional[str] = None
-    modalidadeNome: Optional[str] = None
-    modalidadeId: Optional[int] = None
-    valorTotalEstimado: Optional[float] = None
-    dataAberturaProposta: Optional[str] = None
-    dataEncerramentoProposta: Optional[str] = None
-    numeroControlePNCP: Optional[str] = None
-    itens: List[ItemLicitacao] = field(default_factory=list)
-    dataPublicacaoPncp: Optional[datetime] = None
+    SCHEMA = (
+        Field('numeroCompra'),
+        Field('processo'),
+        Field('orgaoEntidade', model=OrgaoEntidade),
+        Field('objetoCompra'),
+        Field('modalidadeNome'),
+        Field('modalidadeId'),
+        Field('valorTotalEstimado'),
+        Field('dataAberturaProposta'),
+        Field('dataEncerramentoProposta'),
+        Field('numeroControlePNCP'),
+        Field('itens', model=ItemLicitacao, many=True),
+        Field('dataPublicacaoPncp', timestamp=True),
+        Field('situacaoCompraId'),
+        Field('situacaoCompraNome'),
+        Field('valorTotalHomologado'),
+        Field('linkSistemaOrigem'),
+        Field('documentos', model=Documento, many=True),
+    )
+    __slots__ = field_names(SCHEMA)
+
+    @classmethod
+    def from_pncp(cls, data: Dict[str, Any], itens: Optional[List[ItemLicitacao]] = None,
+                  documentos: Optional[List[Documento]] = None) -> 'Tender':
+        """
+        Build from a PNCP compra and, optionally, its already decoded sub-resources.
+
+        Args:
+            data: PNCP compra payload
+            itens: Items of the compra (replace any embedded in the payload)
+            documentos: Documents of the compra (replace any embedded in the payload)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert tender to dictionary."""
-        return {
-            "numeroCompra": self.numeroCompra,
-            "processo": self.processo,
-            "orgaoEntidade": {
-                "cnpj": self.orgaoEntidade.cnpj if self.orgaoEntidade else None,
-                "razaoSocial": self.orgaoEntidade.razaoSocial if self.orgaoEntidade else None,
-                "ufSigla": self.orgaoEntidade.ufSigla if self.orgaoEntidade else None
-            } if self.orgaoEntidade else None,
-            "objetoCompra": self.objetoCompra,
-            "modalidadeNome": self.modalidadeNome,
-            "modalidadeId": self.modalidadeId,
-            "valorTotalEstimado": self.valorTotalEstimado,
-            "dataAberturaProposta": self.dataAberturaProposta,
-            "dataEncerramentoProposta": self.dataEncerramentoProposta,
-            "numeroControlePNCP": self.numeroControlePNCP,
-            "itens": [
-                {
-                    "numeroItem": item.numeroItem,
-                    "descricao": item.descricao,
-                    "quantidade": item.quantidade,
-                    "valorUnitario": item.valorUnitario,
-                    "valorTotal": item.valorTotal
-                }
-                for item in self.itens
-            ] if self.itens else [],
-            "dataPublicacaoPncp": self.dataPublicacaoPncp.isoformat() if self.dataPublicacaoPncp else None
-        }
\ No newline at end of file
+        Returns:
+            Tender
+        """
+        tender = super().from_pncp(data)
+        if itens is not None:
+            tender.itens = itens
+        if documentos is not None:
+            tender.documentos = documentos
+        # PNCP puts the UF on the unit, not on the organization
+        unidade = data.get('unidadeOrgao')
+        if tender.orgaoEntidade is not None and tender.orgaoEntidade.ufSigla is None and isinstance(unidade, dict):
+            tender.orgaoEntidade.ufSigla = unidade.get('ufSigla')
+        return tender
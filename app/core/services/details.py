@@ -0,0 +1,194 @@
+"""
+Tender detail engine: aggregates a compra and its sub-resources from PNCP.
+"""
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import config
+from app.core.models.tender import Documento, ItemLicitacao, ResultadoItem, Tender
+from app.core.services.upstream import upstream_client
+from app.extensions.request_timing import request_timing
+
+logger = logging.getLogger(__name__)
+
+# Get configuration
+current_config = config['default']()
+
+# Endpoint labels (path templates) of the PNCP compra routes
+COMPRA_ENDPOINT = "/v1/orgaos/{cnpj}/compras/{ano}/{sequencial}"
+ITEMS_ENDPOINT = COMPRA_ENDPOINT + "/itens"
+ITEMS_COUNT_ENDPOINT = ITEMS_ENDPOINT + "/quantidade"
+DOCUMENTS_ENDPOINT = COMPRA_ENDPOINT + "/arquivos"
+RESULTS_ENDPOINT = ITEMS_ENDPOINT + "/{numeroItem}/resultados"
+
+# situacaoCompraId of tenders that can no longer change (revogada, anulada)
+FINAL_SITUATIONS = {2, 3}
+# situacaoCompraItem of items still waiting for a result (em andamento)
+PENDING_ITEM_SITUATION = 1
+
+PNCP_WEB_URL = "https://pncp.gov.br/app/editais/{cnpj}/{ano}/{sequencial}"
+
+
+class TenderDetails:
+    """
+    Resolves a tender into its compra, items, documents and item results.
+
+    The compra, the item count and the documents are requested at once;
+    the item pages and then the results of every item that has one follow
+    on the same pool. Only the compra is required: a failed sub-resource is
+    logged and the aggregate is flagged as partial, so it is cached briefly
+    and fetched again soon.
+    """
+
+    def __init__(self):
+        """Initialize detail engine."""
+        self.base_url = current_config.PNCP_API_BASE
+        self.open_ttl = current_config.TENDER_DETAILS_OPEN_TTL
+        self.closed_ttl = current_config.TENDER_DETAILS_CLOSED_TTL
+        self.items_page_size = current_config.TENDER_DETAILS_ITEMS_PAGE_SIZE
+        self.max_items = current_config.TENDER_DETAILS_MAX_ITEMS
+        self.max_workers = current_config.TENDER_DETAILS_MAX_WORKERS
+
+    def fetch(self, cnpj: str, ano: int, sequencial: int) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Fetch and assemble the details of a tender.
+
+        Args:
+            cnpj: CNPJ of the organization
+            ano: Year of the compra
+            sequencial: Sequential number of the compra
+
+        Returns:
+            Tuple of (details payload, cache TTL in seconds), or None if the
+            compra does not exist
+
+        Raises:
+            requests.exceptions.RequestException: If the compra cannot be fetched
+            ValueError: If PNCP answers the compra with an error or an invalid payload
+        """
+        url = f"{self.base_url}/v1/orgaos/{cnpj}/compras/{ano}/{sequencial}"
+        failed: List[str] = []
+
+        # Worker threads have no request context, so the fan-out is timed as a whole
+        with request_timing.phase('upstream'), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            compra_future = executor.submit(self._fetch, url, COMPRA_ENDPOINT)
+            count_future = executor.submit(self._fetch, f"{url}/itens/quantidade", ITEMS_COUNT_ENDPOINT)
+            documents_future = executor.submit(self._fetch, f"{url}/arquivos", DOCUMENTS_ENDPOINT)
+
+            compra = compra_future.result()
+            if compra is None:
+                count_future.cancel()
+                documents_future.cancel()
+                return None
+            if not isinstance(compra, dict):
+                raise ValueError("Unexpected response format from PNCP API")
+
+            raw_items = self._fetch_items(executor, url, count_future, failed)
+            results_futures = {
+                item.get('numeroItem'): executor.submit(
+                    self._fetch, f"{url}/itens/{item.get('numeroItem')}/resultados", RESULTS_ENDPOINT)
+                for item in raw_items if item.get('temResultado') and item.get('numeroItem') is not None
+            }
+            documents = self._result(documents_future, 'arquivos', failed) or []
+            results = {
+                numero: self._result(future, f'resultados do item {numero}', failed) or []
+                for numero, future in results_futures.items()
+            }
+
+        with request_timing.phase('transform'):
+            itens = []
+            for raw_item in raw_items:
+                item = ItemLicitacao.from_pncp(raw_item)
+                item.resultados = [ResultadoItem.from_pncp(r) for r in results.get(item.numeroItem, [])
+                                   if isinstance(r, dict)]
+                itens.append(item)
+            tender = Tender.from_pncp(compra, itens, [Documento.from_pncp(d) for d in documents if isinstance(d, dict)])
+
+            payload = tender.to_dict()
+            payload["pncp_web_url"] = PNCP_WEB_URL.format(cnpj=cnpj, ano=ano, sequencial=sequencial)
+            payload["parcial"] = bool(failed)
+            payload["atualizadoEm"] = datetime.now().isoformat()
+
+        if failed:
+            logger.warning(f"Partial details for {cnpj}/{ano}/{sequencial}: failed {', '.join(failed)}")
+            return payload, self.open_ttl
+        return payload, self.closed_ttl if self.is_final(compra, raw_items) else self.open_ttl
+
+    @staticmethod
+    def is_final(compra: Dict[str, Any], raw_items: List[Dict[str, Any]]) -> bool:
+        """
+        Check whether a tender can no longer change.
+
+        A tender is final once it is revoked or annulled, or once its proposal
+        period has ended and no item is still waiting for a result.
+
+        Args:
+            compra: PNCP compra payload
+            raw_items: PNCP items of the compra
+
+        Returns:
+            True if the aggregate can be cached for long
+        """
+        if compra.get('situacaoCompraId') in FINAL_SITUATIONS:
+            return True
+        closing = compra.get('dataEncerramentoProposta')
+        if not closing or closing >= datetime.now().isoformat():
+            return False
+        return all(item.get('situacaoCompraItem') != PENDING_ITEM_SITUATION for item in raw_items)
+
+    def _fetch_items(self, executor: ThreadPoolExecutor, url: str, count_future: Future,
+                     failed: List[str]) -> List[Dict[str, Any]]:
+        """Fetch every item page concurrently, once the item count is known."""
+        count = self._result(count_future, 'quantidade de itens', failed)
+        if not isinstance(count, int):
+            # Without the count a single page is better than no items at all
+            count = self.items_page_size
+        count = min(count, self.max_items)
+        if count <= 0:
+            return []
+
+        pages = range(1, -(-count // self.items_page_size) + 1)
+        futures = [
+            executor.submit(self._fetch, f"{url}/itens", ITEMS_ENDPOINT,
+                            {'pagina': page, 'tamanhoPagina': self.items_page_size})
+            for page in pages
+        ]
+        items: List[Dict[str, Any]] = []
+        for page, future in zip(pages, futures):
+            data = self._result(future, f'itens (página {page})', failed)
+            if isinstance(data, list):
+                items.extend(item for item in data if isinstance(item, dict))
+        return items[:self.max_items]
+
+    @staticmethod
+    def _result(future: Future, name: str, failed: List[str]) -> Any:
+        """Get the result of an optional sub-resource, recording its failure."""
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error fetching {name}: {e}")
+            failed.append(name)
+            return None
+
+    @staticmethod
+    def _fetch(url: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Fetch one PNCP resource.
+
+        Returns:
+            Decoded body, or None if the resource does not exist (404/204)
+
+        Raises:
+            ValueError: On any other non-200 status
+        """
+        response = upstream_client.get(url, endpoint, params=params, timeout=30)
+        if response.status_code in (204, 404):
+            return None
+        if response.status_code != 200:
+            raise ValueError(f"PNCP API returned status {response.status_code}")
+        return upstream_client.parse_json(response)
+
+
+# Global detail engine
+tender_details = TenderDetails()
@@ -0,0 +1,56 @@
+"""
+Cache invalidation for PNCP API Client.
+"""
+import re
+import logging
+from typing import Dict, Iterable
+from app.extensions import compression, redis_client
+
+logger = logging.getLogger(__name__)
+
+# ns:<namespace>, uf:<UF>, modalidade:<code> or data:<yyyyMM>
+TAG_PATTERN = re.compile(r'^(ns:[a-z_]+|uf:[A-Z]{2}|modalidade:\d+|data:\d{6})$')
+
+
+class CacheInvalidator:
+    """
+    Targeted purges of the Redis cache.
+
+    Entries are tagged when cached (see ``cache_tags``) and purged by tag
+    together with their precompressed variants, instead of flushing the
+    whole database.
+    """
+
+    @staticmethod
+    def is_valid_tag(tag: str) -> bool:
+        """Check whether a tag is one the cache entries are tagged with."""
+        return isinstance(tag, str) and bool(TAG_PATTERN.match(tag))
+
+    def purge(self, tags: Iterable[str]) -> Dict[str, int]:
+        """
+        Delete the cache entries with any of the tags.
+
+        Args:
+            tags: Tags such as ns:open_tenders, uf:SP, modalidade:6 or data:202403
+
+        Returns:
+            Number of keys deleted by tag
+
+        Raises:
+            ValueError: If a tag is invalid (nothing is purged then)
+        """
+        tags = list(tags)
+        invalid = [tag for tag in tags if not self.is_valid_tag(tag)]
+        if invalid:
+            raise ValueError(f"Invalid cache tags: {', '.join(map(str, invalid))}")
+
+        tags = list(dict.fromkeys(tags))
+        return {tag: redis_client.purge(tag, related=compression.variant_keys) for tag in tags}
+
+    def purge_all(self) -> bool:
+        """Delete every cache entry, keeping the protected namespaces."""
+        return redis_client.flush()
+
+
+# Global cache invalidator instance
+cache_invalidator = CacheInvalidator()
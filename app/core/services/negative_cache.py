@@ -0,0 +1,109 @@
+"""
+Negative cache for PNCP API Client.
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+from app.config.settings import config
+from app.extensions import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Get configuration
+current_config = config['default']()
+
+# Namespace of the negative entries (kept apart so cache stats count them separately)
+NEGATIVE_NAMESPACE = "negative"
+
+# Kinds of negative entry
+BAD_REQUEST = "bad_request"
+NOT_FOUND = "not_found"
+EMPTY = "empty"
+UPSTREAM_ERROR = "upstream_error"
+
+
+class NegativeCache:
+    """
+    Short-lived cache of answers that carry no data.
+
+    Bad-parameter (400), not-found (404) and empty results, as well as
+    upstream failures (5xx, timeouts, connection errors), are remembered
+    for a few seconds to minutes depending on their kind, so a burst of the
+    same bad or failing query is answered locally instead of reaching PNCP
+    every time. An entry holds the exact body and status the client got,
+    never placeholder data.
+
+    Entries live under ``negative:<cache key>`` and carry the tags of the
+    entry they stand for, so tag purges clear both.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, int]] = None):
+        """
+        Initialize negative cache.
+
+        Args:
+            ttls: TTL in seconds by kind (defaults to the NEGATIVE_CACHE_TTL_* settings; 0 disables a kind)
+        """
+        self.ttls = ttls or {
+            BAD_REQUEST: current_config.NEGATIVE_CACHE_TTL_BAD_REQUEST,
+            NOT_FOUND: current_config.NEGATIVE_CACHE_TTL_NOT_FOUND,
+            EMPTY: current_config.NEGATIVE_CACHE_TTL_EMPTY,
+            UPSTREAM_ERROR: current_config.NEGATIVE_CACHE_TTL_UPSTREAM_ERROR,
+        }
+
+    @staticmethod
+    def key(cache_key: str) -> str:
+        """Key of the negative entry for a cache key."""
+        return f"{NEGATIVE_NAMESPACE}:{cache_key}"
+
+    @staticmethod
+    def kind_for_status(status_code: int) -> Optional[str]:
+        """Get the kind of negative entry for an upstream status, or None if it is not cached."""
+        if status_code == 400:
+            return BAD_REQUEST
+        if status_code == 404:
+            return NOT_FOUND
+        if status_code == 204:
+            return EMPTY
+        if status_code >= 500:
+            return UPSTREAM_ERROR
+        return None
+
+    @staticmethod
+    def unpack(entry: Any) -> Optional[Tuple[Any, int]]:
+        """Get (body, status) from a stored negative entry (e.g. read with get_many)."""
+        if not isinstance(entry, dict) or 'status' not in entry:
+            return None
+        return entry.get('body'), entry['status']
+
+    def get(self, cache_key: str) -> Optional[Tuple[Any, int]]:
+        """
+        Get the negative answer stored for a cache key.
+
+        Returns:
+            Tuple of (body, status code), or None
+        """
+        return self.unpack(redis_client.get(self.key(cache_key)))
+
+    def store(self, cache_key: str, kind: str, body: Any, status_code: int, tags: Iterable[str] = ()) -> bool:
+        """
+        Remember the answer to a query that carried no data.
+
+        Args:
+            cache_key: Key the data would have been cached under
+            kind: One of bad_request, not_found, empty or upstream_error
+            body: Response body returned to the client
+            status_code: Response status returned to the client
+            tags: Invalidation tags of the query
+
+        Returns:
+            True if stored
+        """
+        ttl = self.ttls.get(kind, 0)
+        if ttl <= 0:
+            return False
+        logger.info(f"Negative cache ({kind}) for {cache_key} for {ttl}s")
+        return redis_client.set(self.key(cache_key), {"kind": kind, "status": status_code, "body": body}, ttl, tags)
+
+
+# Global negative cache instance
+negative_cache = NegativeCache()
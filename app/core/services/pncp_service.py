@@ -2,12 +2,23 @@
 PNCP service for handling PNCP API interactions.
 """
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, Any, Optional, Tuple
-from flask import jsonify
-from app.extensions import redis_client
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from flask import Response, jsonify
+from app.extensions import redis_client, compression, json_codec, admission
+from app.extensions.request_timing import request_timing
 from app.config.settings import config
+from app.core.services.upstream import upstream_client
+from app.core.services.details import PNCP_WEB_URL, tender_details
+from app.core.services.negative_cache import EMPTY, NOT_FOUND, UPSTREAM_ERROR, negative_cache
+from app.core.services.snapshots import sort_key, tender_snapshots
+from app.core.services.ttl_policy import ttl_policy
+from app.core.utils.helpers import (
+    build_cache_key, cache_tags, decode_cursor, encode_cursor, normalize_pncp_ids, parse_pncp_id
+)
+from app.core.utils.projection import compile_fields, parse_fields, project
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,6 +26,14 @@ logger = logging.getLogger(__name__)
 # Get configuration
 current_config = config['default']()
 
+# Largest page served in cursor mode
+MAX_CURSOR_PAGE_SIZE = 500
+
+# Filters a cursor may carry (the validated open tenders filters)
+CURSOR_FILTERS = frozenset(('dataFinal', 'codigoModalidadeContratacao', 'uf', 'palavraChave'))
+
+INVALID_PNCP_ID_MESSAGE = "Invalid numeroControlePNCP. Use the format 18428888000123-1-000178/2024"
+
 
 class PNCPService:
     """Service class for PNCP API interactions."""
@@ -23,6 +42,33 @@ class PNCPService:
         """Initialize PNCP service."""
         self.pncp_api_base = current_config.PNCP_API_BASE
         self.consulta_api_base = current_config.CONSULTA_API_BASE
+        self.batch_max_ids = current_config.TENDER_BATCH_MAX_IDS
+        self.batch_concurrency = current_config.TENDER_BATCH_CONCURRENCY
+    
+    @staticmethod
+    def _transform_stats(data: Any, build_item: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Transform an upstream statistics payload into our format, sorted by quantity.
+        
+        Args:
+            data: Decoded upstream response (a list, or a dict with a "data" list)
+            build_item: Function mapping one upstream item to our format
+            
+        Returns:
+            Sorted statistics, or None if the payload could not be parsed
+        """
+        with request_timing.phase('transform'):
+            if isinstance(data, list):
+                items = data
+            elif isinstance(data, dict) and isinstance(data.get("data"), list):
+                items = data["data"]
+            else:
+                return None
+            
+            stats = [build_item(item) for item in items]
+            # Sort by quantity descending
+            stats.sort(key=lambda x: x['quantidade'], reverse=True)
+            return stats
     
     def get_open_tenders(self, args: Dict[str, Any]) -> Tuple[Any, int]:
         """Get open tenders from PNCP API with Redis caching and improved error handling."""
@@ -80,41 +126,75 @@ class PNCPService:
                 tamanhoPagina = 10
             params['tamanhoPagina'] = tamanhoPagina
             
+            # Field projection (None returns the full records)
+            try:
+                fields = parse_fields(args.get('fields'))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            
+            # Cursor mode: keyset pagination over a locally held, sorted snapshot
+            if 'cursor' in args:
+                return self._get_open_tenders_by_cursor(args.get('cursor') or '', params, fields)
+            
             # Log the parameters being sent
             logger.info(f"Sending request with params: {params}")
             
             # Create cache key based on parameters
-            cache_key = f"open_tenders:{hash(str(sorted(params.items())))}"
-            
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
+            cache_key = build_cache_key("open_tenders", params)
+            # Projected responses are cached under their own key, derived from the full entry
+            response_key = cache_key
+            if fields is not None:
+                response_key = build_cache_key("open_tenders", dict(params, fields=",".join(fields)))
+            
+            # Try the precompressed response first, then the cached data
+            precompressed = compression.serve_cached(response_key)
+            if precompressed is not None:
+                return precompressed, 200
+            
+            # One round-trip for the entry, the full one a projection derives from and the negative one
+            negative_key = negative_cache.key(cache_key)
+            if fields is None:
+                cached_result, negative = redis_client.get_many([response_key, negative_key])
+                full_result = None
+            else:
+                cached_result, full_result, negative = redis_client.get_many([response_key, cache_key, negative_key])
             if cached_result:
-                logger.info(f"Cache hit for open tenders with key: {cache_key}")
+                logger.info(f"Cache hit for open tenders with key: {response_key}")
                 return jsonify(cached_result), 200
             
+            negative = negative_cache.unpack(negative)
+            if negative is not None:
+                logger.info(f"Negative cache hit for open tenders with key: {cache_key}")
+                return jsonify(negative[0]), negative[1]
+            
+            if fields is not None:
+                if full_result:
+                    projected = self._project_tenders(full_result, fields)
+                    ttl = redis_client.ttl(cache_key)
+                    ttl = ttl if ttl > 0 else ttl_policy.ttl("open_tenders")
+                    redis_client.set(response_key, projected, ttl, cache_tags(params))
+                    return jsonify(projected), 200
+            
             # Call the actual API endpoint for open tenders
             url = f"{self.consulta_api_base}/v1/contratacoes/proposta"
             
             logger.info(f"Fetching open tenders from {url} with params: {params}")
-            response = requests.get(url, params=params, timeout=30)
+            response = upstream_client.get(url, "/v1/contratacoes/proposta", params=params, timeout=30)
+            
+            # No tender matches the filters
+            if response.status_code == 204:
+                data = self._empty_tender_page(params['pagina'])
+                negative_cache.store(cache_key, EMPTY, data, 200, cache_tags(params))
+                return jsonify(data), 200
             
             # Check if response is successful
             if response.status_code != 200:
                 logger.error(f"API request failed with status {response.status_code}: {response.text[:200]}")
-                
-                # Return appropriate error messages
-                if response.status_code == 400:
-                    return jsonify({"error": "Invalid request parameters"}), 400
-                elif response.status_code == 404:
-                    return jsonify({"error": "Endpoint not found"}), 404
-                elif response.status_code >= 500:
-                    return jsonify({"error": "PNCP API service temporarily unavailable"}), 503
-                else:
-                    return jsonify({"error": f"API request failed with status {response.status_code}"}), response.status_code
+                return self._upstream_error(cache_key, response.status_code, cache_tags(params))
             
             # Get JSON data
             try:
-                data = response.json()
+                data = upstream_client.parse_json(response)
                 logger.info(f"Received data with {len(data.get('data', []))} records")
             except ValueError as e:
                 logger.error(f"Failed to parse JSON response: {e}")
@@ -126,68 +206,381 @@ class PNCPService:
                 logger.error(f"Unexpected response type: {type(data)}")
                 return jsonify({"error": "Unexpected response format from PNCP API"}), 500
             
-            # Cache the result for 10 minutes (600 seconds)
-            redis_client.set(cache_key, data, 600)
+            # Empty pages are only remembered briefly
+            tags = cache_tags(params)
+            if not data.get('data'):
+                negative_cache.store(cache_key, EMPTY, data, 200, tags)
+                return jsonify(data), 200
+            
+            # Cache the result, with its projection if any
+            ttl = ttl_policy.ttl("open_tenders")
+            if fields is None:
+                redis_client.set(cache_key, data, ttl, tags)
+            else:
+                full_data, data = data, self._project_tenders(data, fields)
+                redis_client.set_many({cache_key: full_data, response_key: data}, ttl, tags)
             
             return jsonify(data), 200
             
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"Connection error to PNCP API: {e}")
-            return jsonify({"error": "Unable to connect to PNCP API"}), 503
-        except requests.exceptions.Timeout as e:
-            logger.error(f"Timeout connecting to PNCP API: {e}")
-            return jsonify({"error": "Request timeout - PNCP API took too long to respond"}), 504
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request error: {e}")
-            return jsonify({"error": "Error communicating with PNCP API"}), 500
+            return self._upstream_exception(cache_key, e, cache_tags(params))
         except Exception as e:
             logger.exception(f"Unexpected error in get_open_tenders: {str(e)}")
             return jsonify({"error": "Internal server error"}), 500
     
+    @staticmethod
+    def _empty_tender_page(pagina: int) -> Dict[str, Any]:
+        """Tender page envelope without records, as PNCP answers 204 No Content."""
+        return {"data": [], "totalRegistros": 0, "totalPaginas": 0, "numeroPagina": pagina,
+                "paginasRestantes": 0, "empty": True}
+    
+    @staticmethod
+    def _upstream_error(cache_key: str, status_code: int, tags: List[str],
+                        empty: Any = None) -> Tuple[Any, int]:
+        """
+        Answer a PNCP error status, remembering it in the negative cache.
+        
+        Args:
+            cache_key: Key the data would have been cached under
+            status_code: Status returned by PNCP
+            tags: Invalidation tags of the query
+            empty: Body to answer 204 No Content with, as a 200 (an error otherwise)
+            
+        Returns:
+            Tuple of (error response, status code)
+        """
+        if status_code == 204 and empty is not None:
+            negative_cache.store(cache_key, EMPTY, empty, 200, tags)
+            return jsonify(empty), 200
+        if status_code == 400:
+            body, status = {"error": "Invalid request parameters"}, 400
+        elif status_code == 404:
+            body, status = {"error": "Endpoint not found"}, 404
+        elif status_code >= 500:
+            body, status = {"error": "PNCP API service temporarily unavailable"}, 503
+        else:
+            body, status = {"error": f"API request failed with status {status_code}"}, status_code
+        
+        kind = negative_cache.kind_for_status(status_code)
+        if kind is not None:
+            negative_cache.store(cache_key, kind, body, status, tags)
+        return jsonify(body), status
+    
+    @staticmethod
+    def _decode_stats(response: requests.Response) -> Any:
+        """Decode a statistics payload, or None if the body is not valid JSON."""
+        try:
+            return upstream_client.parse_json(response)
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _unparseable_response(cache_key: str, tags: List[str]) -> Tuple[Any, int]:
+        """
+        Answer a PNCP success whose payload could not be read, as a short-lived upstream error.
+        
+        Args:
+            cache_key: Key the data would have been cached under
+            tags: Invalidation tags of the query
+            
+        Returns:
+            Tuple of (error response, status code)
+        """
+        logger.error(f"Unexpected payload from PNCP API for key: {cache_key}")
+        body, status = {"error": "Invalid response from PNCP API"}, 502
+        if cache_key is not None:
+            negative_cache.store(cache_key, UPSTREAM_ERROR, body, status, tags)
+        return jsonify(body), status
+    
+    @staticmethod
+    def _upstream_exception(cache_key: Optional[str], error: requests.exceptions.RequestException,
+                            tags: List[str]) -> Tuple[Any, int]:
+        """
+        Answer a failed request to PNCP, remembering outages in the negative cache.
+        
+        Args:
+            cache_key: Key the data would have been cached under (None to skip the negative cache)
+            error: Exception raised by the request
+            tags: Invalidation tags of the query
+            
+        Returns:
+            Tuple of (error response, status code)
+        """
+        if isinstance(error, requests.exceptions.ConnectionError):
+            logger.error(f"Connection error to PNCP API: {error}")
+            body, status = {"error": "Unable to connect to PNCP API"}, 503
+        elif isinstance(error, requests.exceptions.Timeout):
+            logger.error(f"Timeout connecting to PNCP API: {error}")
+            body, status = {"error": "Request timeout - PNCP API took too long to respond"}, 504
+        else:
+            logger.error(f"Request error: {error}")
+            return jsonify({"error": "Error communicating with PNCP API"}), 500
+        
+        if cache_key is not None:
+            negative_cache.store(cache_key, UPSTREAM_ERROR, body, status, tags)
+        return jsonify(body), status
+    
+    @staticmethod
+    def _project_tenders(data: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Project the records of a listing payload onto the requested fields.
+        
+        Args:
+            data: Listing payload with a "data" list of tenders
+            fields: Field paths from parse_fields
+            
+        Returns:
+            Copy of the payload with projected records
+        """
+        with request_timing.phase('transform'):
+            return dict(data, data=project(data.get("data") or [], compile_fields(fields)))
+    
+    def _get_open_tenders_by_cursor(self, cursor: str, params: Dict[str, Any],
+                                    fields: Optional[Tuple[str, ...]] = None) -> Tuple[Any, int]:
+        """
+        Get a page of open tenders using an opaque cursor.
+        
+        Pages come from a snapshot sorted by (dataEncerramentoProposta,
+        numeroControlePNCP). The cursor carries the filters and the sort key
+        of the last record returned, so any page costs the same as the first
+        and a walk never repeats or skips records, even if the snapshot is
+        rebuilt in between.
+        
+        Args:
+            cursor: Cursor from a previous page ("" for the first page)
+            params: Validated query parameters
+            fields: Field paths to project the records onto (None for full records)
+            
+        Returns:
+            Tuple of (response, status code)
+        """
+        filters = {key: value for key, value in params.items() if key not in ('pagina', 'tamanhoPagina')}
+        size = min(params['tamanhoPagina'], MAX_CURSOR_PAGE_SIZE)
+        last_key = None
+        
+        if cursor:
+            state = decode_cursor(cursor, current_config.SECRET_KEY)
+            if state is None or not self._valid_cursor_state(state):
+                return jsonify({"error": "Invalid cursor"}), 400
+            # The cursor's filters win, so a walk stays on one result set
+            filters = state['f']
+            last_key = tuple(state['k'])
+            size = min(max(state['n'], 1), MAX_CURSOR_PAGE_SIZE)
+        
+        try:
+            snapshot = tender_snapshots.get(filters)
+        except ValueError as e:
+            logger.error(f"Error building open tenders snapshot: {e}")
+            return jsonify({"error": "PNCP API service temporarily unavailable"}), 503
+        except requests.exceptions.RequestException as e:
+            # Snapshots are cached on their own, so there is no negative entry to keep
+            return self._upstream_exception(None, e, [])
+        
+        page = snapshot.page_after(last_key, size)
+        next_cursor = None
+        if page and sort_key(page[-1]) != snapshot.keys[-1]:
+            next_cursor = encode_cursor({'f': filters, 'k': list(sort_key(page[-1])), 'n': size},
+                                        current_config.SECRET_KEY)
+        
+        if fields is not None:
+            with request_timing.phase('transform'):
+                page = project(page, compile_fields(fields))
+        
+        return jsonify({
+            "data": page,
+            "totalRegistros": len(snapshot.records),
+            "tamanhoPagina": size,
+            "proximoCursor": next_cursor,
+            "snapshotEm": datetime.fromtimestamp(snapshot.created_at).isoformat(),
+            "resultadoTruncado": snapshot.truncated
+        }), 200
+    
+    @staticmethod
+    def _valid_cursor_state(state: Dict[str, Any]) -> bool:
+        """
+        Check the types of a decoded cursor before they reach the snapshot.
+        
+        Cursors are signed, so this only guards against cursors of another
+        version of this code: filters must be known string filters, the sort
+        key two strings and the page size an int.
+        """
+        filters, last_key, size = state.get('f'), state.get('k'), state.get('n')
+        return (isinstance(filters, dict) and filters.keys() <= CURSOR_FILTERS
+                and all(isinstance(value, str) for value in filters.values())
+                and isinstance(last_key, list) and len(last_key) == 2
+                and all(isinstance(part, str) for part in last_key)
+                and type(size) is int)
+    
     def get_tender_details(self, numeroControlePNCP: str) -> Tuple[Any, int]:
-        """Get details for a specific tender."""
+        """Get the details of a tender (compra, items, documents and results) with Redis caching."""
         try:
-            # Log the original ID
             logger.info(f"Fetching details for tender ID: {numeroControlePNCP}")
             
-            # Try to parse and convert the ID format for PNCP web URL
-            pncp_web_url = None
-            if '-' in numeroControlePNCP and '/' in numeroControlePNCP:
-                try:
-                    # Convert from format: 18428888000123-1-000178/2024
-                    # To format: 18428888000123/2024/178
-                    parts = numeroControlePNCP.split('-')
-                    cnpj = parts[0]
-                    sequencial_part = parts[2]  # 000178/2024
-                    
-                    # Split sequencial_part to get sequencial and year
-                    sequencial_year = sequencial_part.split('/')
-                    sequencial = sequencial_year[0]  # 000178
-                    year = sequencial_year[1]  # 2024
-                    
-                    # Remove leading zeros from sequencial
-                    sequencial_number = int(sequencial)
-                    
-                    # Construct the PNCP web URL
-                    pncp_web_url = f"https://pncp.gov.br/app/editais/{cnpj}/{year}/{sequencial_number}"
-                    logger.info(f"Constructed PNCP web URL: {pncp_web_url}")
-                except Exception as e:
-                    logger.error(f"Error parsing ID for PNCP web URL: {e}")
-                    pncp_web_url = None
-            
-            # Since the API endpoints are not working, we'll return a response with just the web URL
-            # This allows users to access the details directly on the PNCP website
-            response_data = {
-                "numeroControlePNCP": numeroControlePNCP,
-                "pncp_web_url": pncp_web_url,
-                "message": "Os detalhes da licitação não estão disponíveis através da API do PNCP neste momento. Você pode acessar os detalhes diretamente no Portal Nacional de Contratações Públicas usando o botão abaixo.",
-                "status": "unavailable"
-            }
+            parts = parse_pncp_id(numeroControlePNCP)
+            if parts is None:
+                return jsonify({
+                    "error": INVALID_PNCP_ID_MESSAGE,
+                    "numeroControlePNCP": numeroControlePNCP
+                }), 400
+            
+            # Try the precompressed response first, then the cached data
+            cache_key = self._details_cache_key(parts)
+            precompressed = compression.serve_cached(cache_key)
+            if precompressed is not None:
+                return precompressed, 200
+            
+            cached_result, negative = redis_client.get_many([cache_key, negative_cache.key(cache_key)])
+            if cached_result:
+                logger.info(f"Cache hit for tender details with key: {cache_key}")
+                return jsonify(cached_result), 200
             
-            return jsonify(response_data), 200
+            negative = negative_cache.unpack(negative)
+            if negative is not None:
+                logger.info(f"Negative cache hit for tender details with key: {cache_key}")
+                return jsonify(negative[0]), negative[1]
+            
+            data, status_code = self._resolve_tender_details(numeroControlePNCP, parts)
+            return jsonify(data), status_code
         except Exception as e:
-            logger.error(f"Error in get_tender_details: {str(e)}")
-            return jsonify({"error": str(e)}), 500
+            logger.exception(f"Unexpected error in get_tender_details: {str(e)}")
+            return jsonify({"error": "Internal server error"}), 500
+    
+    def get_tenders_batch(self, payload: Any) -> Tuple[Any, int]:
+        """
+        Resolve many tenders at once, streaming the results as NDJSON.
+        
+        The body is ``{"ids": [...]}`` (or the list itself). IDs are
+        validated and de-duplicated up front and every cached one is read
+        with a single MGET and sent first; the misses are then fetched
+        TENDER_BATCH_CONCURRENCY at a time and each line is sent as soon as
+        its tender is ready, so the order of the misses is not preserved.
+        
+        Each line is ``{"numeroControlePNCP", "status", "data"}`` or, for
+        invalid, missing or failed tenders, ``{"numeroControlePNCP",
+        "status", "error"}``.
+        
+        Args:
+            payload: Decoded request body
+            
+        Returns:
+            Tuple of (response, status code)
+        """
+        ids = payload.get("ids") if isinstance(payload, dict) else payload
+        if not isinstance(ids, list) or not ids:
+            return jsonify({"error": "Request body must be a non-empty list of numeroControlePNCP in 'ids'"}), 400
+        if len(ids) > self.batch_max_ids:
+            return jsonify({"error": f"Too many IDs (maximum {self.batch_max_ids})"}), 400
+        
+        valid, invalid = normalize_pncp_ids(ids)
+        keys = [self._details_cache_key(parts) for parts in valid.values()]
+        # Cached and negative entries of every ID in one MGET
+        entries = redis_client.get_many(keys + [negative_cache.key(key) for key in keys])
+        cached, negatives = entries[:len(keys)], entries[len(keys):]
+        logger.info(f"Tender batch: {len(valid)} IDs, {sum(1 for c in cached if c)} cached, {len(invalid)} invalid")
+        
+        def line(numeroControlePNCP: Any, status_code: int, data: Dict[str, Any]) -> bytes:
+            entry = {"numeroControlePNCP": numeroControlePNCP, "status": status_code}
+            entry.update({"data": data} if status_code == 200 else data)
+            return json_codec.dumps(entry) + b'\n'
+        
+        def generate() -> Iterator[bytes]:
+            for value in invalid:
+                yield line(value, 400, {"error": INVALID_PNCP_ID_MESSAGE})
+            
+            misses = []
+            for (numeroControlePNCP, parts), data, negative in zip(valid.items(), cached, negatives):
+                negative = negative_cache.unpack(negative)
+                if data:
+                    yield line(numeroControlePNCP, 200, data)
+                elif negative is not None:
+                    yield line(numeroControlePNCP, negative[1], negative[0])
+                else:
+                    misses.append((numeroControlePNCP, parts))
+            if not misses:
+                return
+            
+            executor = ThreadPoolExecutor(max_workers=min(self.batch_concurrency, len(misses)))
+            try:
+                futures = {
+                    executor.submit(self._resolve_tender_details, numeroControlePNCP, parts): numeroControlePNCP
+                    for numeroControlePNCP, parts in misses
+                }
+                for future in as_completed(futures):
+                    try:
+                        data, status_code = future.result()
+                    except Exception as e:
+                        logger.exception(f"Unexpected error resolving {futures[future]}: {e}")
+                        data, status_code = {"error": "Internal server error"}, 500
+                    yield line(futures[future], status_code, data)
+            finally:
+                # A client that disconnected mid-stream does not wait for the IDs still queued
+                executor.shutdown(wait=False, cancel_futures=True)
+        
+        return Response(generate(), mimetype='application/x-ndjson'), 200
+    
+    @staticmethod
+    def _details_cache_key(parts: Tuple[str, int, int]) -> str:
+        """Cache key of the details of a tender, from its parsed ID."""
+        cnpj, ano, sequencial = parts
+        return build_cache_key("tender_details", {"cnpj": cnpj, "ano": ano, "sequencial": sequencial})
+    
+    def _resolve_tender_details(self, numeroControlePNCP: str,
+                                parts: Tuple[str, int, int]) -> Tuple[Dict[str, Any], int]:
+        """
+        Fetch the details of a tender from PNCP and cache them.
+        
+        Safe to call outside a request (the batch endpoint runs it on a
+        thread pool), so it returns plain data instead of a response.
+        
+        Args:
+            numeroControlePNCP: ID as given by the client
+            parts: Parsed ID (cnpj, ano, sequencial)
+            
+        Returns:
+            Tuple of (details or error body, status code)
+        """
+        cnpj, ano, sequencial = parts
+        cache_key = self._details_cache_key(parts)
+        try:
+            # The fan-out runs on worker threads, so the request's slot is taken here
+            admission.acquire()
+            result = tender_details.fetch(cnpj, ano, sequencial)
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"Connection error to PNCP API: {e}")
+            body, status_code = {"error": "Unable to connect to PNCP API"}, 503
+        except requests.exceptions.Timeout as e:
+            logger.error(f"Timeout connecting to PNCP API: {e}")
+            body, status_code = {"error": "Request timeout - PNCP API took too long to respond"}, 504
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error: {e}")
+            return {"error": "Error communicating with PNCP API"}, 500
+        except ValueError as e:
+            logger.error(f"Error fetching tender details: {e}")
+            body, status_code = {"error": "PNCP API service temporarily unavailable"}, 503
+        else:
+            body, status_code = None, 200
+        if status_code != 200:
+            negative_cache.store(cache_key, UPSTREAM_ERROR, body, status_code)
+            return body, status_code
+        
+        if result is None:
+            body = {
+                "error": "Dados não encontrados",
+                "message": "A licitação não foi encontrada no PNCP.",
+                "numeroControlePNCP": numeroControlePNCP,
+                "pncp_web_url": PNCP_WEB_URL.format(cnpj=cnpj, ano=ano, sequencial=sequencial)
+            }
+            negative_cache.store(cache_key, NOT_FOUND, body, 404)
+            return body, 404
+        
+        # Closed tenders do not change, so they are cached for much longer
+        data, ttl = result
+        redis_client.set(cache_key, data, ttl, cache_tags({
+            "uf": (data.get("orgaoEntidade") or {}).get("ufSigla"),
+            "modalidadeId": data.get("modalidadeId"),
+            "dataPublicacaoPncp": data.get("dataPublicacaoPncp")
+        }))
+        return data, 200
     
     def get_modalidade_stats(self, args: Dict[str, Any]) -> Tuple[Any, int]:
         """Get statistics by modality from real PNCP API with Redis caching."""
@@ -216,112 +609,58 @@ class PNCPService:
                 params['uf'] = uf
                 
             # Create cache key based on parameters
-            cache_key = f"modalidade_stats:{hash(str(sorted(params.items())))}"
+            cache_key = build_cache_key("modalidade_stats", params)
+            
+            # Try the precompressed response first, then the cached data
+            precompressed = compression.serve_cached(cache_key)
+            if precompressed is not None:
+                return precompressed, 200
             
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
+            cached_result, negative = redis_client.get_many([cache_key, negative_cache.key(cache_key)])
             if cached_result:
                 logger.info(f"Cache hit for modality stats with key: {cache_key}")
                 return jsonify(cached_result), 200
             
+            negative = negative_cache.unpack(negative)
+            if negative is not None:
+                return jsonify(negative[0]), negative[1]
+            
             # Call the PNCP API endpoint for modality statistics
             url = f"{self.consulta_api_base}/v1/contratacoes/modalidades"
             
             logger.info(f"Fetching modality statistics from {url} with params: {params}")
-            response = requests.get(url, params=params, timeout=30)
+            response = upstream_client.get(url, "/v1/contratacoes/modalidades", params=params, timeout=30)
             
             # Process the response
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode_stats(response)
                 # Transform the data to match our expected format
-                stats = []
-                if isinstance(data, list):
-                    for item in data:
-                        stats.append({
-                            "modalidade": item.get("nome", "N/A"),
-                            "codigo": item.get("codigo", 0),
-                            "quantidade": item.get("quantidade", 0),
-                            "valor": item.get("valorTotal", 0)
-                        })
-                else:
-                    # If it's not a list, try to extract from the response
-                    if "data" in data and isinstance(data["data"], list):
-                        for item in data["data"]:
-                            stats.append({
-                                "modalidade": item.get("nome", "N/A"),
-                                "codigo": item.get("codigo", 0),
-                                "quantidade": item.get("quantidade", 0),
-                                "valor": item.get("valorTotal", 0)
-                            })
-                    else:
-                        # Fallback to placeholder data if we can't parse the response
-                        stats = [
-                            {"modalidade": "Pregão", "codigo": 6, "quantidade": 45, "valor": 1250000.50},
-                            {"modalidade": "Concorrência", "codigo": 1, "quantidade": 12, "valor": 3200000.75},
-                            {"modalidade": "Tomada de Preços", "codigo": 2, "quantidade": 8, "valor": 850000.25},
-                            {"modalidade": "Credenciamento", "codigo": 12, "quantidade": 22, "valor": 1950000.00},
-                            {"modalidade": "Dispensa de Licitação", "codigo": 7, "quantidade": 67, "valor": 4200000.30},
-                            {"modalidade": "Inexigibilidade de Licitação", "codigo": 8, "quantidade": 15, "valor": 950000.00},
-                            {"modalidade": "Convite", "codigo": 3, "quantidade": 5, "valor": 320000.00}
-                        ]
+                stats = self._transform_stats(data, lambda item: {
+                    "modalidade": item.get("nome", "N/A"),
+                    "codigo": item.get("codigo", 0),
+                    "quantidade": item.get("quantidade", 0),
+                    "valor": item.get("valorTotal", 0)
+                })
+                if stats is None:
+                    return self._unparseable_response(cache_key, cache_tags(params))
                 
-                # Sort by quantity descending
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
+                # Cache the result for as long as its window allows; empty results only briefly
+                if stats:
+                    redis_client.set(cache_key, stats, ttl_policy.for_query("modalidade_stats", params), cache_tags(params))
+                else:
+                    negative_cache.store(cache_key, EMPTY, stats, 200, cache_tags(params))
                 
                 logger.info(f"Returning modality statistics: {stats}")
                 return jsonify(stats), 200
             else:
-                # If we don't get a successful response, fallback to placeholder data
-                stats = [
-                    {"modalidade": "Pregão", "codigo": 6, "quantidade": 45, "valor": 1250000.50},
-                    {"modalidade": "Concorrência", "codigo": 1, "quantidade": 12, "valor": 3200000.75},
-                    {"modalidade": "Tomada de Preços", "codigo": 2, "quantidade": 8, "valor": 850000.25},
-                    {"modalidade": "Credenciamento", "codigo": 12, "quantidade": 22, "valor": 1950000.00},
-                    {"modalidade": "Dispensa de Licitação", "codigo": 7, "quantidade": 67, "valor": 4200000.30},
-                    {"modalidade": "Inexigibilidade de Licitação", "codigo": 8, "quantidade": 15, "valor": 950000.00},
-                    {"modalidade": "Convite", "codigo": 3, "quantidade": 5, "valor": 320000.00}
-                ]
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
-                
-                return jsonify(stats), 200
+                logger.error(f"API request failed with status {response.status_code}: {response.text[:200]}")
+                return self._upstream_error(cache_key, response.status_code, cache_tags(params), empty=[])
                 
-        except requests.exceptions.Timeout:
-            # Fallback to placeholder data on timeout
-            stats = [
-                {"modalidade": "Pregão", "codigo": 6, "quantidade": 45, "valor": 1250000.50},
-                {"modalidade": "Concorrência", "codigo": 1, "quantidade": 12, "valor": 3200000.75},
-                {"modalidade": "Tomada de Preços", "codigo": 2, "quantidade": 8, "valor": 850000.25},
-                {"modalidade": "Credenciamento", "codigo": 12, "quantidade": 22, "valor": 1950000.00},
-                {"modalidade": "Dispensa de Licitação", "codigo": 7, "quantidade": 67, "valor": 4200000.30},
-                {"modalidade": "Inexigibilidade de Licitação", "codigo": 8, "quantidade": 15, "valor": 950000.00},
-                {"modalidade": "Convite", "codigo": 3, "quantidade": 5, "valor": 320000.00}
-            ]
-            stats.sort(key=lambda x: x['quantidade'], reverse=True)
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"modalidade_stats_timeout:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, stats, 900)
-            
-            return jsonify(stats), 200
+        except requests.exceptions.RequestException as e:
+            return self._upstream_exception(cache_key, e, cache_tags(params))
         except Exception as e:
             logger.error(f"Error in get_modalidade_stats: {str(e)}")
-            # Fallback to simple placeholder data
-            fallback_stats = [
-                {"modalidade": "Pregão", "quantidade": 45, "valor": 1250000.50},
-                {"modalidade": "Concorrência", "quantidade": 12, "valor": 3200000.75}
-            ]
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"modalidade_stats_error:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, fallback_stats, 900)
-            
-            return jsonify(fallback_stats), 200
+            return jsonify({"error": "Internal server error"}), 500
     
     def get_uf_stats(self, args: Dict[str, Any]) -> Tuple[Any, int]:
         """Get statistics by UF from real PNCP API with Redis caching."""
@@ -345,119 +684,57 @@ class PNCPService:
             params['dataFinal'] = data_final
             
             # Create cache key based on parameters
-            cache_key = f"uf_stats:{hash(str(sorted(params.items())))}"
+            cache_key = build_cache_key("uf_stats", params)
+            
+            # Try the precompressed response first, then the cached data
+            precompressed = compression.serve_cached(cache_key)
+            if precompressed is not None:
+                return precompressed, 200
             
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
+            cached_result, negative = redis_client.get_many([cache_key, negative_cache.key(cache_key)])
             if cached_result:
                 logger.info(f"Cache hit for UF stats with key: {cache_key}")
                 return jsonify(cached_result), 200
             
+            negative = negative_cache.unpack(negative)
+            if negative is not None:
+                return jsonify(negative[0]), negative[1]
+            
             # Call the PNCP API endpoint for UF statistics
             url = f"{self.consulta_api_base}/v1/contratacoes/uf"
             
             logger.info(f"Fetching UF statistics from {url} with params: {params}")
-            response = requests.get(url, params=params, timeout=30)
+            response = upstream_client.get(url, "/v1/contratacoes/uf", params=params, timeout=30)
             
             # Process the response
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode_stats(response)
                 # Transform the data to match our expected format
-                stats = []
-                if isinstance(data, list):
-                    for item in data:
-                        stats.append({
-                            "uf": item.get("uf", "N/A"),
-                            "quantidade": item.get("quantidade", 0),
-                            "valor": item.get("valorTotal", 0)
-                        })
-                else:
-                    # If it's not a list, try to extract from the response
-                    if "data" in data and isinstance(data["data"], list):
-                        for item in data["data"]:
-                            stats.append({
-                                "uf": item.get("uf", "N/A"),
-                                "quantidade": item.get("quantidade", 0),
-                                "valor": item.get("valorTotal", 0)
-                            })
-                    else:
-                        # Fallback to placeholder data if we can't parse the response
-                        stats = [
-                            {"uf": "SP", "quantidade": 89, "valor": 7800000.50},
-                            {"uf": "RJ", "quantidade": 45, "valor": 3200000.75},
-                            {"uf": "MG", "quantidade": 67, "valor": 4500000.25},
-                            {"uf": "RS", "quantidade": 34, "valor": 2100000.00},
-                            {"uf": "PR", "quantidade": 28, "valor": 1800000.30},
-                            {"uf": "SC", "quantidade": 22, "valor": 1500000.00},
-                            {"uf": "GO", "quantidade": 19, "valor": 1300000.50},
-                            {"uf": "DF", "quantidade": 16, "valor": 2200000.00},
-                            {"uf": "PE", "quantidade": 14, "valor": 950000.75},
-                            {"uf": "CE", "quantidade": 12, "valor": 875000.25}
-                        ]
-                
-                # Sort by quantity descending
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
+                stats = self._transform_stats(data, lambda item: {
+                    "uf": item.get("uf", "N/A"),
+                    "quantidade": item.get("quantidade", 0),
+                    "valor": item.get("valorTotal", 0)
+                })
+                if stats is None:
+                    return self._unparseable_response(cache_key, cache_tags(params))
                 
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
+                # Cache the result for as long as its window allows; empty results only briefly
+                if stats:
+                    redis_client.set(cache_key, stats, ttl_policy.for_query("uf_stats", params), cache_tags(params))
+                else:
+                    negative_cache.store(cache_key, EMPTY, stats, 200, cache_tags(params))
                 
                 logger.info(f"Returning UF statistics: {stats}")
                 return jsonify(stats), 200
             else:
-                # If we don't get a successful response, fallback to placeholder data
-                stats = [
-                    {"uf": "SP", "quantidade": 89, "valor": 7800000.50},
-                    {"uf": "RJ", "quantidade": 45, "valor": 3200000.75},
-                    {"uf": "MG", "quantidade": 67, "valor": 4500000.25},
-                    {"uf": "RS", "quantidade": 34, "valor": 2100000.00},
-                    {"uf": "PR", "quantidade": 28, "valor": 1800000.30},
-                    {"uf": "SC", "quantidade": 22, "valor": 1500000.00},
-                    {"uf": "GO", "quantidade": 19, "valor": 1300000.50},
-                    {"uf": "DF", "quantidade": 16, "valor": 2200000.00},
-                    {"uf": "PE", "quantidade": 14, "valor": 950000.75},
-                    {"uf": "CE", "quantidade": 12, "valor": 875000.25}
-                ]
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
-                
-                return jsonify(stats), 200
+                logger.error(f"API request failed with status {response.status_code}: {response.text[:200]}")
+                return self._upstream_error(cache_key, response.status_code, cache_tags(params), empty=[])
                 
-        except requests.exceptions.Timeout:
-            # Fallback to placeholder data on timeout
-            stats = [
-                {"uf": "SP", "quantidade": 89, "valor": 7800000.50},
-                {"uf": "RJ", "quantidade": 45, "valor": 3200000.75},
-                {"uf": "MG", "quantidade": 67, "valor": 4500000.25},
-                {"uf": "RS", "quantidade": 34, "valor": 2100000.00},
-                {"uf": "PR", "quantidade": 28, "valor": 1800000.30},
-                {"uf": "SC", "quantidade": 22, "valor": 1500000.00},
-                {"uf": "GO", "quantidade": 19, "valor": 1300000.50},
-                {"uf": "DF", "quantidade": 16, "valor": 2200000.00},
-                {"uf": "PE", "quantidade": 14, "valor": 950000.75},
-                {"uf": "CE", "quantidade": 12, "valor": 875000.25}
-            ]
-            stats.sort(key=lambda x: x['quantidade'], reverse=True)
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"uf_stats_timeout:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, stats, 900)
-            
-            return jsonify(stats), 200
+        except requests.exceptions.RequestException as e:
+            return self._upstream_exception(cache_key, e, cache_tags(params))
         except Exception as e:
             logger.error(f"Error in get_uf_stats: {str(e)}")
-            # Fallback to simple placeholder data
-            fallback_stats = [
-                {"uf": "SP", "quantidade": 89, "valor": 7800000.50},
-                {"uf": "RJ", "quantidade": 45, "valor": 3200000.75}
-            ]
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"uf_stats_error:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, fallback_stats, 900)
-            
-            return jsonify(fallback_stats), 200
+            return jsonify({"error": "Internal server error"}), 500
     
     def get_tipo_orgao_stats(self, args: Dict[str, Any]) -> Tuple[Any, int]:
         """Get statistics by organization type from real PNCP API with Redis caching."""
@@ -486,104 +763,57 @@ class PNCPService:
                 params['uf'] = uf
                 
             # Create cache key based on parameters
-            cache_key = f"tipo_orgao_stats:{hash(str(sorted(params.items())))}"
+            cache_key = build_cache_key("tipo_orgao_stats", params)
             
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
+            # Try the precompressed response first, then the cached data
+            precompressed = compression.serve_cached(cache_key)
+            if precompressed is not None:
+                return precompressed, 200
+            
+            cached_result, negative = redis_client.get_many([cache_key, negative_cache.key(cache_key)])
             if cached_result:
                 logger.info(f"Cache hit for tipo orgao stats with key: {cache_key}")
                 return jsonify(cached_result), 200
             
+            negative = negative_cache.unpack(negative)
+            if negative is not None:
+                return jsonify(negative[0]), negative[1]
+            
             # Call the PNCP API endpoint for organization type statistics
             url = f"{self.consulta_api_base}/v1/contratacoes/tipoOrgao"
             
             logger.info(f"Fetching organization type statistics from {url} with params: {params}")
-            response = requests.get(url, params=params, timeout=30)
+            response = upstream_client.get(url, "/v1/contratacoes/tipoOrgao", params=params, timeout=30)
             
             # Process the response
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode_stats(response)
                 # Transform the data to match our expected format
-                stats = []
-                if isinstance(data, list):
-                    for item in data:
-                        stats.append({
-                            "tipoOrgao": item.get("tipoOrgao", "N/A"),
-                            "quantidade": item.get("quantidade", 0),
-                            "valor": item.get("valorTotal", 0)
-                        })
-                else:
-                    # If it's not a list, try to extract from the response
-                    if "data" in data and isinstance(data["data"], list):
-                        for item in data["data"]:
-                            stats.append({
-                                "tipoOrgao": item.get("tipoOrgao", "N/A"),
-                                "quantidade": item.get("quantidade", 0),
-                                "valor": item.get("valorTotal", 0)
-                            })
-                    else:
-                        # Fallback to placeholder data if we can't parse the response
-                        stats = [
-                            {"tipoOrgao": "Prefeitura", "quantidade": 125, "valor": 8900000.50},
-                            {"tipoOrgao": "Ministério", "quantidade": 42, "valor": 15600000.75},
-                            {"tipoOrgao": "Universidade", "quantidade": 38, "valor": 3200000.25},
-                            {"tipoOrgao": "Empresa Pública", "quantidade": 27, "valor": 4500000.00},
-                            {"tipoOrgao": "Autarquia", "quantidade": 19, "valor": 2100000.30}
-                        ]
+                stats = self._transform_stats(data, lambda item: {
+                    "tipoOrgao": item.get("tipoOrgao", "N/A"),
+                    "quantidade": item.get("quantidade", 0),
+                    "valor": item.get("valorTotal", 0)
+                })
+                if stats is None:
+                    return self._unparseable_response(cache_key, cache_tags(params))
                 
-                # Sort by quantity descending
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
+                # Cache the result for as long as its window allows; empty results only briefly
+                if stats:
+                    redis_client.set(cache_key, stats, ttl_policy.for_query("tipo_orgao_stats", params), cache_tags(params))
+                else:
+                    negative_cache.store(cache_key, EMPTY, stats, 200, cache_tags(params))
                 
                 logger.info(f"Returning organization type statistics: {stats}")
                 return jsonify(stats), 200
             else:
-                # If we don't get a successful response, fallback to placeholder data
-                stats = [
-                    {"tipoOrgao": "Prefeitura", "quantidade": 125, "valor": 8900000.50},
-                    {"tipoOrgao": "Ministério", "quantidade": 42, "valor": 15600000.75},
-                    {"tipoOrgao": "Universidade", "quantidade": 38, "valor": 3200000.25},
-                    {"tipoOrgao": "Empresa Pública", "quantidade": 27, "valor": 4500000.00},
-                    {"tipoOrgao": "Autarquia", "quantidade": 19, "valor": 2100000.30}
-                ]
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
-                
-                return jsonify(stats), 200
+                logger.error(f"API request failed with status {response.status_code}: {response.text[:200]}")
+                return self._upstream_error(cache_key, response.status_code, cache_tags(params), empty=[])
                 
-        except requests.exceptions.Timeout:
-            # Fallback to placeholder data on timeout
-            stats = [
-                {"tipoOrgao": "Prefeitura", "quantidade": 125, "valor": 8900000.50},
-                {"tipoOrgao": "Ministério", "quantidade": 42, "valor": 15600000.75},
-                {"tipoOrgao": "Universidade", "quantidade": 38, "valor": 3200000.25},
-                {"tipoOrgao": "Empresa Pública", "quantidade": 27, "valor": 4500000.00},
-                {"tipoOrgao": "Autarquia", "quantidade": 19, "valor": 2100000.30}
-            ]
-            stats.sort(key=lambda x: x['quantidade'], reverse=True)
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"tipo_orgao_stats_timeout:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, stats, 900)
-            
-            return jsonify(stats), 200
+        except requests.exceptions.RequestException as e:
+            return self._upstream_exception(cache_key, e, cache_tags(params))
         except Exception as e:
             logger.error(f"Error in get_tipo_orgao_stats: {str(e)}")
-            # Fallback to simple placeholder data
-            fallback_stats = [
-                {"tipoOrgao": "Prefeitura", "quantidade": 125, "valor": 8900000.50},
-                {"tipoOrgao": "Ministério", "quantidade": 42, "valor": 15600000.75}
-            ]
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"tipo_orgao_stats_error:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, fallback_stats, 900)
-            
-            return jsonify(fallback_stats), 200
+            return jsonify({"error": "Internal server error"}), 500
     
     def get_contratos_stats(self, args: Dict[str, Any]) -> Tuple[Any, int]:
         """Get contracts statistics from real PNCP API with Redis caching."""
@@ -612,98 +842,57 @@ class PNCPService:
                 params['uf'] = uf
                 
             # Create cache key based on parameters
-            cache_key = f"contratos_stats:{hash(str(sorted(params.items())))}"
+            cache_key = build_cache_key("contratos_stats", params)
+            
+            # Try the precompressed response first, then the cached data
+            precompressed = compression.serve_cached(cache_key)
+            if precompressed is not None:
+                return precompressed, 200
             
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
+            cached_result, negative = redis_client.get_many([cache_key, negative_cache.key(cache_key)])
             if cached_result:
                 logger.info(f"Cache hit for contratos stats with key: {cache_key}")
                 return jsonify(cached_result), 200
             
+            negative = negative_cache.unpack(negative)
+            if negative is not None:
+                return jsonify(negative[0]), negative[1]
+            
             # Call the PNCP API endpoint for contracts statistics
             url = f"{self.consulta_api_base}/v1/contratos"
             
             logger.info(f"Fetching contracts statistics from {url} with params: {params}")
-            response = requests.get(url, params=params, timeout=30)
+            response = upstream_client.get(url, "/v1/contratos", params=params, timeout=30)
             
             # Process the response
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode_stats(response)
                 # Transform the data to match our expected format
-                stats = []
-                if isinstance(data, list):
-                    for item in data:
-                        stats.append({
-                            "tipo": item.get("tipo", "N/A"),
-                            "quantidade": item.get("quantidade", 0),
-                            "valor": item.get("valorTotal", 0)
-                        })
-                else:
-                    # If it's not a list, try to extract from the response
-                    if "data" in data and isinstance(data["data"], list):
-                        for item in data["data"]:
-                            stats.append({
-                                "tipo": item.get("tipo", "N/A"),
-                                "quantidade": item.get("quantidade", 0),
-                                "valor": item.get("valorTotal", 0)
-                            })
-                    else:
-                        # Fallback to placeholder data if we can't parse the response
-                        stats = [
-                            {"tipo": "Contrato", "quantidade": 125, "valor": 8900000.50},
-                            {"tipo": "Aditivo", "quantidade": 42, "valor": 15600000.75},
-                            {"tipo": "Rescisão", "quantidade": 5, "valor": 3200000.25}
-                        ]
-                
-                # Sort by quantity descending
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
+                stats = self._transform_stats(data, lambda item: {
+                    "tipo": item.get("tipo", "N/A"),
+                    "quantidade": item.get("quantidade", 0),
+                    "valor": item.get("valorTotal", 0)
+                })
+                if stats is None:
+                    return self._unparseable_response(cache_key, cache_tags(params))
                 
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
+                # Cache the result for as long as its window allows; empty results only briefly
+                if stats:
+                    redis_client.set(cache_key, stats, ttl_policy.for_query("contratos_stats", params), cache_tags(params))
+                else:
+                    negative_cache.store(cache_key, EMPTY, stats, 200, cache_tags(params))
                 
                 logger.info(f"Returning contracts statistics: {stats}")
                 return jsonify(stats), 200
             else:
-                # If we don't get a successful response, fallback to placeholder data
-                stats = [
-                    {"tipo": "Contrato", "quantidade": 125, "valor": 8900000.50},
-                    {"tipo": "Aditivo", "quantidade": 42, "valor": 15600000.75},
-                    {"tipo": "Rescisão", "quantidade": 5, "valor": 3200000.25}
-                ]
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
-                
-                return jsonify(stats), 200
+                logger.error(f"API request failed with status {response.status_code}: {response.text[:200]}")
+                return self._upstream_error(cache_key, response.status_code, cache_tags(params), empty=[])
                 
-        except requests.exceptions.Timeout:
-            # Fallback to placeholder data on timeout
-            stats = [
-                {"tipo": "Contrato", "quantidade": 125, "valor": 8900000.50},
-                {"tipo": "Aditivo", "quantidade": 42, "valor": 15600000.75},
-                {"tipo": "Rescisão", "quantidade": 5, "valor": 3200000.25}
-            ]
-            stats.sort(key=lambda x: x['quantidade'], reverse=True)
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"contratos_stats_timeout:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, stats, 900)
-            
-            return jsonify(stats), 200
+        except requests.exceptions.RequestException as e:
+            return self._upstream_exception(cache_key, e, cache_tags(params))
         except Exception as e:
             logger.error(f"Error in get_contratos_stats: {str(e)}")
-            # Fallback to simple placeholder data
-            fallback_stats = [
-                {"tipo": "Contrato", "quantidade": 125, "valor": 8900000.50},
-                {"tipo": "Aditivo", "quantidade": 42, "valor": 15600000.75}
-            ]
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"contratos_stats_error:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, fallback_stats, 900)
-            
-            return jsonify(fallback_stats), 200
+            return jsonify({"error": "Internal server error"}), 500
     
     def get_atas_stats(self, args: Dict[str, Any]) -> Tuple[Any, int]:
         """Get price registration records statistics from real PNCP API with Redis caching."""
@@ -732,98 +921,57 @@ class PNCPService:
                 params['uf'] = uf
                 
             # Create cache key based on parameters
-            cache_key = f"atas_stats:{hash(str(sorted(params.items())))}"
+            cache_key = build_cache_key("atas_stats", params)
+            
+            # Try the precompressed response first, then the cached data
+            precompressed = compression.serve_cached(cache_key)
+            if precompressed is not None:
+                return precompressed, 200
             
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
+            cached_result, negative = redis_client.get_many([cache_key, negative_cache.key(cache_key)])
             if cached_result:
                 logger.info(f"Cache hit for atas stats with key: {cache_key}")
                 return jsonify(cached_result), 200
             
+            negative = negative_cache.unpack(negative)
+            if negative is not None:
+                return jsonify(negative[0]), negative[1]
+            
             # Call the PNCP API endpoint for price registration records statistics
             url = f"{self.consulta_api_base}/v1/atas-registro-precos"
             
             logger.info(f"Fetching price registration records statistics from {url} with params: {params}")
-            response = requests.get(url, params=params, timeout=30)
+            response = upstream_client.get(url, "/v1/atas-registro-precos", params=params, timeout=30)
             
             # Process the response
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode_stats(response)
                 # Transform the data to match our expected format
-                stats = []
-                if isinstance(data, list):
-                    for item in data:
-                        stats.append({
-                            "tipo": item.get("tipo", "N/A"),
-                            "quantidade": item.get("quantidade", 0),
-                            "valor": item.get("valorTotal", 0)
-                        })
-                else:
-                    # If it's not a list, try to extract from the response
-                    if "data" in data and isinstance(data["data"], list):
-                        for item in data["data"]:
-                            stats.append({
-                                "tipo": item.get("tipo", "N/A"),
-                                "quantidade": item.get("quantidade", 0),
-                                "valor": item.get("valorTotal", 0)
-                            })
-                    else:
-                        # Fallback to placeholder data if we can't parse the response
-                        stats = [
-                            {"tipo": "Ata de Registro", "quantidade": 78, "valor": 5600000.50},
-                            {"tipo": "Adesão", "quantidade": 24, "valor": 1800000.75},
-                            {"tipo": "Renovação", "quantidade": 12, "valor": 950000.25}
-                        ]
+                stats = self._transform_stats(data, lambda item: {
+                    "tipo": item.get("tipo", "N/A"),
+                    "quantidade": item.get("quantidade", 0),
+                    "valor": item.get("valorTotal", 0)
+                })
+                if stats is None:
+                    return self._unparseable_response(cache_key, cache_tags(params))
                 
-                # Sort by quantity descending
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
+                # Cache the result for as long as its window allows; empty results only briefly
+                if stats:
+                    redis_client.set(cache_key, stats, ttl_policy.for_query("atas_stats", params), cache_tags(params))
+                else:
+                    negative_cache.store(cache_key, EMPTY, stats, 200, cache_tags(params))
                 
                 logger.info(f"Returning price registration records statistics: {stats}")
                 return jsonify(stats), 200
             else:
-                # If we don't get a successful response, fallback to placeholder data
-                stats = [
-                    {"tipo": "Ata de Registro", "quantidade": 78, "valor": 5600000.50},
-                    {"tipo": "Adesão", "quantidade": 24, "valor": 1800000.75},
-                    {"tipo": "Renovação", "quantidade": 12, "valor": 950000.25}
-                ]
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
-                
-                return jsonify(stats), 200
+                logger.error(f"API request failed with status {response.status_code}: {response.text[:200]}")
+                return self._upstream_error(cache_key, response.status_code, cache_tags(params), empty=[])
                 
-        except requests.exceptions.Timeout:
-            # Fallback to placeholder data on timeout
-            stats = [
-                {"tipo": "Ata de Registro", "quantidade": 78, "valor": 5600000.50},
-                {"tipo": "Adesão", "quantidade": 24, "valor": 1800000.75},
-                {"tipo": "Renovação", "quantidade": 12, "valor": 950000.25}
-            ]
-            stats.sort(key=lambda x: x['quantidade'], reverse=True)
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"atas_stats_timeout:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, stats, 900)
-            
-            return jsonify(stats), 200
+        except requests.exceptions.RequestException as e:
+            return self._upstream_exception(cache_key, e, cache_tags(params))
         except Exception as e:
             logger.error(f"Error in get_atas_stats: {str(e)}")
-            # Fallback to simple placeholder data
-            fallback_stats = [
-                {"tipo": "Ata de Registro", "quantidade": 78, "valor": 5600000.50},
-                {"tipo": "Adesão", "quantidade": 24, "valor": 1800000.75}
-            ]
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"atas_stats_error:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, fallback_stats, 900)
-            
-            return jsonify(fallback_stats), 200
+            return jsonify({"error": "Internal server error"}), 500
     
     def get_planos_stats(self, args: Dict[str, Any]) -> Tuple[Any, int]:
         """Get procurement plans statistics from real PNCP API with Redis caching."""
@@ -841,95 +989,54 @@ class PNCPService:
                 params['uf'] = uf
                 
             # Create cache key based on parameters
-            cache_key = f"planos_stats:{hash(str(sorted(params.items())))}"
+            cache_key = build_cache_key("planos_stats", params)
             
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
+            # Try the precompressed response first, then the cached data
+            precompressed = compression.serve_cached(cache_key)
+            if precompressed is not None:
+                return precompressed, 200
+            
+            cached_result, negative = redis_client.get_many([cache_key, negative_cache.key(cache_key)])
             if cached_result:
                 logger.info(f"Cache hit for planos stats with key: {cache_key}")
                 return jsonify(cached_result), 200
             
+            negative = negative_cache.unpack(negative)
+            if negative is not None:
+                return jsonify(negative[0]), negative[1]
+            
             # Call the PNCP API endpoint for procurement plans statistics
             url = f"{self.consulta_api_base}/v1/pca"
             
             logger.info(f"Fetching procurement plans statistics from {url} with params: {params}")
-            response = requests.get(url, params=params, timeout=30)
+            response = upstream_client.get(url, "/v1/pca", params=params, timeout=30)
             
             # Process the response
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode_stats(response)
                 # Transform the data to match our expected format
-                stats = []
-                if isinstance(data, list):
-                    for item in data:
-                        stats.append({
-                            "tipo": item.get("tipo", "N/A"),
-                            "quantidade": item.get("quantidade", 0),
-                            "valor": item.get("valorTotal", 0)
-                        })
-                else:
-                    # If it's not a list, try to extract from the response
-                    if "data" in data and isinstance(data["data"], list):
-                        for item in data["data"]:
-                            stats.append({
-                                "tipo": item.get("tipo", "N/A"),
-                                "quantidade": item.get("quantidade", 0),
-                                "valor": item.get("valorTotal", 0)
-                            })
-                    else:
-                        # Fallback to placeholder data if we can't parse the response
-                        stats = [
-                            {"tipo": "Plano Anual", "quantidade": 156, "valor": 25600000.50},
-                            {"tipo": "Plano Trimestral", "quantidade": 89, "valor": 8900000.75},
-                            {"tipo": "Plano Semestral", "quantidade": 67, "valor": 12400000.25}
-                        ]
-                
-                # Sort by quantity descending
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
+                stats = self._transform_stats(data, lambda item: {
+                    "tipo": item.get("tipo", "N/A"),
+                    "quantidade": item.get("quantidade", 0),
+                    "valor": item.get("valorTotal", 0)
+                })
+                if stats is None:
+                    return self._unparseable_response(cache_key, cache_tags(params))
                 
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
+                # Cache the result for as long as its window allows; empty results only briefly
+                if stats:
+                    redis_client.set(cache_key, stats, ttl_policy.for_query("planos_stats", params), cache_tags(params))
+                else:
+                    negative_cache.store(cache_key, EMPTY, stats, 200, cache_tags(params))
                 
                 logger.info(f"Returning procurement plans statistics: {stats}")
                 return jsonify(stats), 200
             else:
-                # If we don't get a successful response, fallback to placeholder data
-                stats = [
-                    {"tipo": "Plano Anual", "quantidade": 156, "valor": 25600000.50},
-                    {"tipo": "Plano Trimestral", "quantidade": 89, "valor": 8900000.75},
-                    {"tipo": "Plano Semestral", "quantidade": 67, "valor": 12400000.25}
-                ]
-                stats.sort(key=lambda x: x['quantidade'], reverse=True)
-                
-                # Cache the result for 15 minutes (900 seconds)
-                redis_client.set(cache_key, stats, 900)
-                
-                return jsonify(stats), 200
+                logger.error(f"API request failed with status {response.status_code}: {response.text[:200]}")
+                return self._upstream_error(cache_key, response.status_code, cache_tags(params), empty=[])
                 
-        except requests.exceptions.Timeout:
-            # Fallback to placeholder data on timeout
-            stats = [
-                {"tipo": "Plano Anual", "quantidade": 156, "valor": 25600000.50},
-                {"tipo": "Plano Trimestral", "quantidade": 89, "valor": 8900000.75},
-                {"tipo": "Plano Semestral", "quantidade": 67, "valor": 12400000.25}
-            ]
-            stats.sort(key=lambda x: x['quantidade'], reverse=True)
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"planos_stats_timeout:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, stats, 900)
-            
-            return jsonify(stats), 200
+        except requests.exceptions.RequestException as e:
+            return self._upstream_exception(cache_key, e, cache_tags(params))
         except Exception as e:
             logger.error(f"Error in get_planos_stats: {str(e)}")
-            # Fallback to simple placeholder data
-            fallback_stats = [
-                {"tipo": "Plano Anual", "quantidade": 156, "valor": 25600000.50},
-                {"tipo": "Plano Trimestral", "quantidade": 89, "valor": 8900000.75}
-            ]
-            
-            # Cache the result for 15 minutes (900 seconds)
-            cache_key = f"planos_stats_error:{hash(str(sorted(args.items())))}"
-            redis_client.set(cache_key, fallback_stats, 900)
-            
-            return jsonify(fallback_stats), 200
\ No newline at end of file
+            return jsonify({"error": "Internal server error"}), 500
@@ -0,0 +1,421 @@
+"""
+Saved searches for PNCP API Client.
+"""
+import re
+import math
+import uuid
+import logging
+import threading
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from flask import jsonify
+from app.extensions import redis_client
+from app.config.settings import config
+
+logger = logging.getLogger(__name__)
+
+# Get configuration
+current_config = config['default']()
+
+# Namespace of every saved search key (protected from cache flushes)
+NAMESPACE = "saved_search"
+
+# Set of every saved search id, and the counter bumped whenever one is added or removed
+ALL_KEY = f"{NAMESPACE}:all"
+VERSION_KEY = f"{NAMESPACE}:version"
+
+# Browser-generated id that owns the searches (X-Client-Id header)
+CLIENT_ID_PATTERN = re.compile(r'^[A-Za-z0-9-]{16,64}$')
+
+# Shorter keyword tokens (de, da, e...) are ignored
+MIN_TOKEN_LENGTH = 3
+
+# Value buckets are powers of ten; anything above 10^MAX_VALUE_BUCKET shares the last one
+MAX_VALUE_BUCKET = 12
+
+MAX_NAME_LENGTH = 100
+MAX_KEYWORD_LENGTH = 200
+
+Anchor = Tuple[str, Any]
+
+_UNLOADED = object()
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into lowercase, accent-free keyword tokens."""
+    normalized = unicodedata.normalize('NFKD', text.lower())
+    normalized = ''.join(char for char in normalized if not unicodedata.combining(char))
+    return {token for token in re.findall(r'[a-z0-9]+', normalized) if len(token) >= MIN_TOKEN_LENGTH}
+
+
+def value_bucket(value: float) -> int:
+    """Get the power-of-ten bucket of a value."""
+    if value < 1:
+        return 0
+    return min(int(math.log10(value)), MAX_VALUE_BUCKET)
+
+
+class SearchIndex:
+    """
+    Inverted index of saved searches, to match a tender against all of them.
+
+    Percolator-style: each search is posted under a single anchor, its most
+    selective condition (its longest keyword token, else its UF, else its
+    modalidade, else the value buckets its range covers, else the match-all
+    posting). A tender only looks up the postings of its own tokens, UF,
+    modalidade and value bucket, and the candidates found are checked
+    against their full filters, so matching costs grow with the searches
+    sharing a condition with the tender, not with the number of searches.
+    """
+
+    def __init__(self):
+        """Initialize index."""
+        self._filters: Dict[str, Dict[str, Any]] = {}
+        self._anchors: Dict[str, List[Anchor]] = {}
+        self._postings: Dict[Anchor, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        """Number of indexed searches."""
+        return len(self._filters)
+
+    @staticmethod
+    def anchors(filters: Dict[str, Any]) -> List[Anchor]:
+        """Get the postings a search is indexed under."""
+        tokens = tokenize(filters.get('palavraChave') or '')
+        if tokens:
+            return [('token', max(sorted(tokens), key=len))]
+        if filters.get('uf'):
+            return [('uf', filters['uf'])]
+        if filters.get('codigoModalidadeContratacao'):
+            return [('modalidade', filters['codigoModalidadeContratacao'])]
+        if filters.get('valorMinimo') is not None or filters.get('valorMaximo') is not None:
+            low = value_bucket(filters.get('valorMinimo') or 0)
+            high = value_bucket(filters['valorMaximo']) if filters.get('valorMaximo') is not None else MAX_VALUE_BUCKET
+            return [('valor', bucket) for bucket in range(low, high + 1)]
+        return [('all', None)]
+
+    def add(self, search_id: str, filters: Dict[str, Any]) -> None:
+        """Index a search (replacing its previous filters)."""
+        self.remove(search_id)
+        self._filters[search_id] = filters
+        self._anchors[search_id] = self.anchors(filters)
+        for anchor in self._anchors[search_id]:
+            self._postings[anchor].add(search_id)
+
+    def remove(self, search_id: str) -> None:
+        """Drop a search from the index."""
+        self._filters.pop(search_id, None)
+        for anchor in self._anchors.pop(search_id, []):
+            posting = self._postings.get(anchor)
+            if posting is not None:
+                posting.discard(search_id)
+                if not posting:
+                    del self._postings[anchor]
+
+    def match(self, tender: Dict[str, Any]) -> Set[str]:
+        """
+        Find the searches a tender matches.
+
+        Args:
+            tender: Full PNCP record
+
+        Returns:
+            Ids of the matching searches
+        """
+        tokens = tokenize(tender.get('objetoCompra') or '')
+        keys: List[Anchor] = [('token', token) for token in tokens]
+        keys.append(('uf', (tender.get('unidadeOrgao') or {}).get('ufSigla')))
+        keys.append(('modalidade', str(tender.get('modalidadeId'))))
+        if tender.get('valorTotalEstimado') is not None:
+            keys.append(('valor', value_bucket(tender['valorTotalEstimado'])))
+        keys.append(('all', None))
+
+        candidates: Set[str] = set()
+        for key in keys:
+            candidates.update(self._postings.get(key, ()))
+        return {search_id for search_id in candidates if self.verify(self._filters[search_id], tender, tokens)}
+
+    @staticmethod
+    def verify(filters: Dict[str, Any], tender: Dict[str, Any], tokens: Optional[Set[str]] = None) -> bool:
+        """Check a tender against every filter of a search."""
+        if filters.get('uf') and (tender.get('unidadeOrgao') or {}).get('ufSigla') != filters['uf']:
+            return False
+        modalidade = filters.get('codigoModalidadeContratacao')
+        if modalidade and str(tender.get('modalidadeId')) != modalidade:
+            return False
+        keywords = tokenize(filters.get('palavraChave') or '')
+        if keywords:
+            if tokens is None:
+                tokens = tokenize(tender.get('objetoCompra') or '')
+            if not keywords <= tokens:
+                return False
+        if filters.get('valorMinimo') is not None or filters.get('valorMaximo') is not None:
+            valor = tender.get('valorTotalEstimado')
+            if valor is None:
+                return False
+            if filters.get('valorMinimo') is not None and valor < filters['valorMinimo']:
+                return False
+            if filters.get('valorMaximo') is not None and valor > filters['valorMaximo']:
+                return False
+        return True
+
+
+class SavedSearches:
+    """
+    Saved searches, kept in Redis and matched against newly published tenders.
+
+    Searches belong to the browser that created them (its X-Client-Id; this
+    is not authentication) and are kept for SAVED_SEARCH_TTL after they were
+    last listed. The tender feed leader hands every new tender to
+    ``ingest``, which matches it through an in-memory SearchIndex (rebuilt
+    when the set of searches changes) and bumps a per-search counter of
+    new tenders, so listing searches with their counts is one pipelined
+    round-trip. Viewing a search returns its new tenders and resets it.
+    """
+
+    def __init__(self):
+        """Initialize saved searches."""
+        self.ttl = current_config.SAVED_SEARCH_TTL
+        self.max_per_client = current_config.SAVED_SEARCH_MAX_PER_CLIENT
+        self.max_matches = current_config.SAVED_SEARCH_MAX_MATCHES
+        self._index = SearchIndex()
+        self._version: Any = _UNLOADED
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(search_id: str) -> str:
+        """Key of a search."""
+        return f"{NAMESPACE}:{search_id}"
+
+    @staticmethod
+    def client_key(client_id: str) -> str:
+        """Key of the set of searches of a browser."""
+        return f"{NAMESPACE}:client:{client_id}"
+
+    @staticmethod
+    def counter_key(search_id: str) -> str:
+        """Key of the count of new tenders of a search."""
+        return f"{NAMESPACE}:new:{search_id}"
+
+    @staticmethod
+    def matches_key(search_id: str) -> str:
+        """Key of the latest new tender ids of a search."""
+        return f"{NAMESPACE}:matches:{search_id}"
+
+    @staticmethod
+    def parse(payload: Any) -> Tuple[str, Dict[str, Any]]:
+        """
+        Validate a search to be saved.
+
+        Args:
+            payload: JSON body ``{"name": ..., "filters": {...}}``
+
+        Returns:
+            Tuple of (name, filters)
+
+        Raises:
+            ValueError: If the body or a filter is invalid
+        """
+        if not isinstance(payload, dict) or not isinstance(payload.get('filters', {}), dict):
+            raise ValueError('Expected a JSON body like {"name": "...", "filters": {"uf": "SP"}}')
+        raw = payload.get('filters', {})
+        name = str(payload.get('name') or '').strip()[:MAX_NAME_LENGTH] or "Pesquisa"
+
+        filters: Dict[str, Any] = {}
+        uf = str(raw.get('uf') or '').strip()
+        if uf:
+            if len(uf) != 2 or not uf.isalpha():
+                raise ValueError("Invalid UF format. Use 2-letter state code (e.g., SP)")
+            filters['uf'] = uf.upper()
+        modalidade = str(raw.get('codigoModalidadeContratacao') or '').strip()
+        if modalidade:
+            if not modalidade.isdigit():
+                raise ValueError("Invalid codigoModalidadeContratacao")
+            filters['codigoModalidadeContratacao'] = modalidade
+        palavra_chave = str(raw.get('palavraChave') or '').strip()
+        if palavra_chave:
+            if len(palavra_chave) > MAX_KEYWORD_LENGTH:
+                raise ValueError(f"palavraChave is limited to {MAX_KEYWORD_LENGTH} characters")
+            filters['palavraChave'] = palavra_chave
+        for field in ('valorMinimo', 'valorMaximo'):
+            if raw.get(field) not in (None, ''):
+                try:
+                    filters[field] = float(raw[field])
+                except (TypeError, ValueError):
+                    raise ValueError(f"{field} must be a number")
+                if filters[field] < 0:
+                    raise ValueError(f"{field} must not be negative")
+        if filters.get('valorMinimo', 0) > filters.get('valorMaximo', math.inf):
+            raise ValueError("valorMinimo must not exceed valorMaximo")
+        return name, filters
+
+    def create(self, client_id: Optional[str], payload: Any) -> Tuple[Any, int]:
+        """Save a search for a browser."""
+        if not client_id or not CLIENT_ID_PATTERN.match(client_id):
+            return jsonify({"error": "Missing or invalid X-Client-Id header"}), 400
+        try:
+            name, filters = self.parse(payload)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if len(redis_client.members(self.client_key(client_id))) >= self.max_per_client:
+            return jsonify({"error": f"At most {self.max_per_client} saved searches per client"}), 400
+
+        now = datetime.now().isoformat()
+        search = {"id": uuid.uuid4().hex, "client": client_id, "name": name, "filters": filters,
+                  "created_at": now, "last_viewed_at": now}
+        if not redis_client.set(self.key(search["id"]), search, self.ttl):
+            return jsonify({"error": "Saved searches are unavailable"}), 503
+        redis_client.add_members(self.client_key(client_id), [search["id"]], self.ttl)
+        redis_client.add_members(ALL_KEY, [search["id"]], self.ttl)
+        self._changed()
+        return jsonify(self._public(search, 0)), 201
+
+    def list(self, client_id: Optional[str]) -> Tuple[Any, int]:
+        """List the searches of a browser with their count of new tenders."""
+        if not client_id or not CLIENT_ID_PATTERN.match(client_id):
+            return jsonify({"error": "Missing or invalid X-Client-Id header"}), 400
+        ids = sorted(redis_client.members(self.client_key(client_id)))
+        if not ids:
+            return jsonify([]), 200
+
+        # Searches and counters in one round-trip; listing keeps the searches alive
+        with redis_client.pipeline() as pipe:
+            for search_id in ids:
+                pipe.get(self.key(search_id)).get(self.counter_key(search_id)).expire(self.key(search_id), self.ttl)
+            pipe.expire(self.client_key(client_id), self.ttl)
+            pipe.expire(ALL_KEY, self.ttl)
+        results = pipe.results
+
+        searches, expired = [], []
+        for position, search_id in enumerate(ids):
+            search, count = results[3 * position], results[3 * position + 1]
+            if search is None:
+                expired.append(search_id)
+            else:
+                searches.append(self._public(search, count or 0))
+        if expired:
+            redis_client.remove_members(self.client_key(client_id), expired)
+            self._forget(expired)
+        searches.sort(key=lambda search: search["created_at"], reverse=True)
+        return jsonify(searches), 200
+
+    def view(self, client_id: Optional[str], search_id: str) -> Tuple[Any, int]:
+        """Get the tenders found for a search since it was last viewed, and reset them."""
+        search = self._owned(client_id, search_id)
+        if search is None:
+            return jsonify({"error": "Saved search not found"}), 404
+
+        with redis_client.pipeline(transaction=True) as pipe:
+            pipe.lrange(self.matches_key(search_id)).delete(self.counter_key(search_id), self.matches_key(search_id))
+        new_ids = pipe.results[0] or []
+        search["last_viewed_at"] = datetime.now().isoformat()
+        redis_client.set(self.key(search_id), search, self.ttl)
+        return jsonify(dict(self._public(search, 0), novas=new_ids)), 200
+
+    def delete(self, client_id: Optional[str], search_id: str) -> Tuple[Any, int]:
+        """Delete a search."""
+        if self._owned(client_id, search_id) is None:
+            return jsonify({"error": "Saved search not found"}), 404
+        redis_client.delete_many([self.key(search_id), self.counter_key(search_id), self.matches_key(search_id)])
+        redis_client.remove_members(self.client_key(client_id), [search_id])
+        redis_client.remove_members(ALL_KEY, [search_id])
+        self._changed()
+        return jsonify({"deleted": search_id}), 200
+
+    def ingest(self, tenders: Iterable[Dict[str, Any]]) -> int:
+        """
+        Match newly published tenders against every saved search.
+
+        Args:
+            tenders: Full PNCP records
+
+        Returns:
+            Number of (search, tender) matches recorded
+        """
+        with self._lock:
+            self._refresh_index()
+            found: Dict[str, List[str]] = defaultdict(list)
+            for tender in tenders:
+                for search_id in self._index.match(tender):
+                    found[search_id].append(tender.get('numeroControlePNCP'))
+        if not found:
+            return 0
+
+        # Searches expire without touching the index, so skip (and unindex) the ones gone
+        ids = list(found)
+        expired = [search_id for search_id, search in zip(ids, redis_client.get_many([self.key(i) for i in ids]))
+                   if search is None]
+        if expired:
+            with self._lock:
+                for search_id in expired:
+                    self._index.remove(search_id)
+                    del found[search_id]
+            self._forget(expired)
+        if not found:
+            return 0
+
+        with redis_client.pipeline() as pipe:
+            for search_id, tender_ids in found.items():
+                pipe.incr(self.counter_key(search_id), len(tender_ids), self.ttl)
+                pipe.push(self.matches_key(search_id), tender_ids, self.max_matches, self.ttl)
+        matched = sum(len(tender_ids) for tender_ids in found.values())
+        logger.info(f"Saved searches: {matched} matches across {len(found)} of {len(self._index)} searches")
+        return matched
+
+    def _refresh_index(self) -> None:
+        """Rebuild the index if searches were added or removed since it was built (called with the lock held)."""
+        version = redis_client.get(VERSION_KEY)
+        if version == self._version:
+            return
+        ids = redis_client.members(ALL_KEY)
+        searches = redis_client.get_many([self.key(search_id) for search_id in ids])
+        index = SearchIndex()
+        expired = []
+        for search_id, search in zip(ids, searches):
+            if search is None:
+                expired.append(search_id)
+            else:
+                index.add(search_id, search.get('filters') or {})
+        if expired:
+            redis_client.remove_members(ALL_KEY, expired)
+        self._index = index
+        self._version = version
+
+    def _forget(self, search_ids: List[str]) -> None:
+        """Drop expired searches from the set of every search, and their counters."""
+        keys = [key for search_id in search_ids for key in (self.counter_key(search_id), self.matches_key(search_id))]
+        redis_client.delete_many(keys)
+        redis_client.remove_members(ALL_KEY, search_ids)
+        self._changed()
+
+    def _changed(self) -> None:
+        """Tell every worker's index that the set of searches changed."""
+        with redis_client.pipeline() as pipe:
+            pipe.incr(VERSION_KEY)
+
+    def _owned(self, client_id: Optional[str], search_id: str) -> Optional[Dict[str, Any]]:
+        """Get a search if it belongs to the browser."""
+        if not client_id or not CLIENT_ID_PATTERN.match(client_id):
+            return None
+        search = redis_client.get(self.key(search_id))
+        if not isinstance(search, dict) or search.get('client') != client_id:
+            return None
+        return search
+
+    @staticmethod
+    def _public(search: Dict[str, Any], count: int) -> Dict[str, Any]:
+        """Search as returned by the API (without the owner id), with its count of new tenders."""
+        return {
+            "id": search["id"],
+            "name": search["name"],
+            "filters": search["filters"],
+            "created_at": search["created_at"],
+            "last_viewed_at": search["last_viewed_at"],
+            "novas_count": count
+        }
+
+
+# Global saved searches instance
+saved_searches = SavedSearches()
@@ -0,0 +1,194 @@
+"""
+Sorted snapshots of the open tenders result set, for keyset pagination.
+"""
+import time
+import logging
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.extensions import redis_client
+from app.config.settings import config
+from app.core.services.upstream import upstream_client
+from app.core.utils.helpers import build_cache_key, cache_tags
+
+logger = logging.getLogger(__name__)
+
+# Get configuration
+current_config = config['default']()
+
+SortKey = Tuple[str, str]
+
+# Records without a closing date sort last
+MISSING_DATE = '9999'
+
+
+def sort_key(record: Dict[str, Any]) -> SortKey:
+    """Stable sort key of a tender: (dataEncerramentoProposta, numeroControlePNCP)."""
+    return (record.get('dataEncerramentoProposta') or MISSING_DATE, record.get('numeroControlePNCP') or '')
+
+
+class TenderSnapshot:
+    """An immutable, sorted copy of one filtered result set."""
+
+    __slots__ = ('records', 'keys', 'created_at', 'truncated')
+
+    def __init__(self, records: List[Dict[str, Any]], created_at: float, truncated: bool):
+        """
+        Initialize snapshot.
+
+        Args:
+            records: Tenders, already sorted by sort_key
+            created_at: Unix time the records were fetched
+            truncated: Whether the upstream result set had more pages than were fetched
+        """
+        self.records = records
+        self.keys = [sort_key(record) for record in records]
+        self.created_at = created_at
+        self.truncated = truncated
+
+    def page_after(self, last_key: Optional[SortKey], size: int) -> List[Dict[str, Any]]:
+        """
+        Get the records that follow a sort key.
+
+        A binary search over the keys makes every page cost the same, and
+        since the position comes from the key rather than an offset, a walk
+        survives the snapshot being rebuilt with new tenders in between.
+
+        Args:
+            last_key: Sort key of the last record already returned (None for the first page)
+            size: Page size
+
+        Returns:
+            Up to ``size`` records
+        """
+        start = 0 if last_key is None else bisect_right(self.keys, last_key)
+        return self.records[start:start + size]
+
+
+class TenderSnapshots:
+    """
+    Builds and caches snapshots of the open tenders listing.
+
+    A snapshot holds every record of a filter combination (up to
+    CURSOR_SNAPSHOT_MAX_PAGES upstream pages) sorted by a stable key. It is
+    shared between workers through Redis and kept decoded in a small
+    per-worker LRU, so consecutive pages never go back to PNCP.
+    """
+
+    def __init__(self):
+        """Initialize snapshot store."""
+        self.ttl = current_config.CURSOR_SNAPSHOT_TTL
+        self.max_pages = current_config.CURSOR_SNAPSHOT_MAX_PAGES
+        self.page_size = current_config.CURSOR_SNAPSHOT_PAGE_SIZE
+        self.local_entries = current_config.CURSOR_SNAPSHOT_LOCAL_ENTRIES
+        self.url = f"{current_config.CONSULTA_API_BASE}/v1/contratacoes/proposta"
+        self._local: 'OrderedDict[str, TenderSnapshot]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, filters: Dict[str, Any]) -> TenderSnapshot:
+        """
+        Get the snapshot for a filter combination, building it if needed.
+
+        Args:
+            filters: Upstream query filters (without paging parameters)
+
+        Returns:
+            Snapshot
+
+        Raises:
+            requests.exceptions.RequestException: If PNCP cannot be reached
+            ValueError: If PNCP answers with an error or an invalid payload
+        """
+        key = build_cache_key("open_tenders_snapshot", filters)
+        snapshot = self._get_local(key) or self._get_shared(key)
+        if snapshot is not None:
+            return snapshot
+
+        # One build per filter combination and worker; concurrent requests wait for it
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        try:
+            with build_lock:
+                snapshot = self._get_local(key) or self._get_shared(key)
+                if snapshot is None:
+                    snapshot = self._build(filters)
+                    redis_client.set(key, {
+                        "records": snapshot.records,
+                        "created_at": snapshot.created_at,
+                        "truncated": snapshot.truncated
+                    }, self.ttl, cache_tags(filters))
+                    self._put_local(key, snapshot)
+        finally:
+            with self._lock:
+                self._build_locks.pop(key, None)
+        return snapshot
+
+    def _get_local(self, key: str) -> Optional[TenderSnapshot]:
+        """Get a fresh snapshot from the worker LRU."""
+        with self._lock:
+            snapshot = self._local.get(key)
+            if snapshot is None:
+                return None
+            if time.time() - snapshot.created_at >= self.ttl:
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return snapshot
+
+    def _put_local(self, key: str, snapshot: TenderSnapshot) -> None:
+        """Store a snapshot in the worker LRU, evicting the least recently used."""
+        with self._lock:
+            self._local[key] = snapshot
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_entries:
+                self._local.popitem(last=False)
+
+    def _get_shared(self, key: str) -> Optional[TenderSnapshot]:
+        """Get a snapshot built by another worker from Redis."""
+        cached = redis_client.get(key)
+        if not cached:
+            return None
+        snapshot = TenderSnapshot(cached["records"], cached["created_at"], cached["truncated"])
+        self._put_local(key, snapshot)
+        return snapshot
+
+    def _fetch_page(self, filters: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """Fetch one upstream page."""
+        params = dict(filters, pagina=page, tamanhoPagina=self.page_size)
+        response = upstream_client.get(self.url, "/v1/contratacoes/proposta", params=params, timeout=30)
+        if response.status_code != 200:
+            raise ValueError(f"PNCP API returned status {response.status_code}")
+        data = upstream_client.parse_json(response)
+        if not isinstance(data, dict):
+            raise ValueError("Unexpected response format from PNCP API")
+        return data
+
+    def _build(self, filters: Dict[str, Any]) -> TenderSnapshot:
+        """Fetch every page of a filter combination and sort the records."""
+        started = time.time()
+        first = self._fetch_page(filters, 1)
+        records = list(first.get("data") or [])
+        total_pages = int(first.get("totalPaginas") or 1)
+        last_page = min(total_pages, self.max_pages)
+
+        if last_page > 1:
+            with ThreadPoolExecutor(max_workers=min(4, last_page - 1)) as executor:
+                pages = executor.map(lambda page: self._fetch_page(filters, page), range(2, last_page + 1))
+                for data in pages:
+                    records.extend(data.get("data") or [])
+
+        # Records can shift between upstream pages while they are fetched
+        unique = {record.get('numeroControlePNCP') or id(record): record for record in records}
+        records = sorted(unique.values(), key=sort_key)
+        logger.info(
+            f"Built open tenders snapshot with {len(records)} records from {last_page} pages "
+            f"in {time.time() - started:.2f}s"
+        )
+        return TenderSnapshot(records, started, truncated=total_pages > last_page)
+
+
+# Global snapshot store
+tender_snapshots = TenderSnapshots()
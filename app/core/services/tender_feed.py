@@ -0,0 +1,371 @@
+"""
+Live feed of newly published tenders for PNCP API Client.
+"""
+import os
+import time
+import queue
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from flask import Flask, Response, jsonify
+from app.extensions import redis_client, json_codec
+from app.extensions.outbound_governor import WARMER
+from app.config.settings import config
+from app.core.services.saved_searches import saved_searches
+from app.core.services.upstream import upstream_client
+from app.core.utils.projection import compile_fields, parse_fields, project
+
+logger = logging.getLogger(__name__)
+
+# Get configuration
+current_config = config['default']()
+
+# Lock held by the one worker that polls PNCP (protected namespace, never flushed)
+LEADER_LOCK_KEY = "lock:tender_feed"
+
+# Set of the tender ids already announced
+SEEN_KEY = "tender_feed:seen"
+
+# Delay before a browser reconnects a closed stream
+RECONNECT_DELAY_MS = 5000
+
+
+def matches(tender: Dict[str, Any], filters: Dict[str, str]) -> bool:
+    """
+    Check whether a tender matches the filters of a stream.
+
+    Args:
+        tender: Full PNCP record
+        filters: ``uf``, ``codigoModalidadeContratacao`` and ``palavraChave`` (all optional)
+
+    Returns:
+        True if every given filter matches
+    """
+    uf = filters.get('uf')
+    if uf and (tender.get('unidadeOrgao') or {}).get('ufSigla') != uf:
+        return False
+    modalidade = filters.get('codigoModalidadeContratacao')
+    if modalidade and str(tender.get('modalidadeId')) != modalidade:
+        return False
+    palavra_chave = filters.get('palavraChave')
+    if palavra_chave and palavra_chave.lower() not in (tender.get('objetoCompra') or '').lower():
+        return False
+    return True
+
+
+class FeedSubscriber:
+    """One connected stream: its filters, projection and pending tenders."""
+
+    __slots__ = ('filters', 'tree', 'queue')
+
+    def __init__(self, filters: Dict[str, str], tree: Optional[Dict[str, Any]], queue_size: int):
+        """Initialize subscriber."""
+        self.filters = filters
+        self.tree = tree
+        self.queue: 'queue.Queue[List[Dict[str, Any]]]' = queue.Queue(maxsize=queue_size)
+
+    def offer(self, tenders: List[Dict[str, Any]]) -> None:
+        """Queue tenders for the stream, dropping the oldest batch if the client is not keeping up."""
+        batch = project(tenders, self.tree) if self.tree is not None else tenders
+        while True:
+            try:
+                self.queue.put_nowait(batch)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class TenderFeed:
+    """
+    Server-Sent Events feed of newly published tenders.
+
+    Every worker runs a poller thread, but only the one holding the
+    ``lock:tender_feed`` Redis lock polls PNCP: every
+    TENDER_FEED_POLL_INTERVAL_SECONDS it reads the first TENDER_FEED_PAGES
+    pages of open tenders, records their ids in a Redis set and publishes
+    the ones not seen before on the TENDER_FEED_CHANNEL pub/sub channel,
+    after matching them against the saved searches.
+
+    Each worker holds one subscription to the channel and fans the messages
+    out to its connected streams, matching their filters server-side. A
+    stream occupies a worker thread, so streams are capped per worker
+    (TENDER_FEED_MAX_CLIENTS) and closed after
+    TENDER_FEED_MAX_STREAM_SECONDS; browsers reconnect on their own.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize feed."""
+        self.enabled = True
+        self.interval = 30.0
+        self.pages = 2
+        self.page_size = 50
+        self.channel = 'tender_feed'
+        self.seen_ttl = 172800
+        self.heartbeat = 15.0
+        self.max_stream_seconds = 300.0
+        self.max_clients = 8
+        self.queue_size = 100
+        self.url = f"{current_config.CONSULTA_API_BASE}/v1/contratacoes/proposta"
+        self._subscribers: Set[FeedSubscriber] = set()
+        self._leader_lock: Optional[Any] = None
+        self._leading = False
+        self._poller_pid: Optional[int] = None
+        self._listener_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize feed with Flask app."""
+        self.enabled = app.config.get('TENDER_FEED_ENABLED', True)
+        self.interval = float(app.config.get('TENDER_FEED_POLL_INTERVAL_SECONDS', 30))
+        self.pages = int(app.config.get('TENDER_FEED_PAGES', 2))
+        self.page_size = int(app.config.get('TENDER_FEED_PAGE_SIZE', 50))
+        self.channel = app.config.get('TENDER_FEED_CHANNEL', 'tender_feed')
+        self.seen_ttl = int(app.config.get('TENDER_FEED_SEEN_TTL', 172800))
+        self.heartbeat = float(app.config.get('TENDER_FEED_HEARTBEAT_SECONDS', 15))
+        self.max_stream_seconds = float(app.config.get('TENDER_FEED_MAX_STREAM_SECONDS', 300))
+        self.max_clients = int(app.config.get('TENDER_FEED_MAX_CLIENTS', 8))
+        self.queue_size = int(app.config.get('TENDER_FEED_QUEUE_SIZE', 100))
+        self.url = f"{app.config.get('CONSULTA_API_BASE', current_config.CONSULTA_API_BASE)}/v1/contratacoes/proposta"
+
+        if self.enabled:
+            app.before_request(self.ensure_started)
+
+    def ensure_started(self) -> None:
+        """Start the poller thread if this process does not have one yet."""
+        if self._poller_pid == os.getpid():
+            return
+        with self._lock:
+            if self._poller_pid == os.getpid():
+                return
+            self._poller_pid = os.getpid()
+            self._stop_event = threading.Event()
+            self._leader_lock = None
+            self._leading = False
+            threading.Thread(target=self._run, name='tender-feed-poller', daemon=True).start()
+
+    def ensure_listening(self) -> None:
+        """Start the pub/sub listener thread if this process does not have one yet."""
+        if self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            threading.Thread(target=self._listen, name='tender-feed-listener', daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop the threads of this process."""
+        self._stop_event.set()
+        self._poller_pid = None
+        self._listener_pid = None
+
+    def _run(self) -> None:
+        """Poll loop: only the leader polls, the others keep trying to take over."""
+        stop_event = self._stop_event
+        while not stop_event.is_set():
+            try:
+                if self._lead():
+                    self.poll()
+            except Exception as e:
+                logger.error(f"Tender feed poll failed: {e}")
+            stop_event.wait(self.interval)
+
+    def _lead(self) -> bool:
+        """Take or extend the leader lock; it expires if the leader stops polling."""
+        if self._leader_lock is None:
+            self._leader_lock = redis_client.lock(LEADER_LOCK_KEY, self.interval * 3)
+            self._leading = False
+            if self._leader_lock is None:
+                return False
+        try:
+            if self._leading:
+                self._leader_lock.reacquire()
+            else:
+                self._leading = bool(self._leader_lock.acquire(blocking=False))
+                if self._leading:
+                    logger.info(f"Worker {os.getpid()} is now polling PNCP for the tender feed")
+        except Exception as e:
+            logger.warning(f"Lost the tender feed leader lock: {e}")
+            self._leader_lock = None
+            self._leading = False
+        return self._leading
+
+    def poll(self) -> int:
+        """
+        Fetch the latest open tenders and publish the ones not seen before.
+
+        The first poll against an empty seen set only records the ids, so a
+        cold start does not announce every open tender.
+
+        Returns:
+            Number of tenders published
+        """
+        records = self._fetch()
+        ids = [record['numeroControlePNCP'] for record in records if record.get('numeroControlePNCP')]
+        seeded = redis_client.exists(SEEN_KEY)
+        new_ids = set(redis_client.add_members(SEEN_KEY, ids, self.seen_ttl))
+        if not seeded:
+            logger.info(f"Tender feed seeded with {len(new_ids)} tenders")
+            return 0
+
+        new = [record for record in records if record.get('numeroControlePNCP') in new_ids]
+        if new:
+            saved_searches.ingest(new)
+            receivers = redis_client.publish(self.channel, {"tenders": new, "published_at": time.time()})
+            logger.info(f"Tender feed published {len(new)} new tenders to {receivers} workers")
+        return len(new)
+
+    def _fetch(self) -> List[Dict[str, Any]]:
+        """Fetch the first pages of open tenders."""
+        records: List[Dict[str, Any]] = []
+        params = {'dataFinal': datetime.now().strftime('%Y%m%d'), 'tamanhoPagina': self.page_size}
+        for pagina in range(1, self.pages + 1):
+            response = upstream_client.get(self.url, "/v1/contratacoes/proposta",
+                                           params=dict(params, pagina=pagina), timeout=30, priority=WARMER)
+            if response.status_code == 204:
+                break
+            if response.status_code != 200:
+                logger.warning(f"Tender feed poll got status {response.status_code} on page {pagina}")
+                break
+            data = upstream_client.parse_json(response)
+            records.extend(data.get('data') or [])
+            if pagina >= (data.get('totalPaginas') or 1):
+                break
+        return records
+
+    def _listen(self) -> None:
+        """Subscribe to the channel and fan messages out, resubscribing after errors."""
+        stop_event = self._stop_event
+        while not stop_event.is_set():
+            pubsub = redis_client.pubsub()
+            if pubsub is None:
+                stop_event.wait(self.heartbeat)
+                continue
+            try:
+                pubsub.subscribe(self.channel)
+                while not stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.dispatch(redis_client.decode(message['data']))
+            except Exception as e:
+                logger.warning(f"Tender feed subscription failed: {e}")
+                stop_event.wait(1.0)
+            finally:
+                pubsub.close()
+
+    def dispatch(self, message: Dict[str, Any]) -> int:
+        """
+        Deliver a published batch to the streams of this worker.
+
+        Returns:
+            Number of streams that received tenders
+        """
+        tenders = message.get('tenders') or []
+        with self._lock:
+            subscribers = list(self._subscribers)
+        delivered = 0
+        for subscriber in subscribers:
+            matched = [tender for tender in tenders if matches(tender, subscriber.filters)]
+            if matched:
+                subscriber.offer(matched)
+                delivered += 1
+        return delivered
+
+    @staticmethod
+    def parse_filters(args: Dict[str, Any]) -> Tuple[Dict[str, str], Optional[Tuple[str, ...]]]:
+        """
+        Validate the filters of a stream request.
+
+        Returns:
+            Tuple of (filters, projection fields or None)
+
+        Raises:
+            ValueError: If a filter is invalid
+        """
+        filters = {}
+        uf = args.get('uf')
+        if uf:
+            if len(uf) != 2 or not uf.isalpha():
+                raise ValueError("Invalid UF format. Use 2-letter state code (e.g., SP)")
+            filters['uf'] = uf.upper()
+        modalidade = args.get('codigoModalidadeContratacao')
+        if modalidade:
+            if not modalidade.isdigit():
+                raise ValueError("Invalid codigoModalidadeContratacao")
+            filters['codigoModalidadeContratacao'] = modalidade
+        palavra_chave = (args.get('palavraChave') or '').strip()
+        if palavra_chave:
+            filters['palavraChave'] = palavra_chave
+        return filters, parse_fields(args.get('fields'))
+
+    def stream_response(self, args: Dict[str, Any]) -> Tuple[Any, int]:
+        """
+        Open an event stream of the new tenders matching the request's filters.
+
+        Args:
+            args: Request arguments (``uf``, ``codigoModalidadeContratacao``, ``palavraChave``, ``fields``)
+
+        Returns:
+            Tuple of (response, status code)
+        """
+        if not self.enabled:
+            return jsonify({"error": "Live feed is disabled"}), 404
+        try:
+            filters, fields = self.parse_filters(args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        subscriber = FeedSubscriber(filters, compile_fields(fields) if fields else None, self.queue_size)
+        # Reserve the slot now so concurrent requests cannot all pass the check
+        with self._lock:
+            full = len(self._subscribers) >= self.max_clients
+            if not full:
+                self._subscribers.add(subscriber)
+        if full:
+            response = jsonify({"error": "Too many live feed connections, retry later"})
+            response.headers['Retry-After'] = str(RECONNECT_DELAY_MS // 1000)
+            return response, 503
+
+        response = Response(self.stream(subscriber), mimetype='text/event-stream')
+        # A stream closed before its first event never runs the generator's cleanup
+        response.call_on_close(lambda: self._unsubscribe(subscriber))
+        response.headers['Cache-Control'] = 'no-cache'
+        # Keep reverse proxies from buffering the events
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response, 200
+
+    def stream(self, subscriber: FeedSubscriber) -> Iterator[str]:
+        """
+        Server-Sent Events of a subscriber: ``tenders`` events and keepalive comments.
+
+        The subscriber is registered by stream_response, which reserves its
+        slot, and always removed when the stream ends or the client disconnects.
+        """
+        self.ensure_listening()
+        deadline = time.monotonic() + self.max_stream_seconds
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n: connected\n\n"
+            while time.monotonic() < deadline:
+                try:
+                    tenders = subscriber.queue.get(timeout=min(self.heartbeat, max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: tenders\ndata: {json_codec.dumps(tenders).decode('utf-8')}\n\n"
+        finally:
+            self._unsubscribe(subscriber)
+
+    def _unsubscribe(self, subscriber: FeedSubscriber) -> None:
+        """Free the slot of a subscriber (safe to call more than once)."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+
+# Global tender feed instance
+tender_feed = TenderFeed()
@@ -0,0 +1,98 @@
+"""
+Cache TTL policy for PNCP API Client.
+"""
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+from app.config.settings import config
+
+logger = logging.getLogger(__name__)
+
+# Get configuration
+current_config = config['default']()
+
+# Namespaces whose data is a statistic over a date window
+STATS_NAMESPACES = (
+    "modalidade_stats", "uf_stats", "tipo_orgao_stats", "contratos_stats", "atas_stats", "planos_stats"
+)
+
+
+class TTLPolicy:
+    """
+    Cache TTLs derived from the namespace and the age of the query window.
+
+    A window that still includes today keeps changing and gets the
+    namespace's TTL (minutes for tenders and stats, hours for the annual
+    procurement plans). A window that ended in the past only changes while
+    PNCP receives late publications: within CACHE_TTL_SETTLE_DAYS of its end
+    it is cached for CACHE_TTL_RECENT_PAST, after that for
+    CACHE_TTL_CLOSED_PAST. No TTL exceeds CACHE_TAG_TTL, so tag purges always
+    reach the entry.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, int]] = None):
+        """
+        Initialize TTL policy.
+
+        Args:
+            ttls: TTL in seconds of a current window, by namespace (defaults to the CACHE_TTL_* settings)
+        """
+        self.ttls = ttls or dict(
+            {namespace: current_config.CACHE_TTL_STATS for namespace in STATS_NAMESPACES},
+            open_tenders=current_config.CACHE_TTL_OPEN_TENDERS,
+            planos_stats=current_config.CACHE_TTL_PLANOS_STATS
+        )
+        self.default_ttl = current_config.CACHE_TTL_DEFAULT
+        self.recent_past_ttl = current_config.CACHE_TTL_RECENT_PAST
+        self.closed_past_ttl = current_config.CACHE_TTL_CLOSED_PAST
+        self.settle_days = current_config.CACHE_TTL_SETTLE_DAYS
+        self.max_ttl = current_config.CACHE_TAG_TTL
+
+    @staticmethod
+    def window_end(params: Dict[str, Any]) -> Optional[date]:
+        """
+        Get the last day of the query window.
+
+        Args:
+            params: Upstream query parameters (``dataFinal`` as yyyyMMdd, or ``ano``)
+
+        Returns:
+            Last day of the window, or None if the query has no window
+        """
+        try:
+            if params.get('dataFinal'):
+                return datetime.strptime(str(params['dataFinal']), '%Y%m%d').date()
+            if params.get('ano'):
+                return date(int(params['ano']), 12, 31)
+        except ValueError:
+            logger.warning(f"Unparseable query window: {params}")
+        return None
+
+    def ttl(self, namespace: str, window_end: Optional[date] = None, today: Optional[date] = None) -> int:
+        """
+        Get the TTL of an entry.
+
+        Args:
+            namespace: Cache namespace (e.g. ``uf_stats``)
+            window_end: Last day of the query window, None for data that is always current
+            today: Reference day (defaults to today)
+
+        Returns:
+            TTL in seconds
+        """
+        base = self.ttls.get(namespace, self.default_ttl)
+        today = today or date.today()
+        if window_end is None or window_end >= today:
+            return min(base, self.max_ttl)
+
+        settled = (today - window_end).days > self.settle_days
+        ttl = self.closed_past_ttl if settled else self.recent_past_ttl
+        return min(max(ttl, base), self.max_ttl)
+
+    def for_query(self, namespace: str, params: Dict[str, Any]) -> int:
+        """Get the TTL of an entry from its upstream query parameters."""
+        return self.ttl(namespace, self.window_end(params))
+
+
+# Global TTL policy instance
+ttl_policy = TTLPolicy()
@@ -0,0 +1,128 @@
+"""
+Instrumented HTTP client for requests to the PNCP APIs.
+"""
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from app.config.settings import config
+from app.extensions.admission import admission
+from app.extensions.json_codec import json_codec
+from app.extensions.outbound_governor import INTERACTIVE, UpstreamThrottled, outbound_governor
+from app.extensions.metrics import metrics
+from app.extensions.request_timing import request_timing
+
+logger = logging.getLogger(__name__)
+
+# Get configuration
+current_config = config['default']()
+
+
+class UpstreamClient:
+    """
+    Single entry point for outbound calls to the PNCP APIs.
+
+    Every call is timed and recorded per upstream endpoint, so latency and
+    error rates can be told apart for each PNCP route. Within a request the
+    time to first byte and the body download are recorded as separate
+    phases (see request_timing).
+
+    Connections are kept alive in a per-process pool (UPSTREAM_POOL_SIZE
+    per host), so concurrent fan-out calls reuse TLS sessions instead of
+    opening a new connection each. The pool is recreated after a fork,
+    since sockets cannot be shared between workers.
+
+    Calls made while handling a request to an admission-limited route first
+    take that request's slots (see AdmissionControl), and every call takes a
+    token from the fleet-wide outbound budget for its priority class (see
+    OutboundGovernor).
+    """
+
+    def __init__(self, pool_size: Optional[int] = None):
+        """
+        Initialize upstream client.
+
+        Args:
+            pool_size: Connections kept per host (defaults to UPSTREAM_POOL_SIZE)
+        """
+        self.pool_size = pool_size or current_config.UPSTREAM_POOL_SIZE
+        self._session: Optional[requests.Session] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled session of the current process."""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+                    self._pid = os.getpid()
+        return self._session
+
+    def get(self, url: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+            timeout: int = 30, priority: str = INTERACTIVE) -> requests.Response:
+        """
+        Perform a GET request against a PNCP API.
+
+        Args:
+            url: Full request URL
+            endpoint: Low-cardinality label for the upstream endpoint (path template)
+            params: Query string parameters
+            timeout: Request timeout in seconds
+            priority: Outbound budget class (interactive, warmer or backfill)
+
+        Returns:
+            Response object
+
+        Raises:
+            requests.exceptions.RequestException: On network failures, or
+                UpstreamOverloaded when the request is refused a slot or a token
+        """
+        admission.acquire()
+        try:
+            outbound_governor.acquire(priority)
+        except UpstreamThrottled:
+            admission.shed()
+            raise
+        start_time = time.perf_counter()
+        status = "error"
+        with metrics.track_upstream(endpoint):
+            try:
+                with request_timing.phase('upstream'):
+                    response = self.session.get(url, params=params, timeout=timeout, stream=True)
+                status = str(response.status_code)
+                with request_timing.phase('download'):
+                    # Read the body now so the download is timed apart from TTFB
+                    response.content
+                return response
+            except requests.exceptions.Timeout:
+                status = "timeout"
+                raise
+            except requests.exceptions.ConnectionError:
+                status = "connection_error"
+                raise
+            finally:
+                metrics.observe_upstream(endpoint, status, time.perf_counter() - start_time)
+
+    @staticmethod
+    def parse_json(response: requests.Response) -> Any:
+        """
+        Decode a JSON response body, timing it as the parse phase.
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        with request_timing.phase('parse'):
+            return json_codec.loads(response.content)
+
+
+# Global upstream client instance
+upstream_client = UpstreamClient()
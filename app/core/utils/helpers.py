@@ -1,12 +1,17 @@
 """
 Helper functions for PNCP API Client.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Mapping, Tuple
+import hashlib
 import logging
+from itsdangerous import BadData, URLSafeSerializer
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Namespaces cursor signatures, so no other value signed with SECRET_KEY passes as a cursor
+CURSOR_SALT = 'pncp-cursor'
+
 # Modalidade mapping
 MODALIDADES = {
     '1': 'Concorrência',
@@ -21,6 +26,7 @@ MODALIDADES = {
 }
 
 
+
 def format_currency(value: float) -> str:
     """
     Format currency value for Brazilian format.
@@ -99,6 +105,56 @@ def truncate_text(text: str, max_length: int) -> str:
     return text[:max_length] + '...'
 
 
+def parse_pncp_id(id_string: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Parse a numeroControlePNCP into the parts used by the PNCP API paths.
+    
+    Args:
+        id_string: PNCP ID in format 18428888000123-1-000178/2024
+        
+    Returns:
+        (cnpj, ano, sequencial), e.g. ("18428888000123", 2024, 178),
+        or None if the ID is malformed
+    """
+    # CNPJ (14 digits)-type-sequencial/ano (4 digits), split with str methods:
+    # this runs for every ID of a batch and is cheaper than a regex match
+    cnpj, _, rest = (id_string or '').partition('-')
+    tipo, _, rest = rest.partition('-')
+    sequencial, _, ano = rest.partition('/')
+    if not (len(cnpj) == 14 and cnpj.isdecimal() and tipo.isdecimal() and sequencial.isdecimal()
+            and len(ano) == 4 and ano.isdecimal()):
+        return None
+    return cnpj, int(ano), int(sequencial)
+
+
+def normalize_pncp_ids(values: Iterable[Any]) -> Tuple[Dict[str, Tuple[str, int, int]], List[Any]]:
+    """
+    Validate and de-duplicate a list of numeroControlePNCP in one pass.
+    
+    Surrounding whitespace is ignored, and IDs that only differ in the
+    zero padding of the sequential number refer to the same compra, so
+    only the first of them is kept.
+    
+    Args:
+        values: IDs as sent by a client
+        
+    Returns:
+        Tuple of (valid IDs mapped to their parsed parts, in input order;
+        invalid values)
+    """
+    valid: Dict[str, Tuple[str, int, int]] = {}
+    invalid: List[Any] = []
+    seen = set()
+    for value in values:
+        parts = parse_pncp_id(value.strip()) if isinstance(value, str) else None
+        if parts is None:
+            invalid.append(value)
+        elif parts not in seen:
+            seen.add(parts)
+            valid[value.strip()] = parts
+    return valid, invalid
+
+
 def convert_pncp_id_to_url(id_string: str) -> str:
     """
     Convert PNCP ID format to URL format.
@@ -109,25 +165,116 @@ def convert_pncp_id_to_url(id_string: str) -> str:
     Returns:
         URL format: 18428888000123/2024/178
     """
-    if '-' in id_string and '/' in id_string:
-        try:
-            # Convert from format: 18428888000123-1-000178/2024
-            # To format: 18428888000123/2024/178
-            parts = id_string.split('-')
-            cnpj = parts[0]
-            sequencial_part = parts[2]  # 000178/2024
-            
-            # Split sequencial_part to get sequencial and year
-            sequencial_year = sequencial_part.split('/')
-            sequencial = sequencial_year[0]  # 000178
-            year = sequencial_year[1]  # 2024
-            
-            # Remove leading zeros from sequencial
-            sequencial_number = int(sequencial)
-            
-            return f"{cnpj}/{year}/{sequencial_number}"
-        except Exception as e:
-            logger.error(f"Error converting ID {id_string}: {e}")
-            return id_string
-    
-    return id_string
\ No newline at end of file
+    parts = parse_pncp_id(id_string)
+    if parts is None:
+        return id_string
+    cnpj, ano, sequencial = parts
+    return f"{cnpj}/{ano}/{sequencial}"
+
+
+def build_cache_key(namespace: str, params: Mapping[str, Any]) -> str:
+    """
+    Build a cache key for a namespace and a set of query parameters.
+    
+    The digest is stable across processes and restarts (unlike the builtin
+    hash(), which is salted per interpreter), so every worker and node
+    shares the same cache entries.
+    
+    Args:
+        namespace: Cache namespace (e.g. open_tenders)
+        params: Query parameters
+        
+    Returns:
+        Cache key in format namespace:digest
+    """
+    canonical = str(sorted(params.items()))
+    digest = hashlib.blake2b(canonical.encode('utf-8'), digest_size=12).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+# Parameters (or record fields) holding each tagged cache dimension
+CACHE_TAG_FIELDS = {
+    'uf': ('uf', 'ufSigla'),
+    'modalidade': ('codigoModalidadeContratacao', 'modalidadeId'),
+}
+# Date parameters (or record fields) bucketed by month into data:<yyyyMM> tags
+CACHE_TAG_DATE_FIELDS = ('dataInicial', 'dataFinal', 'dataPublicacaoPncp')
+# Longest date range tagged month by month
+CACHE_TAG_MAX_MONTHS = 24
+
+
+def _month_bucket(value: Any) -> Optional[Tuple[int, int]]:
+    """Get the (year, month) of a yyyyMMdd or ISO date, or None when invalid."""
+    digits = str(value).replace('-', '')[:6]
+    if len(digits) != 6 or not digits.isdigit() or not 1 <= int(digits[4:]) <= 12:
+        return None
+    return int(digits[:4]), int(digits[4:])
+
+
+def cache_tags(params: Mapping[str, Any]) -> List[str]:
+    """
+    Get the invalidation tags of a cache entry.
+    
+    Entries are tagged by UF (``uf:SP``), modality (``modalidade:6``) and
+    month (``data:202403``, one per month from dataInicial to dataFinal),
+    so they can be purged by dimension (see RedisClient.purge).
+    
+    Args:
+        params: Query parameters of the entry, or the PNCP record it holds
+        
+    Returns:
+        Tags, in a stable order
+    """
+    tags = []
+    for dimension, names in CACHE_TAG_FIELDS.items():
+        for name in names:
+            if params.get(name) not in (None, ''):
+                tags.append(f"{dimension}:{str(params[name]).upper()}")
+                break
+    
+    months = [m for m in (_month_bucket(params[name]) for name in CACHE_TAG_DATE_FIELDS if params.get(name)) if m]
+    if months:
+        (year, month), last = min(months), max(months)
+        for _ in range(CACHE_TAG_MAX_MONTHS):
+            tags.append(f"data:{year:04d}{month:02d}")
+            if (year, month) >= last:
+                break
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return tags
+
+
+def _cursor_serializer(secret_key: str) -> URLSafeSerializer:
+    """Serializer signing pagination cursors with the app secret."""
+    return URLSafeSerializer(secret_key, salt=CURSOR_SALT)
+
+
+def encode_cursor(payload: Mapping[str, Any], secret_key: str) -> str:
+    """
+    Encode a pagination cursor, signed so clients cannot forge one.
+    
+    Args:
+        payload: Cursor state (filters, page size and last sort key)
+        secret_key: Key the cursor is signed with (the app SECRET_KEY)
+        
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    return _cursor_serializer(secret_key).dumps(payload)
+
+
+def decode_cursor(cursor: str, secret_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode a pagination cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Opaque cursor string
+        secret_key: Key the cursor was signed with
+        
+    Returns:
+        Cursor state, or None if the cursor is malformed or its signature is invalid
+    """
+    try:
+        payload = _cursor_serializer(secret_key).loads(cursor)
+    except BadData:
+        return None
+    return payload if isinstance(payload, dict) else None
@@ -0,0 +1,117 @@
+"""
+Field projection for tender records.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+# Named field sets accepted by the ``fields`` parameter (None = no projection)
+FIELD_PRESETS: Dict[str, Optional[Tuple[str, ...]]] = {
+    'full': None,
+    'list': (
+        'numeroControlePNCP',
+        'numeroCompra',
+        'processo',
+        'objetoCompra',
+        'modalidadeId',
+        'modalidadeNome',
+        'valorTotalEstimado',
+        'dataAberturaProposta',
+        'dataEncerramentoProposta',
+        'orgaoEntidade.cnpj',
+        'orgaoEntidade.razaoSocial',
+        'unidadeOrgao.ufSigla',
+        'unidadeOrgao.municipioNome',
+    ),
+}
+
+FIELD_PATH_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$')
+MAX_FIELD_PATHS = 50
+
+
+def parse_fields(spec: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a ``fields`` parameter.
+
+    The value is a comma-separated list of presets (``list``, ``full``) and
+    dot paths into the record (``orgaoEntidade.razaoSocial``).
+
+    Args:
+        spec: Parameter value
+
+    Returns:
+        Sorted, de-duplicated field paths, or None for the full record
+
+    Raises:
+        ValueError: If a preset or path is invalid
+    """
+    if not spec:
+        return None
+
+    paths = set()
+    for token in (part.strip() for part in spec.split(',')):
+        if not token:
+            continue
+        if token in FIELD_PRESETS:
+            preset = FIELD_PRESETS[token]
+            if preset is None:
+                return None
+            paths.update(preset)
+        elif FIELD_PATH_PATTERN.match(token):
+            paths.add(token)
+        else:
+            raise ValueError(f"Invalid field: {token}")
+
+    if len(paths) > MAX_FIELD_PATHS:
+        raise ValueError(f"Too many fields (maximum {MAX_FIELD_PATHS})")
+    return tuple(sorted(paths)) or None
+
+
+@lru_cache(maxsize=64)
+def compile_fields(paths: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Compile field paths into a projection tree.
+
+    Args:
+        paths: Dot paths (``a.b`` selects ``b`` inside ``a``)
+
+    Returns:
+        Nested dict where None selects a whole value (shared, do not modify)
+    """
+    tree: Dict[str, Any] = {}
+    # Shorter paths first, so a whole-value selection is never narrowed later
+    for path in sorted(paths, key=lambda p: p.count('.')):
+        node = tree
+        *parents, leaf = path.split('.')
+        for part in parents:
+            child = node.setdefault(part, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[leaf] = None
+    return tree
+
+
+def project(value: Any, tree: Dict[str, Any]) -> Any:
+    """
+    Project a record (or a list of records) onto a projection tree.
+
+    Missing fields are skipped; lists are projected element by element.
+
+    Args:
+        value: Record, list of records or scalar
+        tree: Projection tree from compile_fields
+
+    Returns:
+        Projected copy
+    """
+    if isinstance(value, dict):
+        projected = {}
+        for key, subtree in tree.items():
+            if key in value:
+                projected[key] = value[key] if subtree is None else project(value[key], subtree)
+        return projected
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    return value
@@ -1,6 +1,16 @@
 """
 Extensions package for PNCP API Client.
 """
+from .metrics import metrics
+from .request_timing import request_timing
+from .json_codec import json_codec
+from .cache_stats import cache_stats
 from .redis_client import redis_client
+from .compression import compression
+from .assets import assets
+from .page_cache import page_cache
+from .profiler import profiler
+from .admission import admission
+from .outbound_governor import outbound_governor
 
-__all__ = ['redis_client']
\ No newline at end of file
+__all__ = ['redis_client', 'metrics', 'request_timing', 'json_codec', 'cache_stats', 'compression', 'assets', 'page_cache', 'profiler', 'admission', 'outbound_governor']
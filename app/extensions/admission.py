@@ -0,0 +1,323 @@
+"""
+Admission control extension for PNCP API Client.
+"""
+import time
+import hashlib
+import logging
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+import requests
+from flask import Flask, Response, g, has_request_context, jsonify, make_response, request
+from app.extensions.metrics import metrics
+from app.extensions.redis_client import redis_client
+from app.core.utils.helpers import cache_tags
+
+logger = logging.getLogger(__name__)
+
+STALE_PREFIX = "stale"
+
+
+class UpstreamOverloaded(requests.exceptions.RequestException):
+    """Raised when a request is refused a slot for upstream work."""
+
+
+class ConcurrencyLimit:
+    """
+    Counting semaphore with a bounded wait queue.
+
+    At most ``limit`` holders at a time; up to ``queue_size`` callers may
+    wait for a slot, each for at most the timeout given to acquire. Anyone
+    beyond that is refused right away instead of queueing behind them.
+    """
+
+    def __init__(self, limit: int, queue_size: int):
+        """
+        Initialize limit.
+
+        Args:
+            limit: Concurrent holders allowed
+            queue_size: Callers allowed to wait for a slot
+        """
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: float) -> bool:
+        """
+        Take a slot, waiting up to timeout seconds if the queue has room.
+
+        Returns:
+            Whether a slot was taken
+        """
+        with self._condition:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            if self.waiting >= self.queue_size or timeout <= 0:
+                return False
+            self.waiting += 1
+            try:
+                admitted = self._condition.wait_for(lambda: self.active < self.limit, timeout)
+            finally:
+                self.waiting -= 1
+            if admitted:
+                self.active += 1
+            return admitted
+
+    def release(self) -> None:
+        """Give a slot back, waking one waiter."""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+class AdmissionControl:
+    """
+    Bounds the upstream-bound work each worker takes on.
+
+    Routes that may call PNCP are decorated with ``limit(route)``. Such a
+    request takes a slot only when it actually goes upstream (on a cache
+    miss, from UpstreamClient.get or an explicit ``acquire()``), first from
+    its route's limit and then from the worker-wide one, so one slow route
+    cannot take every slot and cache hits never wait. When no slot frees up
+    within ADMISSION_QUEUE_TIMEOUT, or the wait queue is full, the request is
+    shed: the last good response of the same URL is served stale if one is
+    kept, otherwise 503 with Retry-After.
+
+    Undecorated routes (health checks, static pages, /api/test) never take a
+    slot, so they keep a thread as long as gunicorn has more threads than
+    the worker limit plus its queue.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize admission control."""
+        self.enabled = True
+        self.max_concurrent = 4
+        self.queue_size = 2
+        self.queue_timeout = 2.0
+        self.route_max_concurrent = 3
+        self.route_limits: Dict[str, int] = {}
+        self.retry_after = 5
+        self.stale_ttl = 86400
+        self._worker: Optional[ConcurrencyLimit] = None
+        self._routes: Dict[str, ConcurrencyLimit] = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize admission control with Flask app."""
+        self.enabled = app.config.get('ADMISSION_ENABLED', True)
+        self.max_concurrent = app.config.get('ADMISSION_MAX_CONCURRENT', 4)
+        self.queue_size = app.config.get('ADMISSION_QUEUE_SIZE', 2)
+        self.queue_timeout = app.config.get('ADMISSION_QUEUE_TIMEOUT', 2.0)
+        self.route_max_concurrent = app.config.get('ADMISSION_ROUTE_MAX_CONCURRENT', 3)
+        self.route_limits = self.parse_route_limits(app.config.get('ADMISSION_ROUTE_LIMITS', ''))
+        self.retry_after = app.config.get('ADMISSION_RETRY_AFTER', 5)
+        self.stale_ttl = app.config.get('ADMISSION_STALE_TTL', 86400)
+        self.reset()
+
+    @staticmethod
+    def parse_route_limits(value: str) -> Dict[str, int]:
+        """
+        Parse per-route limits given as ``route=limit`` pairs separated by commas.
+
+        Raises:
+            ValueError: If a pair is malformed
+        """
+        limits = {}
+        for pair in filter(None, (item.strip() for item in (value or '').split(','))):
+            route, _, limit = pair.partition('=')
+            limits[route.strip()] = int(limit)
+        return limits
+
+    def reset(self) -> None:
+        """Drop the limits so they are created again from the current settings."""
+        with self._lock:
+            self._worker = None
+            self._routes = {}
+
+    @property
+    def worker(self) -> ConcurrencyLimit:
+        """Worker-wide limit."""
+        with self._lock:
+            if self._worker is None:
+                self._worker = ConcurrencyLimit(self.max_concurrent, self.queue_size)
+            return self._worker
+
+    def route(self, name: str) -> ConcurrencyLimit:
+        """Limit of a route, created on first use."""
+        with self._lock:
+            if name not in self._routes:
+                limit = self.route_limits.get(name, self.route_max_concurrent)
+                self._routes[name] = ConcurrencyLimit(limit, self.queue_size)
+            return self._routes[name]
+
+    def acquire(self) -> None:
+        """
+        Take the slots of the current request before it goes upstream.
+
+        Does nothing outside a request, on routes without a limit or when
+        the request already holds its slots, so it is safe to call before
+        every upstream call.
+
+        Raises:
+            UpstreamOverloaded: If no slot frees up in time
+        """
+        if not has_request_context() or 'admission_route' not in g or g.admission_held:
+            return
+        if g.admission_shed:
+            raise UpstreamOverloaded("Upstream capacity exhausted")
+
+        deadline = time.monotonic() + self.queue_timeout
+        held: List[ConcurrencyLimit] = []
+        for limit in (self.route(g.admission_route), self.worker):
+            if not limit.acquire(deadline - time.monotonic()):
+                for taken in held:
+                    taken.release()
+                g.admission_shed = True
+                raise UpstreamOverloaded("Upstream capacity exhausted")
+            held.append(limit)
+        g.admission_held = held
+
+    def shed(self) -> None:
+        """Shed the current request although it holds its slots (e.g. no outbound budget left)."""
+        if has_request_context() and 'admission_route' in g:
+            g.admission_shed = True
+
+    def _release(self) -> None:
+        """Give back the slots held by the current request."""
+        held, g.admission_held = g.admission_held, []
+        for limit in reversed(held):
+            limit.release()
+
+    @staticmethod
+    def stale_key(route: str) -> str:
+        """Key of the stale copy of the current request's response."""
+        digest = hashlib.sha1(request.full_path.encode('utf-8')).hexdigest()
+        return f"{STALE_PREFIX}:{route}:{digest}"
+
+    def _keep_stale(self, route: str, response: Response) -> None:
+        """
+        Keep a successful upstream-backed response to serve when shedding.
+
+        The copy is tagged from the query parameters like the cache entries
+        it was built from, so purging a UF, modality or month drops it too.
+        """
+        if response.status_code != 200 or response.is_streamed or self.stale_ttl <= 0:
+            return
+        content_type = (response.content_type or 'application/json').encode('utf-8')
+        redis_client.set_bytes(self.stale_key(route), content_type + b"\n" + response.get_data(), self.stale_ttl,
+                               cache_tags(request.args))
+
+    def _shed(self, route: str) -> Response:
+        """Answer a request refused a slot, from its stale copy when there is one."""
+        stored = redis_client.get_bytes(self.stale_key(route))
+        if stored:
+            metrics.record_admission(route, 'stale')
+            content_type, _, body = stored.partition(b"\n")
+            response = Response(body, status=200, content_type=content_type.decode('utf-8'))
+            response.headers['Warning'] = '110 - "Response is Stale"'
+            response.headers['X-Served-Stale'] = '1'
+            return response
+
+        metrics.record_admission(route, 'shed')
+        logger.warning(f"Shedding request to {request.path}: upstream capacity exhausted")
+        response = jsonify({
+            "error": "Service overloaded",
+            "message": "Too many requests waiting on the PNCP API, try again shortly",
+            "retry_after": self.retry_after
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = str(self.retry_after)
+        return response
+
+    def limit(self, route: str, eager: bool = False) -> Callable:
+        """
+        Decorator for routes that call PNCP.
+
+        Args:
+            route: Name of the limit the route shares (e.g. all statistics routes)
+            eager: Take the slots before the view runs, for routes whose
+                upstream calls happen outside the request (streamed bodies,
+                thread pools); they are then held until the response closes
+
+        Returns:
+            Decorated function
+
+        Example:
+            @api_bp.route('/estatisticas/uf')
+            @admission.limit('estatisticas')
+            def get_uf_stats():
+                return pncp_service.get_uf_stats(request.args)
+        """
+        def decorator(f: Callable) -> Callable:
+            @wraps(f)
+            def wrapped(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return f(*args, **kwargs)
+
+                g.admission_route = route
+                g.admission_held = []
+                g.admission_shed = False
+                try:
+                    if eager:
+                        self.acquire()
+                    response = make_response(f(*args, **kwargs))
+                except UpstreamOverloaded:
+                    response = None
+                except BaseException:
+                    self._release()
+                    raise
+                if g.admission_shed:
+                    self._release()
+                    return self._shed(route)
+
+                if g.admission_held:
+                    metrics.record_admission(route, 'admitted')
+                    if response.is_streamed:
+                        response.call_on_close(self._release_later(g.admission_held))
+                        g.admission_held = []
+                    else:
+                        self._release()
+                        self._keep_stale(route, response)
+                return response
+
+            return wrapped
+        return decorator
+
+    @staticmethod
+    def _release_later(held: List[ConcurrencyLimit]) -> Callable[[], None]:
+        """Release slots once a streamed response is closed."""
+        def release() -> None:
+            for limit in reversed(held):
+                limit.release()
+        return release
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get admission control statistics of this worker.
+
+        Returns:
+            Dictionary with stats
+        """
+        with self._lock:
+            routes = dict(self._routes)
+            worker = self._worker
+        return {
+            "enabled": self.enabled,
+            "active": worker.active if worker else 0,
+            "waiting": worker.waiting if worker else 0,
+            "max_concurrent": self.max_concurrent,
+            "routes": {
+                name: {"active": limit.active, "waiting": limit.waiting, "max_concurrent": limit.limit}
+                for name, limit in routes.items()
+            }
+        }
+
+
+# Global admission control instance
+admission = AdmissionControl()
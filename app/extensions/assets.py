@@ -0,0 +1,113 @@
+"""
+Static asset bundle extension for PNCP API Client.
+"""
+import os
+import json
+import logging
+from typing import Dict, Optional, Tuple
+from flask import Flask, request, url_for
+
+logger = logging.getLogger(__name__)
+
+# Raw sources (under app/static) used when no build is available
+LOCAL_SOURCES = {
+    'main.js': 'js/main.js',
+    'advanced-filters.js': 'js/advanced-filters.js',
+}
+
+# CDN URLs of the third-party libraries that were not vendored by the build
+CDN_URLS = {
+    'bootstrap.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'fontawesome.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
+    'bootstrap.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'jquery.js': 'https://code.jquery.com/jquery-3.6.0.min.js',
+    'chart.js': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js',
+}
+
+
+class Assets:
+    """
+    Resolves logical asset names to fingerprinted bundles.
+
+    ``scripts/build_assets.py`` writes content-hashed, minified and
+    precompressed bundles to ``static/dist`` with a manifest. Templates call
+    ``asset_url('main.js')``; bundles are served with an immutable far-future
+    Cache-Control, so browsers never revalidate them, and a new build simply
+    produces new URLs.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize assets."""
+        self.dist_dir = ''
+        self.max_age = 31536000
+        self.use_bundles = True
+        self.manifest: Dict[str, str] = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize assets with Flask app."""
+        self.dist_dir = os.path.join(app.static_folder, 'dist')
+        self.max_age = int(app.config.get('ASSETS_MAX_AGE', 31536000))
+
+        # Bundles are off by default in debug so edits to the sources show up immediately
+        use_bundles = app.config.get('ASSETS_USE_BUNDLES')
+        self.use_bundles = not app.debug if use_bundles is None else str(use_bundles).lower() == 'true'
+        self.manifest = self.load_manifest() if self.use_bundles else {}
+
+        app.jinja_env.globals['asset_url'] = self.url
+
+    def load_manifest(self) -> Dict[str, str]:
+        """Load the bundle manifest written by the build."""
+        path = os.path.join(self.dist_dir, 'manifest.json')
+        try:
+            with open(path, 'r', encoding='utf-8') as fh:
+                manifest = json.load(fh)
+            logger.info(f"Loaded asset manifest with {len(manifest)} bundles")
+            return manifest
+        except FileNotFoundError:
+            logger.info("No asset manifest found, serving raw static files (run scripts/build_assets.py)")
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading asset manifest {path}: {e}")
+        return {}
+
+    def url(self, name: str) -> str:
+        """
+        Get the URL of an asset.
+
+        Args:
+            name: Logical asset name (e.g. ``main.js``)
+
+        Returns:
+            URL of the fingerprinted bundle, the raw static file or the CDN
+
+        Raises:
+            ValueError: If the asset is unknown
+        """
+        if name in self.manifest:
+            return url_for('assets.dist_file', filename=self.manifest[name])
+        if name in LOCAL_SOURCES:
+            return url_for('static', filename=LOCAL_SOURCES[name])
+        if name in CDN_URLS:
+            return CDN_URLS[name]
+        raise ValueError(f"Unknown asset: {name}")
+
+    def select_variant(self, filename: str) -> Tuple[str, Optional[str]]:
+        """
+        Pick the precompressed copy of a bundle the client accepts.
+
+        Args:
+            filename: Bundle file name in static/dist
+
+        Returns:
+            Tuple of (file to send, Content-Encoding or None)
+        """
+        accepted = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted.quality(encoding) and os.path.isfile(os.path.join(self.dist_dir, filename + suffix)):
+                return filename + suffix, encoding
+        return filename, None
+
+
+# Global assets instance
+assets = Assets()
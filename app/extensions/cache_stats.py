@@ -0,0 +1,192 @@
+"""
+Cache analytics extension for PNCP API Client.
+"""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from flask import Flask
+from app.extensions.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Misses remembered to time their fill (oldest dropped first)
+MAX_PENDING_FILLS = 4096
+
+
+class SpaceSaving:
+    """
+    Space-saving top-k sketch of the most frequent keys.
+
+    Keeps at most ``capacity`` counters. A key that is not tracked replaces
+    the one with the smallest count and inherits that count as its error,
+    so every key more frequent than ``total / capacity`` is guaranteed to
+    be tracked and counts are overestimated by at most ``error``.
+    """
+
+    def __init__(self, capacity: int = 100):
+        """Initialize sketch."""
+        self.capacity = capacity
+        self._counts: Dict[str, List[int]] = {}
+
+    def add(self, key: str) -> None:
+        """Count one occurrence of a key."""
+        counter = self._counts.get(key)
+        if counter is not None:
+            counter[0] += 1
+            return
+        if len(self._counts) < self.capacity:
+            self._counts[key] = [1, 0]
+            return
+        evicted = min(self._counts, key=lambda k: self._counts[k][0])
+        floor = self._counts.pop(evicted)[0]
+        self._counts[key] = [floor + 1, floor]
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """Get the n most frequent keys as (key, count, error), most frequent first."""
+        ranked = sorted(self._counts.items(), key=lambda item: item[1][0], reverse=True)
+        return [(key, count, error) for key, (count, error) in ranked[:n]]
+
+    def clear(self) -> None:
+        """Forget every counter."""
+        self._counts.clear()
+
+
+class NamespaceStats:
+    """Cache counters of one namespace."""
+
+    __slots__ = ('hits', 'misses', 'fills', 'bytes', 'fill_seconds', 'fills_timed', 'max_fill_seconds')
+
+    def __init__(self):
+        """Initialize counters."""
+        self.hits = 0
+        self.misses = 0
+        self.fills = 0
+        self.bytes = 0
+        self.fill_seconds = 0.0
+        self.fills_timed = 0
+        self.max_fill_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups * 100, 2) if lookups else 0,
+            "fills": self.fills,
+            "bytes": self.bytes,
+            "avg_fill_bytes": self.bytes // self.fills if self.fills else 0,
+            "avg_fill_ms": round(self.fill_seconds / self.fills_timed * 1000, 2) if self.fills_timed else None,
+            "max_fill_ms": round(self.max_fill_seconds * 1000, 2) if self.fills_timed else None
+        }
+
+
+class CacheStats:
+    """
+    App-side accounting of the Redis cache, by namespace.
+
+    Counts hits, misses, fills (entries written) and the bytes written for
+    each namespace, and times fills: the time from a miss on a key to the
+    write of that key, i.e. what producing the entry cost. Hot keys are
+    tracked with a space-saving sketch of CACHE_HOT_KEYS_CAPACITY counters.
+
+    Counters are kept per worker (the admin report says which one answered)
+    and also exported as Prometheus metrics, which aggregate all workers.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize cache stats."""
+        self.enabled = True
+        self.started_at = time.time()
+        self._namespaces: Dict[str, NamespaceStats] = {}
+        self._hot_keys = SpaceSaving()
+        self._pending_fills: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize cache stats with Flask app."""
+        self.enabled = app.config.get('CACHE_STATS_ENABLED', True)
+        self._hot_keys = SpaceSaving(app.config.get('CACHE_HOT_KEYS_CAPACITY', 100))
+
+    def _stats(self, namespace: str) -> NamespaceStats:
+        """Get the counters of a namespace (called with the lock held)."""
+        stats = self._namespaces.get(namespace)
+        if stats is None:
+            stats = self._namespaces[namespace] = NamespaceStats()
+        return stats
+
+    def record_lookup(self, namespace: str, key: str, hit: bool) -> None:
+        """Record a cache lookup."""
+        metrics.record_cache(namespace, hit)
+        if not self.enabled:
+            return
+
+        with self._lock:
+            stats = self._stats(namespace)
+            if hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+                self._pending_fills[key] = time.perf_counter()
+                self._pending_fills.move_to_end(key)
+                if len(self._pending_fills) > MAX_PENDING_FILLS:
+                    self._pending_fills.popitem(last=False)
+            self._hot_keys.add(key)
+
+    def record_fill(self, namespace: str, key: str, size: int) -> None:
+        """Record a cache entry written, timing it from the miss that caused it."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            stats = self._stats(namespace)
+            stats.fills += 1
+            stats.bytes += size
+            missed_at = self._pending_fills.pop(key, None)
+            duration = None
+            if missed_at is not None:
+                duration = time.perf_counter() - missed_at
+                stats.fill_seconds += duration
+                stats.fills_timed += 1
+                stats.max_fill_seconds = max(stats.max_fill_seconds, duration)
+        metrics.record_cache_fill(namespace, size, duration)
+
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        """
+        Report the counters of this worker.
+
+        Args:
+            top: Number of hot keys to list
+
+        Returns:
+            Counters by namespace and the hottest keys
+        """
+        with self._lock:
+            namespaces = {name: stats.to_dict() for name, stats in sorted(self._namespaces.items())}
+            hot_keys = [
+                {"key": key, "namespace": key.split(':', 1)[0], "lookups": count, "error": error}
+                for key, count, error in self._hot_keys.top(top)
+            ]
+        return {
+            "worker_pid": os.getpid(),
+            "since": self.started_at,
+            "namespaces": namespaces,
+            "hot_keys": hot_keys
+        }
+
+    def reset(self) -> None:
+        """Clear every counter of this worker."""
+        with self._lock:
+            self._namespaces.clear()
+            self._hot_keys.clear()
+            self._pending_fills.clear()
+            self.started_at = time.time()
+
+
+# Global cache stats instance
+cache_stats = CacheStats()
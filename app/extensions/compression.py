@@ -0,0 +1,167 @@
+"""
+Response compression extension for PNCP API Client.
+"""
+# Try to import brotli (gzip is always available)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+    brotli = None
+
+import gzip
+import logging
+from typing import List, Optional
+from flask import Flask, Response, g, request
+from app.extensions.cache_stats import cache_stats
+from app.extensions.redis_client import redis_client
+from app.extensions.request_timing import request_timing
+
+logger = logging.getLogger(__name__)
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+
+class Compression:
+    """
+    Negotiated gzip/brotli compression of responses.
+
+    Responses above COMPRESSION_MIN_SIZE are compressed with the best
+    encoding the client accepts (brotli is preferred when installed).
+
+    Cacheable endpoints call ``serve_cached`` with their cache key: the
+    compressed body is then stored next to the cache entry as
+    ``{cache_key}:{encoding}`` with the entry's remaining TTL, and later hits
+    are answered with the stored bytes without re-encoding or recompressing.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize compression."""
+        self.enabled = True
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 5
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize compression with Flask app."""
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.min_size = int(app.config.get('COMPRESSION_MIN_SIZE', 1024))
+        self.gzip_level = int(app.config.get('COMPRESSION_GZIP_LEVEL', 6))
+        self.brotli_quality = int(app.config.get('COMPRESSION_BROTLI_QUALITY', 5))
+
+        if self.enabled:
+            app.after_request(self._after_request)
+
+    def negotiate(self) -> Optional[str]:
+        """
+        Pick the encoding for the current request from Accept-Encoding.
+
+        Returns:
+            ``br``, ``gzip`` or None when the client accepts neither
+        """
+        accepted = request.accept_encodings
+        br_quality = accepted.quality('br') if BROTLI_AVAILABLE else 0
+        gzip_quality = accepted.quality('gzip')
+        if br_quality and br_quality >= gzip_quality:
+            return 'br'
+        if gzip_quality:
+            return 'gzip'
+        return None
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        """Compress data with the given encoding."""
+        with request_timing.phase('compress'):
+            if encoding == 'br':
+                return brotli.compress(data, quality=self.brotli_quality)
+            return gzip.compress(data, compresslevel=self.gzip_level)
+
+    @staticmethod
+    def variant_key(cache_key: str, encoding: str) -> str:
+        """Cache key of the compressed variant of an entry."""
+        return f"{cache_key}:{encoding}"
+
+    @classmethod
+    def variant_keys(cls, cache_key: str) -> List[str]:
+        """Cache keys of every compressed variant an entry may have."""
+        return [cls.variant_key(cache_key, encoding) for encoding in ('br', 'gzip')]
+
+    def serve_cached(self, cache_key: str) -> Optional[Response]:
+        """
+        Get the precompressed response for a cache entry, if stored.
+
+        Also marks the current response as cacheable, so a compressed variant
+        is stored for ``cache_key`` when none exists yet.
+
+        Args:
+            cache_key: Key of the JSON cache entry
+
+        Returns:
+            Ready response, or None to fall back to the regular cache lookup
+        """
+        if not self.enabled:
+            return None
+        g.compression_cache_key = cache_key
+
+        encoding = self.negotiate()
+        if encoding is None:
+            return None
+        body = redis_client.get_bytes(self.variant_key(cache_key, encoding))
+        if body is None:
+            return None
+
+        cache_stats.record_lookup(redis_client.namespace(cache_key), cache_key, hit=True)
+        g.compression_served = True
+        response = Response(body, status=200, mimetype='application/json')
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def _should_compress(self, response: Response) -> bool:
+        """Check whether a response is eligible for compression."""
+        if response.direct_passthrough or response.is_streamed:
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if 'Content-Encoding' in response.headers:
+            return False
+        mimetype = response.mimetype or ''
+        if not (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES):
+            return False
+        return (response.content_length or 0) >= self.min_size
+
+    def _after_request(self, response: Response) -> Response:
+        """Compress the response and store the variant of cacheable entries."""
+        if g.get('compression_served') or not self._should_compress(response):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        body = self.compress(response.get_data(), encoding)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+
+        cache_key = g.get('compression_cache_key')
+        if cache_key and response.status_code == 200:
+            self._store_variant(cache_key, encoding, body)
+        return response
+
+    def _store_variant(self, cache_key: str, encoding: str, body: bytes) -> None:
+        """Store a compressed body next to its cache entry, expiring with it."""
+        ttl = redis_client.ttl(cache_key)
+        if ttl > 0:
+            redis_client.set_bytes(self.variant_key(cache_key, encoding), body, ttl)
+
+
+# Global compression instance
+compression = Compression()
@@ -0,0 +1,119 @@
+"""
+JSON codec extension for PNCP API Client.
+"""
+# Try to import orjson (the stdlib json module is always available)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+import json
+import logging
+from typing import Any, Callable, Optional, Union
+from flask import Flask, Response
+from app.extensions.request_timing import TimedJSONProvider, request_timing
+
+logger = logging.getLogger(__name__)
+
+
+class JSONCodec:
+    """
+    JSON encoding and decoding shared by responses, the Redis cache and models.
+
+    Uses orjson when it is installed (and JSON_FAST_ENABLED is on), and the
+    stdlib json module otherwise. Values orjson cannot encode (integers
+    beyond 64 bits, for instance) fall back to the stdlib encoder, so both
+    backends accept the same data.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize JSON codec."""
+        self.fast = ORJSON_AVAILABLE
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize JSON codec with Flask app and register its JSON provider."""
+        self.fast = ORJSON_AVAILABLE and app.config.get('JSON_FAST_ENABLED', True)
+        app.json = FastJSONProvider(app)
+        logger.info(f"JSON codec: {'orjson' if self.fast else 'stdlib json'}")
+
+    def dumps(self, value: Any, default: Optional[Callable[[Any], Any]] = None,
+              indent: bool = False, sort_keys: bool = False) -> bytes:
+        """
+        Serialize a value to UTF-8 JSON.
+
+        Args:
+            value: Value to serialize
+            default: Called for objects the encoder does not support
+            indent: Pretty-print with two-space indentation
+            sort_keys: Sort object keys
+
+        Returns:
+            JSON document (compact unless ``indent``)
+        """
+        if self.fast:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(value, default=default, option=option)
+            except TypeError:
+                pass
+        separators = None if indent else (',', ':')
+        return json.dumps(value, default=default, indent=2 if indent else None, separators=separators,
+                          sort_keys=sort_keys, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Deserialize a JSON document.
+
+        Raises:
+            ValueError: If the document is not valid JSON
+        """
+        if self.fast:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class FastJSONProvider(TimedJSONProvider):
+    """
+    Flask JSON provider backed by the JSON codec.
+
+    Responses are serialized straight to bytes. Keys keep the order of the
+    data (mostly PNCP's own order) instead of being sorted, and the objects
+    the default provider knows (dates, decimals, dataclasses) are handled
+    by the same ``default`` hook, so the output is equivalent.
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON (stdlib for options the codec does not support)."""
+        if set(kwargs) - {'indent', 'separators', 'sort_keys', 'default'}:
+            return super().dumps(obj, **kwargs)
+        return json_codec.dumps(obj, default=kwargs.get('default', self.default), indent=bool(kwargs.get('indent')),
+                                sort_keys=kwargs.get('sort_keys', self.sort_keys)).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize data as JSON."""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return json_codec.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize data to a JSON response, timing the work."""
+        with request_timing.phase('serialize'):
+            obj = self._prepare_response_obj(args, kwargs)
+            # Same rule as the default provider: pretty-printed in debug unless compact is set
+            indent = (self.compact is None and self._app.debug) or self.compact is False
+            body = json_codec.dumps(obj, default=self.default, indent=indent, sort_keys=self.sort_keys)
+            return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+# Global JSON codec instance
+json_codec = JSONCodec()
@@ -0,0 +1,289 @@
+"""
+Prometheus metrics extension for PNCP API Client.
+"""
+# Try to import prometheus_client
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+from flask import Flask, g, request
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets (seconds) covering cache hits up to the gunicorn timeout
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Metrics:
+    """
+    Prometheus metrics collector.
+
+    Works under gunicorn multiprocess when PROMETHEUS_MULTIPROC_DIR is set
+    (see gunicorn.conf.py): each worker writes its samples to that directory
+    and the /metrics endpoint aggregates all of them.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize metrics collectors."""
+        self.enabled = False
+        if PROMETHEUS_AVAILABLE:
+            self._create_collectors()
+        if app is not None:
+            self.init_app(app)
+
+    def _create_collectors(self) -> None:
+        """Create the metric collectors (once per process)."""
+        self.request_latency = Histogram(
+            'pncp_http_request_duration_seconds',
+            'HTTP request latency by route',
+            ['endpoint', 'method'],
+            buckets=LATENCY_BUCKETS
+        )
+        self.requests_total = Counter(
+            'pncp_http_requests_total',
+            'HTTP requests by route and status',
+            ['endpoint', 'method', 'status']
+        )
+        self.requests_in_flight = Gauge(
+            'pncp_http_requests_in_flight',
+            'HTTP requests currently being served',
+            multiprocess_mode='livesum'
+        )
+        self.upstream_latency = Histogram(
+            'pncp_upstream_request_duration_seconds',
+            'Latency of requests to the PNCP APIs by endpoint',
+            ['endpoint'],
+            buckets=LATENCY_BUCKETS
+        )
+        self.upstream_requests_total = Counter(
+            'pncp_upstream_requests_total',
+            'Requests to the PNCP APIs by endpoint and status',
+            ['endpoint', 'status']
+        )
+        self.upstream_in_flight = Gauge(
+            'pncp_upstream_requests_in_flight',
+            'Requests to the PNCP APIs currently in progress',
+            ['endpoint'],
+            multiprocess_mode='livesum'
+        )
+        self.cache_requests_total = Counter(
+            'pncp_cache_requests_total',
+            'Cache lookups by namespace and result',
+            ['namespace', 'result']
+        )
+        self.cache_fills_total = Counter(
+            'pncp_cache_fills_total',
+            'Cache entries written by namespace',
+            ['namespace']
+        )
+        self.cache_fill_bytes_total = Counter(
+            'pncp_cache_fill_bytes_total',
+            'Bytes of cache entries written by namespace',
+            ['namespace']
+        )
+        self.cache_fill_latency = Histogram(
+            'pncp_cache_fill_duration_seconds',
+            'Time from a cache miss to the write of the entry, by namespace',
+            ['namespace'],
+            buckets=LATENCY_BUCKETS
+        )
+        self.cache_available = Gauge(
+            'pncp_cache_available',
+            'Whether the Redis cache is enabled (1) or unreachable (0) in every worker',
+            multiprocess_mode='livemin'
+        )
+        self.rate_limited_total = Counter(
+            'pncp_rate_limited_total',
+            'Requests rejected by the rate limiter',
+            ['endpoint']
+        )
+        self.admission_total = Counter(
+            'pncp_admission_total',
+            'Upstream-bound requests by admission outcome (admitted, shed or served stale)',
+            ['route', 'outcome']
+        )
+        self.upstream_budget_total = Counter(
+            'pncp_upstream_budget_total',
+            'Tokens requested from the fleet-wide outbound budget, by priority and outcome',
+            ['priority', 'outcome']
+        )
+        self.upstream_budget_wait = Histogram(
+            'pncp_upstream_budget_wait_seconds',
+            'Time waited for an outbound budget token, by priority',
+            ['priority'],
+            buckets=LATENCY_BUCKETS
+        )
+        self.upstream_budget_tokens = Gauge(
+            'pncp_upstream_budget_tokens',
+            'Tokens left in the fleet-wide outbound budget when last checked',
+            multiprocess_mode='mostrecent'
+        )
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize metrics with Flask app."""
+        if not PROMETHEUS_AVAILABLE:
+            logger.warning("prometheus_client not installed. Metrics will be disabled.")
+            self.enabled = False
+            return
+
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        if not self.enabled:
+            logger.info("Metrics disabled by configuration")
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self) -> None:
+        """Start timing the request."""
+        g.metrics_start_time = time.perf_counter()
+        g.metrics_observed = False
+        self.requests_in_flight.inc()
+
+    def _after_request(self, response):
+        """Record latency and status for the request."""
+        self._observe_request(response.status_code)
+        return response
+
+    def _teardown_request(self, exc: Optional[BaseException] = None) -> None:
+        """Release the in-flight gauge, recording unhandled errors as 500."""
+        if 'metrics_start_time' not in g:
+            return
+        if not g.metrics_observed:
+            self._observe_request(500)
+        self.requests_in_flight.dec()
+
+    def _observe_request(self, status_code: int) -> None:
+        """Observe the current request once."""
+        if 'metrics_start_time' not in g or g.metrics_observed:
+            return
+        g.metrics_observed = True
+
+        endpoint = request.endpoint or 'unmatched'
+        duration = time.perf_counter() - g.metrics_start_time
+        self.request_latency.labels(endpoint, request.method).observe(duration)
+        self.requests_total.labels(endpoint, request.method, str(status_code)).inc()
+
+    @contextmanager
+    def track_upstream(self, endpoint: str) -> Iterator[None]:
+        """Track a request to the PNCP APIs as in flight."""
+        if not self.enabled:
+            yield
+            return
+
+        gauge = self.upstream_in_flight.labels(endpoint)
+        gauge.inc()
+        try:
+            yield
+        finally:
+            gauge.dec()
+
+    def observe_upstream(self, endpoint: str, status: str, duration: float) -> None:
+        """
+        Record a completed request to the PNCP APIs.
+
+        Args:
+            endpoint: Upstream endpoint label (path template)
+            status: HTTP status code or failure kind (timeout, connection_error, error)
+            duration: Elapsed time in seconds
+        """
+        if not self.enabled:
+            return
+        self.upstream_latency.labels(endpoint).observe(duration)
+        self.upstream_requests_total.labels(endpoint, status).inc()
+
+    def record_cache(self, namespace: str, hit: bool) -> None:
+        """Record a cache lookup for a namespace."""
+        if not self.enabled:
+            return
+        self.cache_requests_total.labels(namespace, 'hit' if hit else 'miss').inc()
+
+    def record_cache_fill(self, namespace: str, size: int, duration: Optional[float] = None) -> None:
+        """
+        Record a cache entry written.
+
+        Args:
+            namespace: Cache namespace
+            size: Encoded size in bytes
+            duration: Seconds since the miss that caused the write, when known
+        """
+        if not self.enabled:
+            return
+        self.cache_fills_total.labels(namespace).inc()
+        self.cache_fill_bytes_total.labels(namespace).inc(size)
+        if duration is not None:
+            self.cache_fill_latency.labels(namespace).observe(duration)
+
+    def set_cache_available(self, available: bool) -> None:
+        """Record whether the Redis cache is reachable."""
+        if not self.enabled:
+            return
+        self.cache_available.set(1 if available else 0)
+
+    def record_rate_limited(self, endpoint: str) -> None:
+        """Record a request rejected by the rate limiter."""
+        if not self.enabled:
+            return
+        self.rate_limited_total.labels(endpoint).inc()
+
+    def record_admission(self, route: str, outcome: str) -> None:
+        """Record the admission outcome of an upstream-bound request."""
+        if not self.enabled:
+            return
+        self.admission_total.labels(route, outcome).inc()
+
+    def record_upstream_budget(self, priority: str, outcome: str, wait: Optional[float] = None) -> None:
+        """
+        Record a token requested from the outbound budget.
+
+        Args:
+            priority: Priority class of the call
+            outcome: granted, throttled or bypassed (Redis unavailable)
+            wait: Seconds waited for a granted token
+        """
+        if not self.enabled:
+            return
+        self.upstream_budget_total.labels(priority, outcome).inc()
+        if wait is not None:
+            self.upstream_budget_wait.labels(priority).observe(wait)
+
+    def set_upstream_budget_tokens(self, tokens: float) -> None:
+        """Record the tokens left in the outbound budget."""
+        if not self.enabled:
+            return
+        self.upstream_budget_tokens.set(tokens)
+
+    def render(self) -> Tuple[bytes, str]:
+        """
+        Render all metrics in the Prometheus text format.
+
+        Returns:
+            Tuple of payload and content type
+        """
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry), CONTENT_TYPE_LATEST
+
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# Global metrics instance
+metrics = Metrics()
@@ -0,0 +1,148 @@
+"""
+Fleet-wide budget of outbound requests to the PNCP APIs.
+"""
+import time
+import random
+import logging
+from typing import Dict, Optional
+from flask import Flask
+from app.extensions.admission import UpstreamOverloaded
+from app.extensions.metrics import metrics
+from app.extensions.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, highest first
+INTERACTIVE = "interactive"
+WARMER = "warmer"
+BACKFILL = "backfill"
+
+BUCKET_KEY = "ratelimit:pncp_outbound"
+
+# Refill the bucket for the time elapsed (on the Redis clock, shared by every
+# node) and take a token if at least reserve + 1 are left. Returns whether a
+# token was taken, the tokens left and the seconds until one would be.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= reserve + 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (reserve + 1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens), tostring(wait)}
+"""
+
+
+class UpstreamThrottled(UpstreamOverloaded):
+    """Raised when the outbound budget has no token for a request in time."""
+
+
+class OutboundGovernor:
+    """
+    Token bucket shared by every worker and node calling PNCP.
+
+    The bucket lives in Redis (in the protected ``ratelimit:`` namespace)
+    and refills at GOVERNOR_RATE requests per second up to GOVERNOR_BURST.
+    Every call made through UpstreamClient takes a token first, atomically
+    in a Lua script, so the whole fleet stays within the budget however
+    many processes share it.
+
+    Calls have a priority class. Interactive calls (serving a user) may
+    drain the bucket; warmer calls (keeping caches and the live feed fresh)
+    and backfill calls (bulk sync) only take a token while more than their
+    reserve (a share of the burst) is left, so they yield as soon as user
+    traffic eats into the budget. Interactive calls wait at most
+    GOVERNOR_MAX_WAIT seconds for a token, background ones up to
+    GOVERNOR_BACKGROUND_MAX_WAIT.
+
+    While Redis is unavailable calls are let through (and counted as
+    bypassed) rather than stopping all traffic to PNCP.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize governor."""
+        self.enabled = True
+        self.rate = 10.0
+        self.burst = 20
+        self.reserves: Dict[str, float] = {INTERACTIVE: 0.0, WARMER: 0.3, BACKFILL: 0.6}
+        self.max_wait = 1.0
+        self.background_max_wait = 30.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize governor with Flask app."""
+        self.enabled = app.config.get('GOVERNOR_ENABLED', True)
+        self.rate = float(app.config.get('GOVERNOR_RATE', 10.0))
+        self.burst = int(app.config.get('GOVERNOR_BURST', 20))
+        self.reserves = {
+            INTERACTIVE: 0.0,
+            WARMER: float(app.config.get('GOVERNOR_WARMER_RESERVE', 0.3)),
+            BACKFILL: float(app.config.get('GOVERNOR_BACKFILL_RESERVE', 0.6))
+        }
+        self.max_wait = float(app.config.get('GOVERNOR_MAX_WAIT', 1.0))
+        self.background_max_wait = float(app.config.get('GOVERNOR_BACKGROUND_MAX_WAIT', 30.0))
+
+    def reserve(self, priority: str) -> float:
+        """
+        Tokens a priority class must leave in the bucket.
+
+        Raises:
+            ValueError: If the priority class is unknown
+        """
+        if priority not in self.reserves:
+            raise ValueError(f"Unknown priority class: {priority}")
+        return self.reserves[priority] * self.burst
+
+    def acquire(self, priority: str = INTERACTIVE) -> None:
+        """
+        Take a token for one outbound request, waiting for the bucket to refill.
+
+        Args:
+            priority: Priority class (interactive, warmer or backfill)
+
+        Raises:
+            UpstreamThrottled: If no token is available within the class's wait
+        """
+        if not self.enabled:
+            return
+
+        reserve = self.reserve(priority)
+        start = time.monotonic()
+        deadline = start + (self.max_wait if priority == INTERACTIVE else self.background_max_wait)
+        while True:
+            result = redis_client.run_script(TOKEN_BUCKET_SCRIPT, [BUCKET_KEY], [self.rate, self.burst, reserve])
+            if result is None:
+                metrics.record_upstream_budget(priority, 'bypassed')
+                return
+
+            allowed, tokens, wait = int(result[0]), float(result[1]), float(result[2])
+            metrics.set_upstream_budget_tokens(tokens)
+            if allowed:
+                metrics.record_upstream_budget(priority, 'granted', time.monotonic() - start)
+                return
+
+            # Spread the retries of concurrent waiters over one refill interval
+            wait += random.uniform(0, 1 / self.rate)
+            if time.monotonic() + wait > deadline:
+                metrics.record_upstream_budget(priority, 'throttled')
+                logger.warning(f"Outbound budget exhausted, refusing {priority} request to PNCP")
+                raise UpstreamThrottled(f"Outbound request budget exhausted ({priority})")
+            time.sleep(wait)
+
+
+# Global outbound governor instance
+outbound_governor = OutboundGovernor()
@@ -0,0 +1,122 @@
+"""
+Rendered page cache extension for PNCP API Client.
+"""
+import os
+import gzip
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from flask import Flask, Response, render_template, request
+from app.extensions.compression import BROTLI_AVAILABLE, brotli, compression
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPage:
+    """A rendered page with its precompressed variants."""
+
+    __slots__ = ('variants', 'etag')
+
+    def __init__(self, body: bytes):
+        """
+        Compress the page once, at the highest levels.
+
+        Args:
+            body: Rendered HTML
+        """
+        self.etag = hashlib.sha1(body).hexdigest()[:16]
+        self.variants: Dict[Optional[str], bytes] = {
+            None: body,
+            'gzip': gzip.compress(body, compresslevel=9, mtime=0)
+        }
+        if BROTLI_AVAILABLE:
+            self.variants['br'] = brotli.compress(body, quality=11)
+
+
+class PageCache:
+    """
+    Serves the static HTML pages from memory.
+
+    The pages do not vary per request, so each template is rendered once per
+    worker and kept as bytes together with gzip/brotli variants. Responses
+    carry an ETag and Last-Modified (the newest template file) and are
+    revalidated by browsers with conditional requests, answered with 304.
+
+    Disabled in debug by default so template edits show up immediately.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize page cache."""
+        self.enabled = True
+        self.last_modified: Optional[datetime] = None
+        self._pages: Dict[str, CachedPage] = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize page cache with Flask app."""
+        enabled = app.config.get('PAGE_CACHE_ENABLED')
+        self.enabled = not app.debug if enabled is None else str(enabled).lower() == 'true'
+        self.last_modified = self._templates_mtime(app.template_folder)
+        self._pages = {}
+
+    @staticmethod
+    def _templates_mtime(folder: Optional[str]) -> Optional[datetime]:
+        """Get the modification time of the newest template."""
+        if not folder or not os.path.isdir(folder):
+            return None
+        mtimes = [
+            os.path.getmtime(os.path.join(root, name))
+            for root, _, names in os.walk(folder) for name in names
+        ]
+        if not mtimes:
+            return None
+        return datetime.fromtimestamp(int(max(mtimes)), tz=timezone.utc)
+
+    def get_page(self, template: str) -> CachedPage:
+        """Get a rendered page, rendering it on first use."""
+        page = self._pages.get(template)
+        if page is None:
+            with self._lock:
+                page = self._pages.get(template)
+                if page is None:
+                    page = CachedPage(render_template(template).encode('utf-8'))
+                    self._pages[template] = page
+                    logger.info(f"Page {template} rendered and cached ({len(page.variants[None])} bytes)")
+        return page
+
+    def render(self, template: str) -> Response:
+        """
+        Respond with a cached page.
+
+        Args:
+            template: Template name
+
+        Returns:
+            Page response (304 when the client copy is current)
+        """
+        if not self.enabled:
+            return Response(render_template(template), mimetype='text/html')
+
+        page = self.get_page(template)
+        encoding = compression.negotiate()
+        if encoding not in page.variants:
+            encoding = None
+
+        response = Response(page.variants[encoding], mimetype='text/html')
+        # Each representation needs its own strong validator
+        response.set_etag(f"{page.etag}-{encoding}" if encoding else page.etag)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        if self.last_modified is not None:
+            response.last_modified = self.last_modified
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+
+# Global page cache instance
+page_cache = PageCache()
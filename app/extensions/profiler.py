@@ -0,0 +1,269 @@
+"""
+On-demand sampling profiler extension for PNCP API Client.
+"""
+import os
+import re
+import sys
+import time
+import random
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from flask import Flask, g, request
+from app.utils.auth import is_admin_request
+
+logger = logging.getLogger(__name__)
+
+# Capture file names produced by Profiler.save
+CAPTURE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_.-]+\.collapsed$')
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler.
+
+    A background thread periodically snapshots the Python stacks of the
+    target threads and counts identical stacks. The result is written in the
+    collapsed-stack format understood by flamegraph.pl and speedscope.
+    """
+
+    # Threads running a sampler (never sampled themselves)
+    _sampler_idents: Set[int] = set()
+
+    def __init__(self, interval: float = 0.01, thread_ids: Optional[Set[int]] = None):
+        """
+        Initialize profiler.
+
+        Args:
+            interval: Seconds between samples
+            thread_ids: Threads to sample (None samples every thread)
+        """
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stop_event = threading.Event()
+        self._first_sample = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'SamplingProfiler':
+        """Start sampling in a background thread (returns after the first sample)."""
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        self._first_sample.wait(1.0)
+        return self
+
+    def stop(self) -> 'SamplingProfiler':
+        """Stop sampling and wait for the sampler thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.started_at is not None:
+            self.duration = time.time() - self.started_at
+        return self
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampler thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        """Sampler loop."""
+        own_ident = threading.get_ident()
+        self._sampler_idents.add(own_ident)
+        try:
+            while not self._stop_event.is_set():
+                self._sample()
+                self._first_sample.set()
+                self._stop_event.wait(self.interval)
+        finally:
+            self._sampler_idents.discard(own_ident)
+
+    def _sample(self) -> None:
+        """Take one snapshot of the target stacks."""
+        for ident, frame in sys._current_frames().items():
+            if ident in self._sampler_idents:
+                continue
+            if self.thread_ids is not None and ident not in self.thread_ids:
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[';'.join(stack)] += 1
+        self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """
+        Get samples in collapsed-stack format.
+
+        Returns:
+            One ``frame;frame;frame count`` line per distinct stack
+        """
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class Profiler:
+    """
+    Profiling hooks for live gunicorn workers.
+
+    Two modes are supported:
+
+    * per request: requests carrying ``X-Profile: 1`` plus a valid admin
+      token, and a random PROFILER_SAMPLE_RATE fraction of all requests,
+      are profiled on their own thread;
+    * time window: ``start_window`` samples every thread of the worker for
+      a number of seconds.
+
+    Captures are written to PROFILER_OUTPUT_DIR, keeping the newest
+    PROFILER_MAX_CAPTURES (older ones are deleted on save).
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize profiler."""
+        self.output_dir = '/tmp/pncp_profiles'
+        self.sample_rate = 0.0
+        self.interval = 0.01
+        self.max_window = 300
+        self.max_captures = 100
+        self._window: Optional[SamplingProfiler] = None
+        self._window_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize profiler with Flask app."""
+        self.output_dir = app.config.get('PROFILER_OUTPUT_DIR', self.output_dir)
+        self.sample_rate = float(app.config.get('PROFILER_SAMPLE_RATE', 0.0))
+        self.interval = float(app.config.get('PROFILER_INTERVAL_MS', 10)) / 1000
+        self.max_window = int(app.config.get('PROFILER_MAX_WINDOW_SECONDS', 300))
+        self.max_captures = int(app.config.get('PROFILER_MAX_CAPTURES', 100))
+
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+
+    def _should_profile(self) -> bool:
+        """Decide whether to profile the current request."""
+        if request.headers.get('X-Profile') == '1' and is_admin_request():
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _before_request(self) -> None:
+        """Start profiling the request thread if selected."""
+        if self._should_profile():
+            g.profiler = SamplingProfiler(self.interval, {threading.get_ident()}).start()
+
+    def _teardown_request(self, exc: Optional[BaseException] = None) -> None:
+        """Stop profiling the request and save the capture."""
+        sampler = g.pop('profiler', None)
+        if sampler is None:
+            return
+        sampler.stop()
+        self.save(sampler, f"request-{request.endpoint or 'unmatched'}")
+
+    def start_window(self, seconds: float) -> bool:
+        """
+        Profile every thread of this worker for a time window.
+
+        Args:
+            seconds: Window length (capped at PROFILER_MAX_WINDOW_SECONDS)
+
+        Returns:
+            False if a window is already running in this worker
+        """
+        seconds = min(max(seconds, 0.1), self.max_window)
+        with self._window_lock:
+            if self._window is not None and self._window.running:
+                return False
+            self._window = SamplingProfiler(self.interval).start()
+
+        timer = threading.Timer(seconds, self._finish_window, args=(self._window,))
+        timer.daemon = True
+        timer.start()
+        logger.info(f"Profiling window of {seconds}s started in worker {os.getpid()}")
+        return True
+
+    def _finish_window(self, sampler: SamplingProfiler) -> None:
+        """Stop a window profile and save the capture."""
+        sampler.stop()
+        self.save(sampler, 'window')
+
+    def save(self, sampler: SamplingProfiler, label: str) -> Optional[str]:
+        """
+        Write a capture to the output directory.
+
+        Args:
+            sampler: Stopped profiler
+            label: Capture label (request endpoint or ``window``)
+
+        Returns:
+            Capture file name, or None if nothing could be written
+        """
+        if not sampler.samples:
+            return None
+
+        label = re.sub(r'[^A-Za-z0-9_.-]', '_', label)
+        timestamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        name = f"{label}-{timestamp}-{os.getpid()}.collapsed"
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, name), 'w', encoding='utf-8') as fh:
+                fh.write(sampler.collapsed())
+                fh.write("\n")
+        except OSError as e:
+            logger.error(f"Error saving profile {name}: {e}")
+            return None
+
+        logger.info(
+            f"Profile saved: {name} ({sampler.sample_count} samples in {sampler.duration:.2f}s)"
+        )
+        self._prune()
+        return name
+
+    def _prune(self) -> None:
+        """Delete the captures beyond the newest max_captures."""
+        for capture in self.list_captures()[self.max_captures:]:
+            try:
+                os.remove(os.path.join(self.output_dir, capture["name"]))
+            except OSError:
+                # Another worker may have pruned it already
+                pass
+
+    def list_captures(self) -> List[Dict[str, Any]]:
+        """
+        List saved captures, newest first.
+
+        Returns:
+            List of dicts with name, size and creation time
+        """
+        if not os.path.isdir(self.output_dir):
+            return []
+
+        captures = []
+        for name in os.listdir(self.output_dir):
+            if not CAPTURE_NAME_PATTERN.match(name):
+                continue
+            stat = os.stat(os.path.join(self.output_dir, name))
+            captures.append({
+                "name": name,
+                "size_bytes": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
+        captures.sort(key=lambda c: c["created_at"], reverse=True)
+        return captures
+
+    @staticmethod
+    def is_valid_capture_name(name: str) -> bool:
+        """Check a capture name cannot escape the output directory."""
+        return bool(CAPTURE_NAME_PATTERN.match(name)) and '..' not in name
+
+
+# Global profiler instance
+profiler = Profiler()
@@ -6,6 +6,7 @@ from flask import request, jsonify, current_app
 import time
 from typing import Dict, List, Callable, Any
 import logging
+from app.extensions.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +105,7 @@ class RateLimiter:
                         f"Rate limit exceeded for {key}. "
                         f"Requests: {len(self.requests[key])}/{max_requests}"
                     )
+                    metrics.record_rate_limited(request.endpoint or 'unmatched')
                     return jsonify({
                         "error": "Rate limit exceeded",
                         "message": f"Maximum {max_requests} requests per {window} seconds",
@@ -10,18 +10,203 @@ except ImportError:
     redis = None
 
 import logging
-from typing import Any, Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 from flask import Flask
+from app.extensions.cache_stats import cache_stats
+from app.extensions.json_codec import json_codec
+from app.extensions.metrics import metrics
+from app.extensions.request_timing import request_timing
 
 logger = logging.getLogger(__name__)
 
+# Prefix of the sets holding the keys of each invalidation tag
+TAG_KEY_PREFIX = 'tag:'
+# Namespace tags (ns:<namespace>) are resolved by key pattern instead of a set
+NAMESPACE_TAG_PREFIX = 'ns:'
+
+# Message of the ConnectionError redis-py raises when no pooled connection frees up in time
+POOL_EXHAUSTED_MESSAGE = "No connection available."
+
+if REDIS_AVAILABLE:
+    class PoolExhausted(redis.ConnectionError):
+        """Raised when every pooled connection stays busy for REDIS_POOL_TIMEOUT (Redis itself is fine)."""
+
+    class _BlockingPool(redis.BlockingConnectionPool):
+        """Blocking pool telling a checkout timeout apart from a lost connection."""
+
+        def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+            try:
+                return super().get_connection(*args, **kwargs)
+            except redis.ConnectionError as e:
+                if str(e) == POOL_EXHAUSTED_MESSAGE:
+                    raise PoolExhausted(POOL_EXHAUSTED_MESSAGE) from e
+                raise
+
+# Marks queued commands whose results are left out of CachePipeline.results
+_BOOKKEEPING = object()
+
+# Read marker of pipelined list reads, whose elements are decoded one by one
+_LIST = object()
+
+
+def tag_key(tag: str) -> str:
+    """Key of the set holding the keys of an invalidation tag."""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+class CachePipeline:
+    """
+    Commands queued on a Redis pipeline, sent in one round-trip on execute.
+    
+    Values are encoded when queued and the results of ``get`` decoded on
+    execute, with the same codec as the single-key methods. Without a
+    Redis connection nothing is sent and every result is None.
+    """
+    
+    def __init__(self, pipeline: Optional[Any] = None, tag_ttl: int = 172800):
+        """Initialize pipeline."""
+        self._pipeline = pipeline
+        self.tag_ttl = tag_ttl
+        # Key of each queued get (None for other commands), to decode and count its result
+        self._reads: List[Any] = []
+        # Key and size of each queued set, by command index, counted once applied
+        self._fills: Dict[int, Tuple[str, int]] = {}
+        self.results: List[Any] = []
+    
+    def __len__(self) -> int:
+        """Number of queued commands."""
+        return len(self._reads)
+    
+    def _queue(self, command: str, *args: Any, read: Any = None) -> 'CachePipeline':
+        """Queue a command."""
+        if self._pipeline is not None:
+            getattr(self._pipeline, command)(*args)
+        self._reads.append(read)
+        return self
+    
+    def set(self, key: str, value: Any, expire: int = 3600, tags: Iterable[str] = ()) -> 'CachePipeline':
+        """
+        Queue setting a key-value pair with expiration time (in seconds).
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            expire: Expiration time in seconds
+            tags: Invalidation tags of the entry (e.g. uf:SP), see RedisClient.purge
+        """
+        encoded = RedisClient.encode(value)
+        self._fills[len(self._reads)] = (key, len(encoded))
+        self._queue('setex', key, expire, encoded)
+        for tag in tags:
+            # Tag sets outlive their entries; members that expired are skipped on purge
+            self._queue('sadd', tag_key(tag), key, read=_BOOKKEEPING)
+            self._queue('expire', tag_key(tag), max(expire, self.tag_ttl), read=_BOOKKEEPING)
+        return self
+    
+    def get(self, key: str) -> 'CachePipeline':
+        """Queue getting a value by key (its result is the decoded value or None)."""
+        return self._queue('get', key, read=key)
+    
+    def delete(self, *keys: str) -> 'CachePipeline':
+        """Queue deleting keys (its result is the number of keys deleted)."""
+        return self._queue('delete', *keys)
+    
+    def expire(self, key: str, expire: int) -> 'CachePipeline':
+        """Queue setting the time to live of a key (in seconds)."""
+        return self._queue('expire', key, expire)
+    
+    def ttl(self, key: str) -> 'CachePipeline':
+        """Queue getting the remaining time to live of a key."""
+        return self._queue('ttl', key)
+    
+    def incr(self, key: str, amount: int = 1, expire: Optional[int] = None) -> 'CachePipeline':
+        """Queue incrementing a counter, optionally refreshing its time to live (its result is the new value)."""
+        self._queue('incrby', key, amount)
+        if expire is not None:
+            self._queue('expire', key, expire, read=_BOOKKEEPING)
+        return self
+    
+    def push(self, key: str, values: List[Any], max_length: int, expire: int) -> 'CachePipeline':
+        """
+        Queue prepending values to a list capped at ``max_length`` entries, refreshing its time to live.
+        
+        Its result is the list length before trimming.
+        """
+        self._queue('lpush', key, *[RedisClient.encode(value) for value in values])
+        self._queue('ltrim', key, 0, max_length - 1, read=_BOOKKEEPING)
+        self._queue('expire', key, expire, read=_BOOKKEEPING)
+        return self
+    
+    def lrange(self, key: str, start: int = 0, stop: int = -1) -> 'CachePipeline':
+        """Queue reading a range of a list (its result is the decoded values, [] if missing)."""
+        return self._queue('lrange', key, start, stop, read=_LIST)
+    
+    def execute(self) -> List[Any]:
+        """
+        Send the queued commands.
+        
+        Returns:
+            One result per command, in order (None for failed commands)
+        """
+        if self._pipeline is None or not self._reads:
+            self.discard()
+            return self.results
+        
+        with request_timing.phase('cache'):
+            raw = self._pipeline.execute(raise_on_error=False)
+        results = []
+        for index, (read, value) in enumerate(zip(self._reads, raw)):
+            if read is _BOOKKEEPING:
+                continue
+            if isinstance(value, Exception):
+                logger.error(f"Error in cache pipeline: {value}")
+                value = None
+            if read is _LIST:
+                value = [RedisClient.decode(item) for item in value or []]
+            elif isinstance(read, str):
+                cache_stats.record_lookup(RedisClient.namespace(read), read, hit=bool(value))
+                value = RedisClient.decode(value) if value else None
+            elif value and index in self._fills:
+                key, size = self._fills[index]
+                cache_stats.record_fill(RedisClient.namespace(key), key, size)
+            results.append(value)
+        self.results = results
+        return results
+    
+    def discard(self) -> None:
+        """Set every result to None, as when the commands could not be sent."""
+        self.results = [None for read in self._reads if read is not _BOOKKEEPING]
+
 
 class RedisClient:
-    """Redis client wrapper for Flask applications."""
+    """
+    Redis client wrapper for Flask applications.
+    
+    Connections come from explicitly sized blocking pools (REDIS_POOL_SIZE,
+    waiting up to REDIS_POOL_TIMEOUT seconds for a free connection). When
+    Redis cannot be reached the cache is disabled and the connection is
+    retried lazily, on use, with exponential backoff, so a Redis restart
+    only disables caching until it is back.
+    """
     
     def __init__(self, app: Optional[Flask] = None):
         """Initialize Redis client."""
-        self.redis_client: Optional[Any] = None
+        self._client: Optional[Any] = None
+        # Second client without response decoding, for binary values
+        self._raw_client: Optional[Any] = None
+        self._available = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self._reconnect_lock = threading.Lock()
+        self.backoff_min = 1.0
+        self.backoff_max = 60.0
+        self.tag_ttl = 172800
+        self.purge_batch_size = 500
+        self.protected_namespaces: Tuple[str, ...] = ()
+        self._scripts: Dict[str, Any] = {}
         if app is not None:
             self.init_app(app)
     
@@ -29,38 +214,165 @@ class RedisClient:
         """Initialize Redis client with Flask app."""
         if not REDIS_AVAILABLE:
             logger.warning("Redis module not installed. Cache will be disabled.")
-            self.redis_client = None
+            self._client = None
+            self._raw_client = None
+            self._set_available(False)
             return
-            
-        try:
-            self.redis_client = redis.Redis(  # type: ignore
-                host=app.config.get('REDIS_HOST', 'localhost'),
-                port=app.config.get('REDIS_PORT', 6379),
-                db=app.config.get('REDIS_DB', 0),
-                password=app.config.get('REDIS_PASSWORD'),
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5
-            )
-            # Test connection
-            self.redis_client.ping()
+        
+        self.backoff_min = app.config.get('REDIS_RECONNECT_BACKOFF_MIN', 1.0)
+        self.backoff_max = app.config.get('REDIS_RECONNECT_BACKOFF_MAX', 60.0)
+        self.tag_ttl = app.config.get('CACHE_TAG_TTL', 172800)
+        self.purge_batch_size = app.config.get('CACHE_PURGE_BATCH_SIZE', 500)
+        self.protected_namespaces = tuple(
+            ns.strip() for ns in app.config.get('CACHE_PROTECTED_NAMESPACES', '').split(',') if ns.strip()
+        )
+        self._client = redis.Redis(connection_pool=self._create_pool(app, decode_responses=True))  # type: ignore
+        self._raw_client = redis.Redis(connection_pool=self._create_pool(app, decode_responses=False))  # type: ignore
+        self._failures = 0
+        self._retry_at = 0.0
+        self._available = False
+        # Test connection
+        if self._reconnect():
             logger.info("Successfully connected to Redis")
+    
+    @staticmethod
+    def _create_pool(app: Flask, decode_responses: bool) -> Any:
+        """Create a blocking connection pool from the app config."""
+        return _BlockingPool(
+            max_connections=app.config.get('REDIS_POOL_SIZE', 29),
+            timeout=app.config.get('REDIS_POOL_TIMEOUT', 2.0),
+            host=app.config.get('REDIS_HOST', 'localhost'),
+            port=app.config.get('REDIS_PORT', 6379),
+            db=app.config.get('REDIS_DB', 0),
+            password=app.config.get('REDIS_PASSWORD'),
+            decode_responses=decode_responses,
+            socket_connect_timeout=5,
+            socket_timeout=5
+        )
+    
+    @property
+    def redis_client(self) -> Optional[Any]:
+        """Client for JSON values, or None while Redis is unavailable."""
+        if self._available:
+            return self._client
+        if self._client is None or time.monotonic() < self._retry_at:
+            return None
+        return self._client if self._reconnect() else None
+    
+    @redis_client.setter
+    def redis_client(self, client: Optional[Any]) -> None:
+        """Use a client (considered available unless None)."""
+        self._client = client
+        self._available = client is not None
+    
+    @property
+    def raw_client(self) -> Optional[Any]:
+        """Client for binary values, or None while Redis is unavailable."""
+        return self._raw_client if self.redis_client is not None else None
+    
+    @raw_client.setter
+    def raw_client(self, client: Optional[Any]) -> None:
+        """Use a client for binary values."""
+        self._raw_client = client
+    
+    @property
+    def available(self) -> bool:
+        """Whether the cache is currently enabled (without attempting to reconnect)."""
+        return self._available
+    
+    def _reconnect(self) -> bool:
+        """Ping Redis to re-enable the cache, backing off exponentially on failure."""
+        # One thread probes; the others carry on without cache meanwhile
+        if not self._reconnect_lock.acquire(blocking=False):
+            return False
+        try:
+            if self._available:
+                return True
+            self._client.ping()
         except Exception as e:
-            logger.warning(f"Failed to connect to Redis: {e}. Cache will be disabled.")
-            self.redis_client = None
+            self._failures += 1
+            delay = min(self.backoff_max, self.backoff_min * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + delay
+            logger.warning(f"Failed to connect to Redis: {e}. Cache disabled, retrying in {delay:.0f}s.")
+            self._set_available(False)
+            return False
+        else:
+            if self._failures:
+                logger.info(f"Reconnected to Redis after {self._failures} failed attempts")
+            self._failures = 0
+            self._set_available(True)
+            return True
+        finally:
+            self._reconnect_lock.release()
+    
+    def _set_available(self, available: bool) -> None:
+        """Record whether the cache is enabled."""
+        self._available = available
+        metrics.set_cache_available(available)
+    
+    def _failed(self, e: Exception) -> None:
+        """
+        Disable the cache on connection errors until a reconnect succeeds.
+        
+        A busy pool is not a lost connection: that call just misses the cache.
+        """
+        if not REDIS_AVAILABLE or not isinstance(e, (redis.ConnectionError, redis.TimeoutError)):
+            return
+        if isinstance(e, PoolExhausted):
+            logger.warning("Redis connection pool exhausted, skipping the cache for this call")
+            return
+        if self._available:
+            logger.warning(f"Lost connection to Redis: {e}. Cache disabled.")
+            self._failures = 0
+            self._retry_at = time.monotonic() + self.backoff_min
+            self._set_available(False)
+    
+    def reset(self) -> None:
+        """
+        Drop the pooled connections, keeping the configuration.
+        
+        Call it in a forked process (see post_fork in gunicorn.conf.py) so
+        it opens its own connections instead of sharing the parent's sockets.
+        """
+        for client in (self._client, self._raw_client):
+            if client is not None:
+                client.connection_pool.reset()
+        self._available = False
+        self._failures = 0
+        self._retry_at = 0.0
+    
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        """Serialize a value for storage."""
+        return json_codec.dumps(value)
     
-    def set(self, key: str, value: Any, expire: int = 3600) -> bool:
-        """Set a key-value pair in cache with expiration time (in seconds)."""
+    @staticmethod
+    def decode(value: Union[bytes, str]) -> Any:
+        """Deserialize a stored value."""
+        return json_codec.loads(value)
+    
+    @staticmethod
+    def namespace(key: str) -> str:
+        """Get the cache namespace of a key (the prefix before the first colon)."""
+        return key.split(':', 1)[0]
+    
+    def set(self, key: str, value: Any, expire: int = 3600, tags: Iterable[str] = ()) -> bool:
+        """Set a key-value pair in cache with expiration time (in seconds) and optional invalidation tags."""
+        if tags:
+            return self.set_many({key: value}, expire, tags)
         if not self.redis_client:
             return False
             
         try:
-            import json
-            serialized_value = json.dumps(value)
-            result = self.redis_client.setex(key, expire, serialized_value)
+            serialized_value = self.encode(value)
+            with request_timing.phase('cache'):
+                result = self.redis_client.setex(key, expire, serialized_value)
+            if result:
+                cache_stats.record_fill(self.namespace(key), key, len(serialized_value))
             logger.debug(f"Cache set for key: {key}")
             return result
         except Exception as e:
+            self._failed(e)
             logger.error(f"Error setting cache for key {key}: {e}")
             return False
     
@@ -70,18 +382,148 @@ class RedisClient:
             return None
             
         try:
-            import json
-            value = self.redis_client.get(key)
+            with request_timing.phase('cache'):
+                value = self.redis_client.get(key)
+            cache_stats.record_lookup(self.namespace(key), key, hit=bool(value))
             if value:
                 logger.debug(f"Cache hit for key: {key}")
-                return json.loads(value)
+                return self.decode(value)
             else:
                 logger.debug(f"Cache miss for key: {key}")
                 return None
         except Exception as e:
+            self._failed(e)
             logger.error(f"Error getting cache for key {key}: {e}")
             return None
     
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values with a single MGET (None for missing keys, in key order)."""
+        if not self.redis_client or not keys:
+            return [None] * len(keys)
+        
+        try:
+            with request_timing.phase('cache'):
+                values = self.redis_client.mget(keys)
+            for key, value in zip(keys, values):
+                cache_stats.record_lookup(self.namespace(key), key, hit=bool(value))
+            return [self.decode(value) if value else None for value in values]
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error getting cache for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+    
+    def set_many(self, values: Mapping[str, Any], expire: Union[int, Mapping[str, int]] = 3600,
+                 tags: Iterable[str] = ()) -> bool:
+        """
+        Set several key-value pairs in one round-trip.
+        
+        Args:
+            values: Values by key
+            expire: Expiration time in seconds, for every key or by key
+            tags: Invalidation tags of every entry
+        
+        Returns:
+            True if every key was set
+        """
+        if not values:
+            return True
+        
+        tags = tuple(tags)
+        with self.pipeline() as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, expire if isinstance(expire, int) else expire[key], tags)
+        return all(pipe.results)
+    
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys with a single DEL and return how many existed."""
+        if not self.redis_client or not keys:
+            return 0
+        
+        try:
+            with request_timing.phase('cache'):
+                return self.redis_client.delete(*keys)
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error deleting cache for {len(keys)} keys: {e}")
+            return 0
+    
+    @contextmanager
+    def pipeline(self, transaction: bool = False) -> Iterator[CachePipeline]:
+        """
+        Queue commands and send them in one round-trip when the block exits.
+        
+        Results are available afterwards as ``pipe.results``. Nothing is
+        sent if the block raises.
+        
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC so they apply atomically
+        
+        Example:
+            with redis_client.pipeline() as pipe:
+                pipe.get(key).ttl(key)
+            value, ttl = pipe.results
+        """
+        redis_pipeline = None
+        if self.redis_client:
+            redis_pipeline = self.redis_client.pipeline(transaction=transaction)
+        pipe = CachePipeline(redis_pipeline, self.tag_ttl)
+        try:
+            yield pipe
+            try:
+                pipe.execute()
+            except Exception as e:
+                self._failed(e)
+                logger.error(f"Error executing cache pipeline of {len(pipe)} commands: {e}")
+                pipe.discard()
+        finally:
+            if redis_pipeline is not None:
+                redis_pipeline.reset()
+    
+    def set_bytes(self, key: str, value: bytes, expire: int = 3600, tags: Iterable[str] = ()) -> bool:
+        """Set a binary value in cache with expiration time (in seconds) and optional invalidation tags."""
+        if not self.raw_client:
+            return False
+            
+        try:
+            with request_timing.phase('cache'):
+                if not tags:
+                    return bool(self.raw_client.setex(key, expire, value))
+                pipe = self.raw_client.pipeline(transaction=False)
+                pipe.setex(key, expire, value)
+                for tag in tags:
+                    pipe.sadd(tag_key(tag), key)
+                    pipe.expire(tag_key(tag), max(expire, self.tag_ttl))
+                return bool(pipe.execute()[0])
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error setting binary cache for key {key}: {e}")
+            return False
+    
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a binary value by key from cache."""
+        if not self.raw_client:
+            return None
+            
+        try:
+            with request_timing.phase('cache'):
+                return self.raw_client.get(key)
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error getting binary cache for key {key}: {e}")
+            return None
+    
+    def ttl(self, key: str) -> int:
+        """Get the remaining time to live of a key in seconds (negative if missing or persistent)."""
+        if not self.redis_client:
+            return -2
+            
+        try:
+            return self.redis_client.ttl(key)
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error getting TTL for key {key}: {e}")
+            return -2
+    
     def delete(self, key: str) -> bool:
         """Delete a key from cache."""
         if not self.redis_client:
@@ -92,6 +534,7 @@ class RedisClient:
             logger.debug(f"Cache deleted for key: {key}")
             return result > 0
         except Exception as e:
+            self._failed(e)
             logger.error(f"Error deleting cache for key {key}: {e}")
             return False
     
@@ -103,22 +546,202 @@ class RedisClient:
         try:
             return self.redis_client.exists(key) > 0
         except Exception as e:
+            self._failed(e)
             logger.error(f"Error checking existence of key {key}: {e}")
             return False
     
+    def purge(self, tag: str, related: Optional[Callable[[str], Iterable[str]]] = None) -> int:
+        """
+        Delete every cache entry with an invalidation tag.
+        
+        Keys are collected incrementally (SSCAN over the tag set, or SCAN
+        over the key pattern for ``ns:<namespace>`` tags) and deleted with
+        UNLINK in batches of ``purge_batch_size``, so Redis frees the memory
+        in the background and keeps serving other clients in between.
+        
+        Args:
+            tag: Tag such as uf:SP, modalidade:6, data:202403 or ns:open_tenders
+            related: Keys stored alongside an entry (e.g. compressed variants),
+                deleted with it; not needed for namespace tags, whose pattern
+                already matches them
+        
+        Returns:
+            Number of keys deleted
+        """
+        if not self.redis_client:
+            return 0
+        
+        try:
+            if tag.startswith(NAMESPACE_TAG_PREFIX):
+                keys = self.redis_client.scan_iter(match=f"{tag[len(NAMESPACE_TAG_PREFIX):]}:*",
+                                                   count=self.purge_batch_size)
+                deleted = self._unlink_batches(keys)
+            else:
+                members = self.redis_client.sscan_iter(tag_key(tag), count=self.purge_batch_size)
+                deleted = self._unlink_batches(members, related)
+                self.redis_client.unlink(tag_key(tag))
+            logger.info(f"Cache purged for tag {tag}: {deleted} keys")
+            return deleted
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error purging cache for tag {tag}: {e}")
+            return 0
+    
+    def _unlink_batches(self, keys: Iterable[str],
+                        related: Optional[Callable[[str], Iterable[str]]] = None) -> int:
+        """UNLINK keys (and their related keys) in batches, returning how many existed."""
+        deleted = 0
+        batch: List[str] = []
+        for key in keys:
+            if self.namespace(key) in self.protected_namespaces:
+                continue
+            batch.append(key)
+            if related is not None:
+                batch.extend(related(key))
+            if len(batch) >= self.purge_batch_size:
+                deleted += self.redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += self.redis_client.unlink(*batch)
+        return deleted
+    
     def flush(self) -> bool:
-        """Clear all cache."""
+        """
+        Clear all cache entries.
+        
+        Unlike FLUSHDB, keys of CACHE_PROTECTED_NAMESPACES (rate limits,
+        locks and other state shared through this database) are kept, and
+        keys are deleted incrementally (see purge).
+        """
         if not self.redis_client:
             return False
             
         try:
-            self.redis_client.flushdb()
-            logger.info("Cache flushed")
+            deleted = self._unlink_batches(self.redis_client.scan_iter(count=self.purge_batch_size))
+            logger.info(f"Cache flushed: {deleted} keys")
             return True
         except Exception as e:
+            self._failed(e)
             logger.error(f"Error flushing cache: {e}")
             return False
     
+    def add_members(self, key: str, members: List[str], expire: int) -> List[str]:
+        """
+        Add members to a set, refreshing its expiration, in one round-trip.
+        
+        Returns:
+            The members that were not in the set yet (none while Redis is unavailable)
+        """
+        if not self.redis_client or not members:
+            return []
+            
+        try:
+            with request_timing.phase('cache'):
+                pipe = self.redis_client.pipeline(transaction=False)
+                for member in members:
+                    pipe.sadd(key, member)
+                pipe.expire(key, expire)
+                added = pipe.execute()[:-1]
+            return [member for member, new in zip(members, added) if new]
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error adding {len(members)} members to set {key}: {e}")
+            return []
+    
+    def members(self, key: str) -> List[str]:
+        """Get the members of a set (empty while Redis is unavailable)."""
+        if not self.redis_client:
+            return []
+            
+        try:
+            with request_timing.phase('cache'):
+                return list(self.redis_client.smembers(key))
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error reading set {key}: {e}")
+            return []
+    
+    def remove_members(self, key: str, members: List[str]) -> int:
+        """Remove members from a set and return how many were in it."""
+        if not self.redis_client or not members:
+            return 0
+            
+        try:
+            with request_timing.phase('cache'):
+                return self.redis_client.srem(key, *members)
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error removing {len(members)} members from set {key}: {e}")
+            return 0
+    
+    def publish(self, channel: str, message: Any) -> int:
+        """Publish a value on a pub/sub channel and return how many subscribers got it."""
+        if not self.redis_client:
+            return 0
+            
+        try:
+            return self.redis_client.publish(channel, self.encode(message))
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error publishing on channel {channel}: {e}")
+            return 0
+    
+    def pubsub(self) -> Optional[Any]:
+        """
+        Get a pub/sub connection (messages are decoded with ``decode``).
+        
+        It holds a pooled connection until closed, so keep one per process
+        and fan messages out locally.
+        """
+        if not self.redis_client:
+            return None
+        return self.redis_client.pubsub(ignore_subscribe_messages=True)
+    
+    def lock(self, name: str, timeout: float) -> Optional[Any]:
+        """
+        Get a distributed lock shared by every worker (redis-py ``Lock``).
+        
+        Args:
+            name: Lock key (use the protected ``lock:`` namespace)
+            timeout: Seconds until the lock expires unless extended
+        
+        Returns:
+            Lock, or None while Redis is unavailable
+        """
+        if not self.redis_client:
+            return None
+        return self.redis_client.lock(name, timeout=timeout, blocking=False)
+    
+    def run_script(self, source: str, keys: List[str], args: List[Any]) -> Optional[Any]:
+        """
+        Run a Lua script atomically on the server.
+        
+        Scripts are sent once and then called by SHA (EVALSHA), reloading
+        them if the server lost its script cache.
+        
+        Args:
+            source: Lua source of the script
+            keys: Keys the script touches (KEYS)
+            args: Script arguments (ARGV)
+        
+        Returns:
+            Reply of the script, or None while Redis is unavailable or on error
+        """
+        client = self.redis_client
+        if not client:
+            return None
+            
+        try:
+            script = self._scripts.get(source)
+            if script is None:
+                script = self._scripts[source] = client.register_script(source)
+            with request_timing.phase('cache'):
+                return script(keys=keys, args=args, client=client)
+        except Exception as e:
+            self._failed(e)
+            logger.error(f"Error running script on keys {keys}: {e}")
+            return None
+    
     def ping(self) -> bool:
         """Test Redis connection."""
         if not self.redis_client:
@@ -127,6 +750,7 @@ class RedisClient:
         try:
             return self.redis_client.ping()
         except Exception as e:
+            self._failed(e)
             logger.error(f"Error pinging Redis: {e}")
             return False
     
@@ -138,6 +762,7 @@ class RedisClient:
         try:
             return self.redis_client.info()
         except Exception as e:
+            self._failed(e)
             logger.error(f"Error getting Redis info: {e}")
             return {}
     
@@ -0,0 +1,146 @@
+"""
+Per-request phase timing extension for PNCP API Client.
+"""
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from flask import Flask, Response, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+# Dedicated logger for slow requests (configured in logging_config)
+slow_logger = logging.getLogger('app.slow_requests')
+
+# Human-readable descriptions for the Server-Timing header
+PHASE_DESCRIPTIONS = {
+    'cache': 'Redis cache',
+    'upstream': 'PNCP connect + TTFB',
+    'download': 'PNCP body download',
+    'parse': 'JSON parse',
+    'transform': 'Data transform',
+    'serialize': 'JSON serialize',
+    'compress': 'Response compression',
+}
+
+
+class RequestTiming:
+    """
+    Records how long each phase of a request takes.
+
+    Phases are accumulated in the request context and sent back in a
+    ``Server-Timing`` header. Requests slower than SLOW_REQUEST_THRESHOLD_MS
+    are written to the ``app.slow_requests`` logger with their breakdown.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize request timing."""
+        self.server_timing_enabled = True
+        self.slow_threshold_ms = 2000.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize request timing with Flask app."""
+        self.server_timing_enabled = app.config.get('SERVER_TIMING_ENABLED', True)
+        self.slow_threshold_ms = float(app.config.get('SLOW_REQUEST_THRESHOLD_MS', 2000))
+
+        app.json = TimedJSONProvider(app)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _before_request(self) -> None:
+        """Start the request clock."""
+        g.request_timings = {}
+        g.request_start_time = time.perf_counter()
+
+    def _after_request(self, response: Response) -> Response:
+        """Emit the Server-Timing header and the slow request log."""
+        if 'request_start_time' not in g:
+            return response
+
+        total_ms = (time.perf_counter() - g.request_start_time) * 1000
+        timings = g.request_timings
+
+        if self.server_timing_enabled:
+            response.headers['Server-Timing'] = self.format_header(timings, total_ms)
+
+        if total_ms >= self.slow_threshold_ms:
+            breakdown = " ".join(f"{name}={value:.1f}" for name, value in timings.items())
+            slow_logger.warning(
+                f"Slow request {request.method} {request.full_path} took {total_ms:.1f} ms ({breakdown})",
+                extra={
+                    'method': request.method,
+                    'path': request.path,
+                    'query': request.query_string.decode('utf-8', 'replace'),
+                    'endpoint': request.endpoint,
+                    'status': response.status_code,
+                    'duration_ms': round(total_ms, 2),
+                    'phases_ms': {name: round(value, 2) for name, value in timings.items()},
+                }
+            )
+
+        return response
+
+    @staticmethod
+    def format_header(timings: Dict[str, float], total_ms: float) -> str:
+        """
+        Format phase timings as a Server-Timing header value.
+
+        Args:
+            timings: Phase durations in milliseconds
+            total_ms: Total request duration in milliseconds
+
+        Returns:
+            Header value
+        """
+        metrics = []
+        for name, duration in timings.items():
+            description = PHASE_DESCRIPTIONS.get(name)
+            entry = f"{name};dur={duration:.2f}"
+            if description:
+                entry += f';desc="{description}"'
+            metrics.append(entry)
+        metrics.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(metrics)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        """
+        Add a duration to a phase of the current request.
+
+        Args:
+            name: Phase name
+            duration_ms: Duration in milliseconds
+        """
+        if not has_request_context() or 'request_timings' not in g:
+            return
+        g.request_timings[name] = g.request_timings.get(name, 0.0) + duration_ms
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a block of code as a phase of the current request.
+
+        Example:
+            with request_timing.phase('transform'):
+                stats = build_stats(data)
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start_time) * 1000)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that records response serialization as a request phase."""
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize data to a JSON response, timing the work."""
+        with request_timing.phase('serialize'):
+            return super().response(*args, **kwargs)
+
+
+# Global request timing instance
+request_timing = RequestTiming()
@@ -33,9 +33,15 @@ class AdvancedFilters {
         
         // Bind events
         this.bindEvents();
+        
+        // Searches saved on the server, with their new tenders
+        this.loadSavedSearches();
     }
     
     initMultiSelect() {
+        // Select2 is only loaded by pages with the multiple selections
+        if (!$.fn.select2) return;
+        
         // Multiple UF selection
         $('#multipleUf').select2({
             placeholder: "Selecione os estados",
@@ -262,6 +268,9 @@ class AdvancedFilters {
         delete apiFilters.valorMaximo; // API doesn't support this yet
         delete apiFilters.prazoMaximo; // API doesn't support this yet
         
+        // The results table only needs the listing fields
+        apiFilters.fields = 'list';
+        
         return apiFilters;
     }
     
@@ -376,25 +385,84 @@ class AdvancedFilters {
         $('#resultsInfo').empty();
     }
     
-    saveCurrentSearch() {
-        const searchData = {
-            filters: this.getCurrentFilters(),
-            timestamp: new Date().toISOString(),
-            name: prompt('Nome para esta pesquisa:') || `Pesquisa ${Date.now()}`
-        };
-        
-        // Save to localStorage
-        const savedSearches = JSON.parse(localStorage.getItem('savedSearches') || '[]');
-        savedSearches.unshift(searchData);
-        
-        // Keep only last 10 searches
-        if (savedSearches.length > 10) {
-            savedSearches.splice(10);
+    // Id of this browser, owner of its saved searches on the server
+    clientId() {
+        let id = localStorage.getItem('savedSearchClientId');
+        if (!id) {
+            id = window.crypto && crypto.randomUUID ? crypto.randomUUID() :
+                Date.now().toString(16) + Math.random().toString(16).slice(2);
+            localStorage.setItem('savedSearchClientId', id);
         }
+        return id;
+    }
+    
+    savedSearchRequest(method, endpoint, body) {
+        return $.ajax({
+            url: CONFIG.API_BASE + endpoint,
+            method: method,
+            headers: {'X-Client-Id': this.clientId()},
+            contentType: body ? 'application/json' : undefined,
+            data: body ? JSON.stringify(body) : undefined,
+            timeout: CONFIG.TIMEOUT
+        });
+    }
+    
+    saveCurrentSearch() {
+        const name = prompt('Nome para esta pesquisa:') || `Pesquisa ${new Date().toLocaleString('pt-BR')}`;
+        const filters = this.transformFiltersForAPI({
+            uf: $('#uf').val(),
+            codigoModalidadeContratacao: $('#codigoModalidadeContratacao').val(),
+            palavraChave: $('#palavraChave').val(),
+            estados: $('#multipleUf').val(),
+            modalidades: $('#multipleModalidades').val(),
+            palavrasChaveAvancada: $('#palavrasChaveAvancada').val()
+        });
         
-        localStorage.setItem('savedSearches', JSON.stringify(savedSearches));
-        
-        this.showToast('Pesquisa salva com sucesso!', 'success');
+        // Saved on the server, which counts the new tenders matching it
+        this.savedSearchRequest('POST', '/buscas', {
+            name: name,
+            filters: {
+                uf: filters.uf,
+                codigoModalidadeContratacao: filters.codigoModalidadeContratacao,
+                palavraChave: filters.palavraChave,
+                valorMinimo: this.parseCurrency($('#valorMinimo').val()),
+                valorMaximo: this.parseCurrency($('#valorMaximo').val())
+            }
+        })
+            .done(() => {
+                this.showToast('Pesquisa salva com sucesso!', 'success');
+                this.loadSavedSearches();
+            })
+            .fail((xhr) => {
+                const error = xhr.responseJSON ? xhr.responseJSON.error : xhr.statusText;
+                this.showToast('Não foi possível salvar a pesquisa: ' + error, 'danger');
+            });
+    }
+    
+    loadSavedSearches() {
+        const container = $('#savedSearchesList');
+        if (!container.length) return;
+        
+        this.savedSearchRequest('GET', '/buscas').done((searches) => {
+            container.empty();
+            searches.forEach((search) => {
+                const item = $(`
+                    <button type="button" class="list-group-item list-group-item-action d-flex justify-content-between align-items-center">
+                        <span></span>
+                        ${search.novas_count ? `<span class="badge bg-success rounded-pill">${search.novas_count} novas</span>` : ''}
+                    </button>
+                `);
+                item.find('span').first().text(search.name);
+                item.on('click', () => this.openSavedSearch(search));
+                container.append(item);
+            });
+        });
+    }
+    
+    openSavedSearch(search) {
+        // Resets the count of new tenders of the search
+        this.savedSearchRequest('POST', `/buscas/${search.id}/visto`).always(() => this.loadSavedSearches());
+        this.applyQuickFilter(search.filters);
     }
     
     getCurrentFilters() {
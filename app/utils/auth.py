@@ -0,0 +1,46 @@
+"""
+Admin authentication utilities for PNCP API Client.
+"""
+import hmac
+from functools import wraps
+from typing import Any, Callable
+from flask import current_app, jsonify, request
+
+
+def is_admin_request() -> bool:
+    """
+    Check whether the current request carries a valid admin token.
+
+    The token is sent in the ``X-Admin-Token`` header and compared with the
+    ADMIN_TOKEN setting. When ADMIN_TOKEN is not configured no request is
+    considered admin.
+
+    Returns:
+        True if the request is authenticated as admin
+    """
+    expected = current_app.config.get('ADMIN_TOKEN')
+    provided = request.headers.get('X-Admin-Token')
+    if not expected or not provided:
+        return False
+    return hmac.compare_digest(provided.encode('utf-8'), expected.encode('utf-8'))
+
+
+def admin_required(f: Callable) -> Callable:
+    """
+    Decorator restricting an endpoint to admin requests.
+
+    Example:
+        @admin_bp.route('/endpoint')
+        @admin_required
+        def my_endpoint():
+            return jsonify({"data": "value"})
+    """
+    @wraps(f)
+    def wrapped(*args: Any, **kwargs: Any) -> Any:
+        if not current_app.config.get('ADMIN_TOKEN'):
+            return jsonify({"error": "Admin API is disabled"}), 404
+        if not is_admin_request():
+            return jsonify({"error": "Invalid or missing admin token"}), 403
+        return f(*args, **kwargs)
+
+    return wrapped
@@ -1,20 +1,29 @@
 """
 Health check utilities for PNCP API Client.
 """
+import os
 import time
-import requests
+import logging
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Deque, Dict, Optional, Tuple
+import requests
+from flask import Flask
 from app.extensions import redis_client
 from app.config.settings import config
+from app.core.services.upstream import upstream_client
+from app.extensions.outbound_governor import WARMER, UpstreamThrottled
 
 # Get configuration
 current_config = config['default']()
 
+logger = logging.getLogger(__name__)
+
 
 class HealthChecker:
     """Health check utilities."""
-    
+
     @staticmethod
     def check_redis_health() -> Dict[str, Any]:
         """Check Redis connection health."""
@@ -22,7 +31,7 @@ class HealthChecker:
             start_time = time.time()
             is_connected = redis_client.ping()
             response_time = (time.time() - start_time) * 1000  # Convert to ms
-            
+
             if is_connected:
                 return {
                     "status": "healthy",
@@ -41,17 +50,22 @@ class HealthChecker:
                 "error": str(e),
                 "connection": "failed"
             }
-    
+
     @staticmethod
-    def check_pncp_api_health() -> Dict[str, Any]:
-        """Check PNCP API health."""
+    def check_pncp_api_health(timeout: float = 5) -> Dict[str, Any]:
+        """
+        Check PNCP API health.
+
+        The check is background work, so it runs in the warmer class of the
+        outbound budget and yields to user traffic; when the budget refuses
+        it the status is "throttled", which says nothing about PNCP.
+        """
         try:
             start_time = time.time()
-            # Use the licitacoes endpoint which is more reliable
-            url = f"{current_config.API_BASE}/pncp/v1/orgaos/siafi"
-            response = requests.get(url, timeout=5)
+            url = f"{current_config.PNCP_API_BASE}/v1/orgaos/siafi"
+            response = upstream_client.get(url, "/v1/orgaos/siafi", timeout=timeout, priority=WARMER)
             response_time = (time.time() - start_time) * 1000
-            
+
             return {
                 "status": "healthy" if response.status_code == 200 else "degraded",
                 "response_time_ms": round(response_time, 2),
@@ -61,7 +75,13 @@ class HealthChecker:
         except requests.exceptions.Timeout:
             return {
                 "status": "timeout",
-                "error": "Request timeout after 5 seconds",
+                "error": f"Request timeout after {timeout} seconds",
+                "last_check": datetime.now().isoformat()
+            }
+        except UpstreamThrottled:
+            return {
+                "status": "throttled",
+                "error": "Outbound request budget in use by user traffic",
                 "last_check": datetime.now().isoformat()
             }
         except Exception as e:
@@ -70,35 +90,27 @@ class HealthChecker:
                 "error": str(e),
                 "last_check": datetime.now().isoformat()
             }
-    
+
     @staticmethod
     def get_cache_statistics() -> Dict[str, Any]:
         """Get cache performance statistics."""
         try:
-            # Check if Redis is connected first
-            if not redis_client.is_connected():
-                return {
-                    "error": "Redis not connected",
-                    "hit_ratio": 0,
-                    "status": "disconnected"
-                }
-            
-            # Get basic Redis info
+            # A single INFO call doubles as the connectivity check
             info = redis_client.info()
-            
+
             if not info:
                 return {
-                    "error": "Could not retrieve Redis info",
+                    "error": "Redis not connected",
                     "hit_ratio": 0,
-                    "status": "error"
+                    "status": "disconnected"
                 }
-            
+
             # Calculate hit ratio
             hits = info.get('keyspace_hits', 0)
             misses = info.get('keyspace_misses', 0)
             total_operations = hits + misses
             hit_ratio = round((hits / max(total_operations, 1)) * 100, 2)
-            
+
             return {
                 "connected_clients": info.get('connected_clients', 0),
                 "used_memory_human": info.get('used_memory_human', 'N/A'),
@@ -113,26 +125,28 @@ class HealthChecker:
                 "hit_ratio": 0,
                 "status": "error"
             }
-    
+
+    @staticmethod
+    def overall_status(redis_health: Dict[str, Any], api_health: Dict[str, Any]) -> str:
+        """Combine the service checks into the overall system status."""
+        if redis_health["status"] == "unhealthy" and api_health["status"] in ["unhealthy", "timeout"]:
+            return "critical"
+        if redis_health["status"] == "unhealthy" or api_health["status"] in ["degraded", "timeout"]:
+            return "degraded"
+        if api_health["status"] == "unhealthy":
+            return "unhealthy"
+        return "healthy"
+
     @staticmethod
     def get_system_health() -> Dict[str, Any]:
         """Get comprehensive system health status."""
         redis_health = HealthChecker.check_redis_health()
         api_health = HealthChecker.check_pncp_api_health()
         cache_stats = HealthChecker.get_cache_statistics()
-        
-        # Determine overall system status
-        overall_status = "healthy"
-        if redis_health["status"] == "unhealthy" and api_health["status"] in ["unhealthy", "timeout"]:
-            overall_status = "critical"
-        elif redis_health["status"] == "unhealthy" or api_health["status"] in ["degraded", "timeout"]:
-            overall_status = "degraded"
-        elif api_health["status"] == "unhealthy":
-            overall_status = "unhealthy"
-        
+
         return {
             "timestamp": datetime.now().isoformat(),
-            "overall_status": overall_status,
+            "overall_status": HealthChecker.overall_status(redis_health, api_health),
             "services": {
                 "redis": redis_health,
                 "pncp_api": api_health
@@ -142,4 +156,192 @@ class HealthChecker:
                 "version": "1.0.0",
                 "environment": current_config.__class__.__name__.lower()
             }
-        }
\ No newline at end of file
+        }
+
+
+class LatencyWindow:
+    """Rolling window of the most recent probe results of one service."""
+
+    def __init__(self, size: int = 20):
+        """
+        Initialize window.
+
+        Args:
+            size: Number of probe results kept
+        """
+        self._results: Deque[Tuple[Optional[float], bool]] = deque(maxlen=size)
+
+    def add(self, latency_ms: Optional[float], ok: bool) -> None:
+        """Record one probe result (latency is None when the probe failed early)."""
+        self._results.append((latency_ms, ok))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the window.
+
+        Returns:
+            Dict with sample count, success ratio and latency percentiles
+        """
+        results = list(self._results)
+        latencies = sorted(latency for latency, _ in results if latency is not None)
+        summary: Dict[str, Any] = {
+            "samples": len(results),
+            "success_ratio": round(sum(1 for _, ok in results if ok) / len(results), 3) if results else None
+        }
+        if latencies:
+            summary.update({
+                "p50_ms": latencies[int(0.50 * (len(latencies) - 1))],
+                "p95_ms": latencies[int(round(0.95 * (len(latencies) - 1)))],
+                "max_ms": latencies[-1]
+            })
+        return summary
+
+
+class HealthProber:
+    """
+    Background health prober.
+
+    Probes Redis and the PNCP API on a fixed interval from a daemon thread
+    and keeps the last result plus rolling latency windows in memory, so
+    health endpoints never wait on a dependency. The thread is started
+    lazily in each worker process (threads do not survive gunicorn's fork).
+
+    With HEALTH_PROBE_ENABLED off no thread is started and the snapshot is
+    refreshed synchronously once it is older than the interval.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Initialize prober."""
+        self.enabled = True
+        self.interval = 15.0
+        self.timeout = 5.0
+        self.window_size = 20
+        self._windows: Dict[str, LatencyWindow] = {}
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize prober with Flask app."""
+        self.enabled = app.config.get('HEALTH_PROBE_ENABLED', True)
+        self.interval = float(app.config.get('HEALTH_PROBE_INTERVAL_SECONDS', 15))
+        self.timeout = float(app.config.get('HEALTH_PROBE_TIMEOUT_SECONDS', 5))
+        self.window_size = int(app.config.get('HEALTH_PROBE_WINDOW', 20))
+        self._windows = {
+            "redis": LatencyWindow(self.window_size),
+            "pncp_api": LatencyWindow(self.window_size)
+        }
+
+        if self.enabled:
+            app.before_request(self.ensure_started)
+
+    def ensure_started(self) -> None:
+        """Start the probe thread if this process does not have one yet."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop_event = threading.Event()
+            thread = threading.Thread(target=self._run, name='health-prober', daemon=True)
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop the probe thread of this process."""
+        self._stop_event.set()
+        self._pid = None
+
+    def _run(self) -> None:
+        """Probe loop."""
+        stop_event = self._stop_event
+        while not stop_event.is_set():
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error(f"Health probe failed: {e}")
+            stop_event.wait(self.interval)
+
+    def probe(self) -> Dict[str, Any]:
+        """
+        Run all checks once and publish a new snapshot.
+
+        Returns:
+            The new snapshot
+        """
+        redis_health = HealthChecker.check_redis_health()
+        api_health = HealthChecker.check_pncp_api_health(self.timeout)
+        cache_stats = (HealthChecker.get_cache_statistics() if redis_health["status"] == "healthy"
+                       else {"error": "Redis not connected", "hit_ratio": 0, "status": "disconnected"})
+
+        previous = self._snapshot
+        if api_health["status"] == "throttled" and previous is not None:
+            # A check refused by the outbound budget did not reach PNCP: keep the last result
+            api_health = {**previous["services"]["pncp_api"], "throttled_at": api_health["last_check"]}
+        elif api_health["status"] != "throttled":
+            self._windows["pncp_api"].add(api_health.get("response_time_ms"), api_health["status"] == "healthy")
+        self._windows["redis"].add(redis_health.get("response_time_ms"), redis_health["status"] == "healthy")
+        redis_health["window"] = self._windows["redis"].summary()
+        api_health["window"] = self._windows["pncp_api"].summary()
+
+        snapshot = {
+            "timestamp": datetime.now().isoformat(),
+            "overall_status": HealthChecker.overall_status(redis_health, api_health),
+            "services": {
+                "redis": redis_health,
+                "pncp_api": api_health
+            },
+            "cache": cache_stats,
+            "system_info": {
+                "version": "1.0.0",
+                "environment": current_config.__class__.__name__.lower(),
+                "probe_interval_seconds": self.interval
+            }
+        }
+        # Publishing is a single reference swap, readers never see a partial snapshot
+        self._snapshot = snapshot
+        self._checked_at = time.time()
+        return snapshot
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest probe results.
+
+        Returns:
+            Snapshot dict with its age in seconds, or None before the first probe
+        """
+        if not self.enabled and time.time() - self._checked_at >= self.interval:
+            self.probe()
+
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return {**snapshot, "age_seconds": round(time.time() - self._checked_at, 3)}
+
+    def is_ready(self) -> Tuple[bool, str]:
+        """
+        Readiness to serve traffic.
+
+        Ready once a probe has completed, the results are fresh (the probe
+        thread is alive) and at least one data source (cache or PNCP API) is
+        usable.
+
+        Returns:
+            Tuple of (ready, reason)
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return False, "no health probe completed yet"
+        if self.enabled and snapshot["age_seconds"] > 3 * self.interval + self.timeout:
+            return False, "health probe results are stale"
+        if snapshot["overall_status"] == "critical":
+            return False, "Redis and PNCP API are unavailable"
+        return True, snapshot["overall_status"]
+
+
+# Global health prober instance
+health_prober = HealthProber()
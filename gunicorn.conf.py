@@ -1,4 +1,5 @@
 # Gunicorn configuration for PNCP API Client
+import glob
 import multiprocessing
 import os
 
@@ -7,7 +8,10 @@ bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
 
 # Workers and threads
 workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
-threads = int(os.getenv("GUNICORN_THREADS", 2))
+# Threads per worker: enough for the live feed streams (TENDER_FEED_MAX_CLIENTS)
+# plus the upstream-bound slots and their queue (ADMISSION_MAX_CONCURRENT +
+# ADMISSION_QUEUE_SIZE), with some left over for health checks and pages
+threads = int(os.getenv("GUNICORN_THREADS", 16))
 worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
 
 # Timeouts and keepalive
@@ -32,3 +36,28 @@ proxy_protocol = False
 
 # Preload app for faster worker spawn (ensure app is preload-safe)
 preload_app = True
+
+
+# Prometheus multiprocess mode: every worker writes its samples to this
+# directory and /metrics aggregates them. It must be set before the app is
+# preloaded, and is wiped on startup so dead workers from a previous run
+# do not leak into the totals.
+prometheus_multiproc_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/pncp_prometheus")
+os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+for stale_file in glob.glob(os.path.join(prometheus_multiproc_dir, "*.db")):
+    os.remove(stale_file)
+
+
+def post_fork(server, worker):
+    """Give each worker its own Redis connections instead of the preloaded app's sockets."""
+    from app.extensions.redis_client import redis_client
+    redis_client.reset()
+
+
+def child_exit(server, worker):
+    """Drop live gauges of exited workers from the aggregated metrics."""
+    try:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+    except ImportError:
+        pass
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Static asset build for PNCP API Client.
+
+Minifies the bundles below, names each output after a hash of its content
+(``main.3f2a9c1b7d4e.js``), writes gzip and brotli precompressed copies next
+to it and records the logical name -> file mapping in
+``app/static/dist/manifest.json``. Templates reference the bundles through
+the ``asset_url`` helper, which falls back to the raw files (or the CDN for
+third-party libraries) when no build is present.
+
+Usage:
+    python scripts/build_assets.py            # build app/static/dist
+    python scripts/build_assets.py --vendor   # also download and bundle jQuery, Bootstrap and Chart.js
+    python scripts/build_assets.py --clean    # remove files of previous builds
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import urllib.request
+
+# Optional minifiers and brotli (a conservative fallback is used without them)
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+STATIC_DIR = os.path.join(ROOT_DIR, 'app', 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_FILE = os.path.join(DIST_DIR, 'manifest.json')
+
+# Logical bundle name -> source files (relative to app/static), concatenated in order
+BUNDLES = {
+    'main.js': ['js/main.js'],
+    'advanced-filters.js': ['js/advanced-filters.js'],
+}
+
+# Third-party libraries, pinned to the versions the templates load from the CDN
+VENDOR_BUNDLES = {
+    'bootstrap.css': ('vendor/bootstrap-5.3.0.min.css',
+                      'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css'),
+    'bootstrap.js': ('vendor/bootstrap-5.3.0.bundle.min.js',
+                     'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js'),
+    'jquery.js': ('vendor/jquery-3.6.0.min.js', 'https://code.jquery.com/jquery-3.6.0.min.js'),
+    'chart.js': ('vendor/chart-4.4.0.umd.min.js',
+                 'https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js'),
+}
+
+HASH_LENGTH = 12
+
+
+def download_vendor():
+    """Download the pinned third-party libraries into app/static/vendor (failures fall back to the CDN)."""
+    for source, url in VENDOR_BUNDLES.values():
+        path = os.path.join(STATIC_DIR, source)
+        if os.path.exists(path):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        print(f"Downloading {url}")
+        try:
+            with urllib.request.urlopen(url, timeout=60) as response:
+                data = response.read()
+        except OSError as e:
+            # The templates keep loading this library from the CDN
+            print(f"Could not download {url}: {e}")
+            continue
+        with open(path, 'wb') as fh:
+            fh.write(data)
+
+
+def minify_js(source):
+    """Minify JavaScript (line-based fallback without rjsmin)."""
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    lines = []
+    for line in source.splitlines():
+        stripped = line.strip()
+        # Only whole-line comments are dropped: inline ones may sit inside strings
+        if stripped and not stripped.startswith('//'):
+            lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+def minify_css(source):
+    """Minify CSS (comment and whitespace removal without rcssmin)."""
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    return '\n'.join(line.strip() for line in source.splitlines() if line.strip()) + '\n'
+
+
+def build_bundle(name, sources):
+    """
+    Build one bundle.
+
+    Args:
+        name: Logical bundle name (e.g. ``main.js``)
+        sources: Source files relative to app/static
+
+    Returns:
+        File name of the built bundle
+    """
+    parts = []
+    for source in sources:
+        with open(os.path.join(STATIC_DIR, source), 'r', encoding='utf-8') as fh:
+            content = fh.read()
+        if '.min.' not in source:
+            content = minify_js(content) if name.endswith('.js') else minify_css(content)
+        parts.append(content)
+    data = ('\n' if name.endswith('.css') else ';\n').join(parts).encode('utf-8')
+
+    stem, extension = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    filename = f"{stem}.{digest}{extension}"
+    path = os.path.join(DIST_DIR, filename)
+
+    with open(path, 'wb') as fh:
+        fh.write(data)
+    # mtime=0 keeps the gzip output reproducible between builds
+    with open(path + '.gz', 'wb') as fh:
+        fh.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as fh:
+            fh.write(brotli.compress(data, quality=11))
+
+    print(f"{name:22} -> {filename} ({len(data)} bytes)")
+    return filename
+
+
+def clean(manifest):
+    """Remove files of previous builds that the manifest no longer references."""
+    keep = {'manifest.json'}
+    for filename in manifest.values():
+        keep.update({filename, filename + '.gz', filename + '.br'})
+    for filename in os.listdir(DIST_DIR):
+        if filename not in keep:
+            os.remove(os.path.join(DIST_DIR, filename))
+            print(f"Removed {filename}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Build fingerprinted static asset bundles")
+    parser.add_argument('--vendor', action='store_true',
+                        help="Download and bundle the third-party libraries instead of using the CDN")
+    parser.add_argument('--clean', action='store_true', help="Remove files of previous builds")
+    args = parser.parse_args()
+
+    bundles = dict(BUNDLES)
+    if args.vendor:
+        download_vendor()
+    for name, (source, _) in VENDOR_BUNDLES.items():
+        if os.path.exists(os.path.join(STATIC_DIR, source)):
+            bundles[name] = [source]
+
+    os.makedirs(DIST_DIR, exist_ok=True)
+    manifest = {name: build_bundle(name, sources) for name, sources in bundles.items()}
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+    print(f"Manifest with {len(manifest)} bundles written to {MANIFEST_FILE}")
+
+    if args.clean:
+        clean(manifest)
+    if brotli is None:
+        print("brotli not installed: only gzip variants were written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for PNCP API Client.
+
+Starts the mock PNCP upstream (scripts/mock_pncp_server.py) and the real
+application (wsgi.py under gunicorn.conf.py) pointed at it, then drives
+mixed traffic scenarios. For every scenario it reports throughput, latency
+percentiles, status codes, cache hit ratio (from /metrics) and upstream call
+counts (from the mock server).
+
+Usage:
+    python scripts/load_test.py                                 # all scenarios, 30s each
+    python scripts/load_test.py --scenario browse --duration 60 --concurrency 32
+    python scripts/load_test.py --mock-latency-ms 800 --mock-error-rate 0.05
+    python scripts/load_test.py --target http://localhost:8000 --mock-url http://localhost:9100
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import requests
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+UFS = ['SP', 'RJ', 'MG', 'BA', 'RS', 'PR', 'PE', 'CE', 'SC', 'GO', 'DF', 'AM']
+MODALIDADES = ['6', '8', '1', '12', '7']
+
+METRIC_LINE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)\{(?P<labels>[^}]*)\} (?P<value>\S+)$')
+LABEL_PAIR = re.compile(r'(\w+)="([^"]*)"')
+
+
+def hot(values, rng):
+    """Pick from values with a skewed (Zipf-like) popularity."""
+    weights = [1 / (rank + 1) for rank in range(len(values))]
+    return rng.choices(values, weights=weights)[0]
+
+
+def open_tenders_request(rng):
+    """Listing request with popular filter combinations."""
+    params = {'pagina': hot(['1', '2', '3', '4', '5'], rng), 'tamanhoPagina': '10'}
+    if rng.random() < 0.7:
+        params['uf'] = hot(UFS, rng)
+    if rng.random() < 0.4:
+        params['codigoModalidadeContratacao'] = hot(MODALIDADES, rng)
+    return 'licitacoes_abertas', '/api/licitacoes/abertas', params
+
+
+def cold_tenders_request(rng):
+    """Listing request that always misses the cache."""
+    return 'licitacoes_abertas_cold', '/api/licitacoes/abertas', {
+        'pagina': str(rng.randint(1, 400)),
+        'tamanhoPagina': str(rng.choice([10, 20, 50])),
+        'uf': rng.choice(UFS),
+        'palavraChave': f"item{rng.randint(0, 10 ** 6)}"
+    }
+
+
+def stats_request(rng):
+    """One of the statistics endpoints."""
+    name = rng.choice(['modalidades', 'uf', 'tipo_orgao', 'contratos', 'atas', 'planos'])
+    return f"estatisticas_{name}", f"/api/estatisticas/{name}", {}
+
+
+def health_request(rng):
+    """Health check."""
+    return 'health', '/api/health', {}
+
+
+def page_request(rng):
+    """Server-rendered page."""
+    name, path = rng.choice([('page_index', '/'), ('page_licitacoes', '/licitacoes'),
+                             ('page_estatisticas', '/estatisticas')])
+    return name, path, {}
+
+
+# Scenario name -> list of (weight, request builder)
+SCENARIOS = {
+    'browse': [(1.0, open_tenders_request)],
+    'dashboard': [(1.0, stats_request)],
+    'cold': [(1.0, cold_tenders_request)],
+    'mixed': [
+        (0.55, open_tenders_request),
+        (0.25, stats_request),
+        (0.05, cold_tenders_request),
+        (0.10, page_request),
+        (0.05, health_request),
+    ],
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def scrape_metrics(target):
+    """
+    Read cache and upstream counters from the app's /metrics endpoint.
+
+    Returns:
+        Dict with ``cache`` (Counter of result) and ``upstream`` (Counter of endpoint)
+    """
+    cache = Counter()
+    upstream = Counter()
+    try:
+        response = requests.get(f"{target}/metrics", timeout=10)
+    except requests.exceptions.RequestException:
+        return {"cache": cache, "upstream": upstream}
+    if response.status_code != 200:
+        return {"cache": cache, "upstream": upstream}
+
+    for line in response.text.splitlines():
+        match = METRIC_LINE.match(line)
+        if not match:
+            continue
+        labels = dict(LABEL_PAIR.findall(match.group('labels')))
+        value = float(match.group('value'))
+        if match.group('name') == 'pncp_cache_requests_total':
+            cache[labels.get('result', 'unknown')] += value
+        elif match.group('name') == 'pncp_upstream_requests_total':
+            upstream[labels.get('endpoint', 'unknown')] += value
+    return {"cache": cache, "upstream": upstream}
+
+
+def mock_stats(mock_url):
+    """Read per-path call counts from the mock server."""
+    if not mock_url:
+        return Counter()
+    try:
+        return Counter(requests.get(f"{mock_url}/__stats", timeout=5).json().get('calls', {}))
+    except (requests.exceptions.RequestException, ValueError):
+        return Counter()
+
+
+def run_scenario(name, target, duration, concurrency, seed):
+    """
+    Drive one scenario against the target.
+
+    Returns:
+        List of (operation, latency_seconds, status) samples and the elapsed time
+    """
+    weights, builders = zip(*SCENARIOS[name])
+    samples = []
+    samples_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        session = requests.Session()
+        local = []
+        while time.perf_counter() < deadline:
+            operation, path, params = rng.choices(builders, weights=weights)[0](rng)
+            start = time.perf_counter()
+            try:
+                response = session.get(f"{target}{path}", params=params, timeout=60)
+                response.content
+                status = str(response.status_code)
+            except requests.exceptions.RequestException as e:
+                status = type(e).__name__
+            local.append((operation, time.perf_counter() - start, status))
+        with samples_lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def summarize(name, samples, elapsed, metrics_before, metrics_after, mock_before, mock_after):
+    """Build the report of one scenario."""
+    latencies = sorted(latency for _, latency, _ in samples)
+    statuses = Counter(status for _, _, status in samples)
+    hits = metrics_after["cache"]["hit"] - metrics_before["cache"]["hit"]
+    misses = metrics_after["cache"]["miss"] - metrics_before["cache"]["miss"]
+    lookups = hits + misses
+
+    if mock_after or mock_before:
+        upstream = mock_after - mock_before
+    else:
+        upstream = metrics_after["upstream"] - metrics_before["upstream"]
+
+    by_operation = defaultdict(list)
+    for operation, latency, _ in samples:
+        by_operation[operation].append(latency)
+
+    return {
+        "scenario": name,
+        "requests": len(samples),
+        "duration_s": round(elapsed, 2),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p90": round(percentile(latencies, 0.90) * 1000, 2),
+            "p95": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0
+        },
+        "status_codes": dict(statuses),
+        "cache_hit_ratio": round(hits / lookups, 4) if lookups else None,
+        "cache_lookups": int(lookups),
+        "upstream_calls": {path: int(count) for path, count in sorted(upstream.items()) if count},
+        "operations": {
+            operation: {
+                "requests": len(values),
+                "p50_ms": round(percentile(sorted(values), 0.50) * 1000, 2),
+                "p95_ms": round(percentile(sorted(values), 0.95) * 1000, 2)
+            }
+            for operation, values in sorted(by_operation.items())
+        }
+    }
+
+
+def print_report(report):
+    """Print one scenario report as text."""
+    latency = report["latency_ms"]
+    ratio = report["cache_hit_ratio"]
+    print(f"\n=== Scenario: {report['scenario']} ===")
+    print(f"Requests:        {report['requests']} in {report['duration_s']}s "
+          f"({report['throughput_rps']} req/s)")
+    print(f"Latency (ms):    p50={latency['p50']} p90={latency['p90']} p95={latency['p95']} "
+          f"p99={latency['p99']} max={latency['max']}")
+    print(f"Status codes:    {', '.join(f'{k}={v}' for k, v in sorted(report['status_codes'].items()))}")
+    print(f"Cache hit ratio: {'n/a' if ratio is None else f'{ratio:.1%}'} "
+          f"({report['cache_lookups']} lookups)")
+    print(f"Upstream calls:  {sum(report['upstream_calls'].values())}")
+    for path, count in report["upstream_calls"].items():
+        print(f"  {path:55} {count}")
+    print(f"{'Operation':35} {'Requests':>9} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for operation, stats in report["operations"].items():
+        print(f"{operation:35} {stats['requests']:>9} {stats['p50_ms']:>10} {stats['p95_ms']:>10}")
+
+
+def wait_until_ready(url, timeout=60):
+    """Poll a URL until it answers."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=2)
+            return True
+        except requests.exceptions.RequestException:
+            time.sleep(0.25)
+    return False
+
+
+def start_mock(args, log_file):
+    """Start the mock PNCP server."""
+    command = [
+        sys.executable, os.path.join(ROOT_DIR, 'scripts', 'mock_pncp_server.py'),
+        '--port', str(args.mock_port),
+        '--latency', args.mock_latency,
+        '--latency-ms', str(args.mock_latency_ms),
+        '--jitter-ms', str(args.mock_jitter_ms),
+        '--error-rate', str(args.mock_error_rate),
+        '--text-size', str(args.mock_text_size),
+    ]
+    return subprocess.Popen(command, cwd=ROOT_DIR, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def start_app(args, mock_url, log_file):
+    """Start the application under gunicorn with the repo's configuration."""
+    env = dict(os.environ)
+    env.update({
+        'PNCP_API_BASE': f"{mock_url}/api/pncp",
+        'CONSULTA_API_BASE': f"{mock_url}/api/consulta",
+        'GUNICORN_BIND': f"127.0.0.1:{args.port}",
+        'GUNICORN_WORKERS': str(args.workers),
+        'GUNICORN_LOGLEVEL': 'warning',
+    })
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application']
+    return subprocess.Popen(command, cwd=ROOT_DIR, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def stop(process):
+    """Terminate a child process."""
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def build_parser():
+    """Command line options."""
+    parser = argparse.ArgumentParser(description="End-to-end load test for PNCP API Client")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds per scenario (default: 30)")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent clients (default: 16)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="Write the reports as JSON to this file")
+    parser.add_argument('--log-file', default='load_test.log', help="Where to write server output")
+
+    target = parser.add_argument_group('application')
+    target.add_argument('--target', help="Use an already running app instead of starting gunicorn")
+    target.add_argument('--port', type=int, default=8100, help="Port for the started app (default: 8100)")
+    target.add_argument('--workers', type=int, default=4, help="Gunicorn workers (default: 4)")
+
+    mock = parser.add_argument_group('mock upstream')
+    mock.add_argument('--mock-url', help="Use an already running mock server")
+    mock.add_argument('--mock-port', type=int, default=9100)
+    mock.add_argument('--mock-latency', default='lognormal',
+                      choices=['fixed', 'uniform', 'normal', 'exponential', 'lognormal'])
+    mock.add_argument('--mock-latency-ms', type=float, default=200)
+    mock.add_argument('--mock-jitter-ms', type=float, default=150)
+    mock.add_argument('--mock-error-rate', type=float, default=0.0)
+    mock.add_argument('--mock-text-size', type=int, default=200)
+    return parser
+
+
+def main():
+    """Main entry point."""
+    args = build_parser().parse_args()
+    scenarios = args.scenario or ['browse', 'dashboard', 'cold', 'mixed']
+
+    mock_process = app_process = None
+    log_file = open(os.path.join(ROOT_DIR, args.log_file), 'ab')
+    try:
+        mock_url = args.mock_url
+        if not mock_url:
+            mock_url = f"http://127.0.0.1:{args.mock_port}"
+            mock_process = start_mock(args, log_file)
+            if not wait_until_ready(f"{mock_url}/__stats"):
+                print("Mock PNCP server did not start")
+                return 1
+
+        target = args.target
+        if not target:
+            target = f"http://127.0.0.1:{args.port}"
+            app_process = start_app(args, mock_url, log_file)
+            if not wait_until_ready(f"{target}/api/test"):
+                print(f"Application did not start, see {args.log_file}")
+                return 1
+
+        reports = []
+        for index, name in enumerate(scenarios):
+            metrics_before, mock_before = scrape_metrics(target), mock_stats(mock_url)
+            samples, elapsed = run_scenario(name, target, args.duration, args.concurrency, args.seed + index)
+            report = summarize(name, samples, elapsed, metrics_before, scrape_metrics(target),
+                               mock_before, mock_stats(mock_url))
+            print_report(report)
+            reports.append(report)
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as fh:
+                json.dump({"reports": reports, "options": vars(args)}, fh, indent=2)
+            print(f"\nReports written to {args.output}")
+        return 0
+    finally:
+        stop(app_process)
+        stop(mock_process)
+        log_file.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
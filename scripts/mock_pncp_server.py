@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Mock PNCP upstream server for load testing.
+
+Serves synthetic data for the PNCP endpoints used by the application, with
+configurable latency distributions, error rates and payload sizes, so load
+tests never touch pncp.gov.br.
+
+Point the application at it with:
+    PNCP_API_BASE=http://127.0.0.1:9100/api/pncp
+    CONSULTA_API_BASE=http://127.0.0.1:9100/api/consulta
+
+Control endpoints:
+    GET  /__stats   upstream call counts per path
+    POST /__reset   reset the counters
+
+Usage:
+    python scripts/mock_pncp_server.py --port 9100 --latency lognormal --latency-ms 300 --error-rate 0.02
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+UFS = [
+    'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MT', 'MS', 'MG', 'PA',
+    'PB', 'PR', 'PE', 'PI', 'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'
+]
+
+MODALIDADES = {
+    1: 'Concorrência', 2: 'Tomada de Preços', 3: 'Convite', 4: 'Concurso', 5: 'Leilão',
+    6: 'Pregão', 7: 'Dispensa de Licitação', 8: 'Inexigibilidade de Licitação', 12: 'Credenciamento'
+}
+
+TIPOS_ORGAO = ['Prefeitura', 'Ministério', 'Universidade', 'Empresa Pública', 'Autarquia']
+
+
+class MockSettings:
+    """Runtime settings of the mock server."""
+
+    def __init__(self, args):
+        self.latency = args.latency
+        self.latency_ms = args.latency_ms
+        self.jitter_ms = args.jitter_ms
+        self.error_rate = args.error_rate
+        self.total_records = args.total_records
+        self.text_size = args.text_size
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.calls = Counter()
+        self.errors = Counter()
+
+    def sample_latency(self):
+        """Draw a response delay (seconds) from the configured distribution."""
+        mean = self.latency_ms / 1000
+        jitter = self.jitter_ms / 1000
+        with self.lock:
+            if self.latency == 'fixed':
+                value = mean
+            elif self.latency == 'uniform':
+                value = self.rng.uniform(max(mean - jitter, 0), mean + jitter)
+            elif self.latency == 'normal':
+                value = self.rng.gauss(mean, jitter)
+            elif self.latency == 'exponential':
+                value = self.rng.expovariate(1 / mean) if mean > 0 else 0
+            else:
+                # lognormal: long tail, closest to real upstream behaviour
+                sigma = max(jitter / mean, 0.01) if mean > 0 else 0.5
+                mu = math.log(mean) - sigma ** 2 / 2 if mean > 0 else 0
+                value = self.rng.lognormvariate(mu, sigma) if mean > 0 else 0
+        return max(value, 0)
+
+    def should_fail(self):
+        """Decide whether this call returns an upstream error."""
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+
+def build_tender(index, settings):
+    """Build one synthetic tender record."""
+    uf = UFS[index % len(UFS)]
+    modalidade_id = list(MODALIDADES)[index % len(MODALIDADES)]
+    opening = datetime(2024, 1, 1) + timedelta(hours=index * 7)
+    padding = ('Aquisição de materiais e serviços ' * (settings.text_size // 34 + 1))[:settings.text_size]
+    return {
+        "numeroControlePNCP": f"{10000000000000 + index}-1-{index % 999999 + 1:06d}/2024",
+        "numeroCompra": str(index),
+        "processo": f"{index}/2024",
+        "anoCompra": 2024,
+        "sequencialCompra": index % 999999 + 1,
+        "objetoCompra": f"{padding} #{index}",
+        "modalidadeId": modalidade_id,
+        "modalidadeNome": MODALIDADES[modalidade_id],
+        "valorTotalEstimado": round(1000 + (index * 7919) % 5000000 + 0.5, 2),
+        "dataPublicacaoPncp": opening.isoformat(),
+        "dataAberturaProposta": opening.isoformat(),
+        "dataEncerramentoProposta": (opening + timedelta(days=15)).isoformat(),
+        "orgaoEntidade": {
+            "cnpj": f"{10000000000000 + index}",
+            "razaoSocial": f"Órgão Público {index % 500}",
+            "poderId": "E",
+            "esferaId": "M"
+        },
+        "unidadeOrgao": {
+            "ufSigla": uf,
+            "ufNome": uf,
+            "municipioNome": f"Município {index % 300}",
+            "codigoUnidade": str(index % 1000),
+            "nomeUnidade": "Secretaria de Administração"
+        },
+        "amparoLegal": {
+            "codigo": 1,
+            "nome": "Lei 14.133/2021, Art. 28, I",
+            "descricao": "Pregão eletrônico"
+        }
+    }
+
+
+def open_tenders(query, settings):
+    """Synthetic /v1/contratacoes/proposta page."""
+    try:
+        pagina = max(int(query.get('pagina', 1)), 1)
+        tamanho = min(max(int(query.get('tamanhoPagina', 10)), 1), 500)
+    except ValueError:
+        return 400, {"message": "Parâmetros inválidos"}
+
+    uf = query.get('uf')
+    modalidade = query.get('codigoModalidadeContratacao')
+    # Filters shrink the result set deterministically
+    total = settings.total_records
+    if uf:
+        total //= len(UFS)
+    if modalidade:
+        total //= len(MODALIDADES)
+
+    start = (pagina - 1) * tamanho
+    records = [build_tender(i, settings) for i in range(start, min(start + tamanho, total))]
+    for record in records:
+        if uf:
+            record["unidadeOrgao"]["ufSigla"] = uf.upper()
+        if modalidade:
+            record["modalidadeId"] = int(modalidade)
+    total_pages = max(math.ceil(total / tamanho), 1)
+    return 200, {
+        "data": records,
+        "totalRegistros": total,
+        "totalPaginas": total_pages,
+        "numeroPagina": pagina,
+        "paginasRestantes": max(total_pages - pagina, 0),
+        "empty": not records
+    }
+
+
+def stats(field, values):
+    """Synthetic statistics list for one dimension."""
+    def handler(query, settings):
+        return 200, [
+            {field: value, "quantidade": (i * 37) % 101 + 1, "valorTotal": 150000.0 * (i + 1)}
+            for i, value in enumerate(values)
+        ]
+    return handler
+
+
+def modalidade_stats(query, settings):
+    """Synthetic /v1/contratacoes/modalidades list."""
+    return 200, [
+        {"codigo": code, "nome": name, "quantidade": (code * 13) % 97 + 1, "valorTotal": 250000.0 * code}
+        for code, name in MODALIDADES.items()
+    ]
+
+
+def orgaos_siafi(query, settings):
+    """Synthetic /v1/orgaos/siafi list (health probe target)."""
+    return 200, [{"codigo": str(i), "nome": f"Órgão SIAFI {i}"} for i in range(20)]
+
+
+ROUTES = {
+    '/api/consulta/v1/contratacoes/proposta': open_tenders,
+    '/api/consulta/v1/contratacoes/modalidades': modalidade_stats,
+    '/api/consulta/v1/contratacoes/uf': stats('uf', UFS),
+    '/api/consulta/v1/contratacoes/tipoOrgao': stats('tipoOrgao', TIPOS_ORGAO),
+    '/api/consulta/v1/contratos': stats('tipo', ['Contrato', 'Aditivo', 'Rescisão']),
+    '/api/consulta/v1/atas-registro-precos': stats('tipo', ['Ata de Registro', 'Adesão', 'Renovação']),
+    '/api/consulta/v1/pca': stats('tipo', ['Plano Anual', 'Plano Trimestral', 'Plano Semestral']),
+    '/api/pncp/v1/orgaos/siafi': orgaos_siafi,
+}
+
+
+def make_handler(settings):
+    """Create the request handler bound to the mock settings."""
+
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            """Silence per-request logging."""
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path == '/__stats':
+                with settings.lock:
+                    self._send_json(200, {"calls": dict(settings.calls), "errors": dict(settings.errors)})
+                return
+
+            handler = ROUTES.get(parsed.path)
+            if handler is None:
+                self._send_json(404, {"message": "Not found"})
+                return
+
+            with settings.lock:
+                settings.calls[parsed.path] += 1
+
+            time.sleep(settings.sample_latency())
+            if settings.should_fail():
+                with settings.lock:
+                    settings.errors[parsed.path] += 1
+                self._send_json(503, {"message": "Serviço temporariamente indisponível"})
+                return
+
+            query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+            status, payload = handler(query, settings)
+            self._send_json(status, payload)
+
+        def do_POST(self):
+            if urlparse(self.path).path == '/__reset':
+                with settings.lock:
+                    settings.calls.clear()
+                    settings.errors.clear()
+                self._send_json(200, {"status": "reset"})
+                return
+            self._send_json(404, {"message": "Not found"})
+
+    return MockHandler
+
+
+def build_parser():
+    """Command line options."""
+    parser = argparse.ArgumentParser(description="Mock PNCP upstream server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'normal', 'exponential', 'lognormal'],
+                        default='lognormal', help="Latency distribution (default: lognormal)")
+    parser.add_argument('--latency-ms', type=float, default=200, help="Mean latency in ms (default: 200)")
+    parser.add_argument('--jitter-ms', type=float, default=150,
+                        help="Spread of the latency distribution in ms (default: 150)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of 503 responses (default: 0)")
+    parser.add_argument('--total-records', type=int, default=5000,
+                        help="Size of the unfiltered open tenders result set (default: 5000)")
+    parser.add_argument('--text-size', type=int, default=200,
+                        help="Characters in each objetoCompra, to scale payload sizes (default: 200)")
+    parser.add_argument('--seed', type=int, default=42)
+    return parser
+
+
+def main():
+    """Main entry point."""
+    args = build_parser().parse_args()
+    settings = MockSettings(args)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(settings))
+    server.daemon_threads = True
+    print(f"Mock PNCP server listening on http://{args.host}:{args.port} "
+          f"(latency={args.latency} {args.latency_ms}ms, error_rate={args.error_rate})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
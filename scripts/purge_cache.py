@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Cache purge for PNCP API Client.
+
+Deletes the Redis cache entries with the given tags (and their compressed
+variants) in small UNLINK batches, so it is safe to run against a live
+Redis. Same as POST /api/admin/cache/purge, for use from a shell or cron.
+
+Usage:
+    python scripts/purge_cache.py uf:SP                  # entries filtered by UF
+    python scripts/purge_cache.py data:202403 modalidade:6
+    python scripts/purge_cache.py ns:open_tenders        # a whole namespace
+    python scripts/purge_cache.py --all                  # every entry (protected namespaces are kept)
+"""
+
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from app import create_app  # noqa: E402
+from app.core.services.invalidation import cache_invalidator  # noqa: E402
+from app.extensions import redis_client  # noqa: E402
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Purge PNCP API Client cache entries by tag.")
+    parser.add_argument('tags', nargs='*', help="tags such as uf:SP, modalidade:6, data:202403 or ns:open_tenders")
+    parser.add_argument('--all', action='store_true', help="purge every cache entry")
+    parser.add_argument('--config', default=os.environ.get('FLASK_ENV', 'production'),
+                        help="configuration name (default: FLASK_ENV or production)")
+    args = parser.parse_args()
+
+    if not args.tags and not args.all:
+        parser.error("give at least one tag, or --all")
+
+    create_app(args.config)
+    if not redis_client.available:
+        print("Redis is unavailable", file=sys.stderr)
+        return 1
+
+    if args.all:
+        return 0 if cache_invalidator.purge_all() else 1
+
+    try:
+        purged = cache_invalidator.purge(args.tags)
+    except ValueError as e:
+        parser.error(str(e))
+    for tag, deleted in purged.items():
+        print(f"{tag}: {deleted} keys")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for PNCP API Client.
+
+Runs the microbenchmarks in tests/benchmarks, saves the results as JSON and
+compares them against the stored baseline. Exits with status 1 when any
+benchmark is slower than the baseline by more than the allowed threshold,
+or has no baseline entry (add one with --add-new when adding a benchmark).
+
+Timings are compared relative to test_bench_reference from the same run,
+so a uniformly slower or busier machine does not look like a regression.
+A benchmark flagged as slower is run again (--confirm-runs times) and
+only counts as a regression if every run agrees.
+
+Usage:
+    python scripts/run_benchmarks.py                  # run and compare
+    python scripts/run_benchmarks.py --save-baseline  # run and store a new baseline
+    python scripts/run_benchmarks.py --add-new        # run and add baselines of new benchmarks only
+    python scripts/run_benchmarks.py --threshold 0.5  # allow up to 50% slowdown
+    python scripts/run_benchmarks.py --confirm-runs 0 # trust the first run
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASELINE_FILE = os.path.join(ROOT_DIR, 'tests', 'benchmarks', 'baseline.json')
+RESULTS_FILE = os.path.join(ROOT_DIR, 'bench_results.json')
+
+# Benchmark every other one is normalized against (see test_bench_reference.py)
+REFERENCE_BENCHMARK = 'test_bench_reference'
+
+
+def run_benchmarks(output_file, node_ids=None):
+    """
+    Run the benchmark suite and write pytest-benchmark JSON to output_file.
+
+    Args:
+        output_file: Where to write the results
+        node_ids: Benchmarks to run (every benchmark when None)
+    """
+    command = [
+        sys.executable, '-m', 'pytest', *(node_ids or ['tests/benchmarks']),
+        '--benchmark-only',
+        '--benchmark-warmup=on',
+        '--benchmark-disable-gc',
+        f'--benchmark-json={output_file}',
+        '-q'
+    ]
+    print(f"Running: {' '.join(command)}")
+    return subprocess.call(command, cwd=ROOT_DIR)
+
+
+def load_timings(path):
+    """
+    Load the fastest round (seconds) of each benchmark from a results file.
+
+    The minimum is the least noisy statistic for microbenchmarks: slower
+    rounds mostly measure interference from the rest of the machine.
+    """
+    with open(path, 'r', encoding='utf-8') as fh:
+        data = json.load(fh)
+    return {bench['name']: bench['stats']['min'] for bench in data.get('benchmarks', [])}
+
+
+def load_node_ids(path):
+    """Load the pytest node id of each benchmark from a results file, to run it again."""
+    with open(path, 'r', encoding='utf-8') as fh:
+        data = json.load(fh)
+    return {bench['name']: bench['fullname'] for bench in data.get('benchmarks', [])}
+
+
+def load_baseline():
+    """Load the baseline timings (seconds) by benchmark name."""
+    with open(BASELINE_FILE, 'r', encoding='utf-8') as fh:
+        return json.load(fh)['min_seconds']
+
+
+def write_baseline(timings):
+    """Write baseline timings to the baseline file."""
+    with open(BASELINE_FILE, 'w', encoding='utf-8') as fh:
+        json.dump({"min_seconds": timings}, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+
+def save_baseline(results_file):
+    """Store the timings of a run as the new baseline."""
+    timings = load_timings(results_file)
+    write_baseline(timings)
+    print(f"Baseline with {len(timings)} benchmarks saved to {BASELINE_FILE}")
+
+
+def add_new_baselines(results_file):
+    """Add the timings of benchmarks missing from the baseline, keeping the others."""
+    baseline = load_baseline()
+    added = {name: value for name, value in load_timings(results_file).items() if name not in baseline}
+    write_baseline({**baseline, **added})
+    print(f"Added {len(added)} benchmark(s) to {BASELINE_FILE}: {', '.join(sorted(added)) or 'none'}")
+
+
+def compare(results_file, threshold):
+    """
+    Compare a run against the baseline, relative to the reference benchmark of each.
+
+    A benchmark regresses when its time divided by the reference time of
+    the same run grew by more than the threshold since the baseline.
+
+    Returns:
+        Tuple of (benchmarks that regressed beyond the threshold,
+        benchmarks without a baseline entry)
+    """
+    baseline = load_baseline()
+    current = load_timings(results_file)
+    scale = baseline[REFERENCE_BENCHMARK] / current[REFERENCE_BENCHMARK]
+
+    regressions = []
+    missing = []
+    print(f"\nReference speed vs baseline: {scale:.2f}x (times below are scaled by it)")
+    print(f"{'Benchmark':45} {'Baseline (us)':>14} {'Current (us)':>14} {'Change':>9}")
+    for name in sorted(current):
+        if name == REFERENCE_BENCHMARK:
+            continue
+        if name not in baseline:
+            missing.append(name)
+            print(f"{name:45} {'-':>14} {current[name] * 1e6:>14.2f} {'new':>9}  NO BASELINE")
+            continue
+        scaled = current[name] * scale
+        change = scaled / baseline[name] - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:45} {baseline[name] * 1e6:>14.2f} {scaled * 1e6:>14.2f} {change:>+8.1%}{flag}")
+
+    return regressions, missing
+
+
+def confirm_regressions(results_file, regressions, threshold, runs):
+    """
+    Run flagged benchmarks again and keep those that regress in every run.
+
+    Args:
+        results_file: Results of the first run (for the node ids)
+        regressions: Benchmarks flagged by the first run
+        threshold: Allowed slowdown
+        runs: Times to run them again
+
+    Returns:
+        Benchmarks that regressed in every run
+    """
+    node_ids = load_node_ids(results_file)
+    rerun_file = f"{os.path.splitext(results_file)[0]}_rerun.json"
+    for attempt in range(1, runs + 1):
+        if not regressions:
+            break
+        print(f"\nConfirming {len(regressions)} regression(s), run {attempt} of {runs}")
+        selected = [node_ids[name] for name in regressions + [REFERENCE_BENCHMARK]]
+        if run_benchmarks(rerun_file, selected) != 0:
+            print("Benchmark rerun failed, keeping the first run's result")
+            break
+        confirmed, _ = compare(rerun_file, threshold)
+        regressions = [name for name in regressions if name in confirmed]
+    return regressions
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Run and compare PNCP API Client benchmarks")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--add-new', action='store_true',
+                        help="Add baseline entries for benchmarks that have none, keeping the others")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown before failing (default: 0.25 = 25%%)")
+    parser.add_argument('--confirm-runs', type=int, default=2,
+                        help="Runs of a flagged benchmark that must all regress before failing (default: 2)")
+    parser.add_argument('--output', default=RESULTS_FILE, help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    status = run_benchmarks(args.output)
+    if status != 0:
+        print("Benchmark run failed")
+        return status
+
+    if args.save_baseline:
+        save_baseline(args.output)
+        return 0
+
+    if not os.path.exists(BASELINE_FILE):
+        print(f"No baseline found at {BASELINE_FILE}. Run with --save-baseline first.")
+        return 1
+
+    if args.add_new:
+        add_new_baselines(args.output)
+        return 0
+
+    if REFERENCE_BENCHMARK not in load_baseline():
+        print(f"The baseline has no {REFERENCE_BENCHMARK} entry. Run with --save-baseline first.")
+        return 1
+
+    regressions, missing = compare(args.output, args.threshold)
+    regressions = confirm_regressions(args.output, regressions, args.threshold, args.confirm_runs)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed more than {args.threshold:.0%}:")
+        for name in regressions:
+            print(f"  - {name}")
+    if missing:
+        print(f"\n{len(missing)} benchmark(s) have no baseline entry (run with --add-new):")
+        for name in missing:
+            print(f"  - {name}")
+    if regressions or missing:
+        return 1
+
+    print("\nNo performance regressions detected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,12 +37,14 @@ setup(
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
+            "pytest-benchmark>=4.0",
             "flake8>=3.8",
             "black>=21.0",
         ],
         "test": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
+            "pytest-benchmark>=4.0",
         ],
     },
     entry_points={
@@ -0,0 +1,3 @@
+"""
+Microbenchmarks package for PNCP API Client.
+"""
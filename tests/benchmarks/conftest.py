@@ -0,0 +1,65 @@
+"""
+Benchmark fixtures for PNCP API Client.
+
+Payloads are built from tests/fixtures/tender_data.py and scaled to the
+sizes seen in production (100-record tender pages, 27 UFs).
+"""
+import copy
+import pytest
+from tests.fixtures.tender_data import sample_tender
+
+UFS = [
+    'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MT', 'MS', 'MG', 'PA',
+    'PB', 'PR', 'PE', 'PI', 'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'
+]
+
+
+def build_tender(index: int) -> dict:
+    """Build a realistic upstream tender record from the sample tender."""
+    tender = copy.deepcopy(sample_tender)
+    uf = UFS[index % len(UFS)]
+    tender["numeroCompra"] = str(100000 + index)
+    tender["processo"] = f"{100000 + index}/2024"
+    tender["numeroControlePNCP"] = f"{12345678000100 + index}-1-{index:06d}/2024"
+    tender["objetoCompra"] = f"{sample_tender['objetoCompra']} - lote {index}" * 3
+    tender["valorTotalEstimado"] = 1000.0 * (index + 1)
+    tender["dataAberturaProposta"] = f"2024-10-{index % 28 + 1:02d}T08:00:00"
+    tender["dataEncerramentoProposta"] = f"2024-11-{index % 28 + 1:02d}T18:00:00"
+    tender["orgaoEntidade"]["ufSigla"] = uf
+    tender["unidadeOrgao"] = {
+        "ufNome": uf,
+        "ufSigla": uf,
+        "codigoUnidade": str(index),
+        "nomeUnidade": "Secretaria Municipal de Administração",
+        "municipioNome": "São Paulo",
+        "codigoIbge": "3550308"
+    }
+    tender["amparoLegal"] = {
+        "codigo": 1,
+        "nome": "Lei 14.133/2021, Art. 28, I",
+        "descricao": "Pregão eletrônico para aquisição de bens comuns"
+    }
+    return tender
+
+
+@pytest.fixture(scope='session')
+def tender_page():
+    """Open tenders page as returned by /v1/contratacoes/proposta."""
+    data = [build_tender(i) for i in range(100)]
+    return {
+        "data": data,
+        "totalRegistros": 4500,
+        "totalPaginas": 45,
+        "numeroPagina": 1,
+        "paginasRestantes": 44,
+        "empty": False
+    }
+
+
+@pytest.fixture(scope='session')
+def uf_stats_payload():
+    """UF statistics payload as returned by /v1/contratacoes/uf."""
+    return [
+        {"uf": uf, "quantidade": (i * 37) % 101, "valorTotal": 150000.0 * (i + 1)}
+        for i, uf in enumerate(UFS)
+    ]
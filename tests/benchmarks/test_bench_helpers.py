@@ -0,0 +1,37 @@
+"""
+Benchmarks for helper functions.
+"""
+import pytest
+from app.core.utils.helpers import build_cache_key, convert_pncp_id_to_url, format_date
+
+pytest.importorskip('pytest_benchmark')
+
+
+def test_bench_build_cache_key(benchmark):
+    """Benchmark cache key building for an open tenders query."""
+    params = {
+        'dataFinal': '20241031',
+        'codigoModalidadeContratacao': '6',
+        'uf': 'SP',
+        'palavraChave': 'informática',
+        'pagina': 3,
+        'tamanhoPagina': 50
+    }
+    key = benchmark(build_cache_key, 'open_tenders', params)
+    assert key.startswith('open_tenders:')
+
+
+def test_bench_format_date_iso(benchmark):
+    """Benchmark formatting of ISO dates."""
+    assert benchmark(format_date, '2024-10-15T10:30:00Z') == '15/10/2024'
+
+
+def test_bench_format_date_compact(benchmark):
+    """Benchmark formatting of YYYYMMDD dates."""
+    assert benchmark(format_date, '20241015') == '15/10/2024'
+
+
+def test_bench_convert_pncp_id_to_url(benchmark):
+    """Benchmark PNCP ID to URL conversion."""
+    result = benchmark(convert_pncp_id_to_url, '18428888000123-1-000178/2024')
+    assert result == '18428888000123/2024/178'
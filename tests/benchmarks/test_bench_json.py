@@ -0,0 +1,45 @@
+"""
+Benchmarks for the JSON codec, with each backend on a 100-record tender page.
+
+Compare the ``[fast]`` and ``[stdlib]`` variants of each benchmark to see
+the gain of orjson over the stdlib json module.
+"""
+import json
+import pytest
+from app.extensions.json_codec import ORJSON_AVAILABLE, json_codec
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.fixture(params=[True, False], ids=['fast', 'stdlib'])
+def backend(request, monkeypatch):
+    """Select the codec backend (the fast one only when orjson is installed)."""
+    if request.param and not ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_codec, 'fast', request.param)
+    return request.param
+
+
+@pytest.fixture(scope='module')
+def tender_page_bytes(tender_page):
+    """Upstream body of a 100-record tender page."""
+    return json.dumps(tender_page).encode('utf-8')
+
+
+def test_bench_json_response_tender_page(benchmark, app, backend, tender_page):
+    """Benchmark building the JSON response of a 100-record tender page."""
+    app.debug = False
+    with app.test_request_context():
+        response = benchmark(app.json.response, tender_page)
+    assert len(json.loads(response.data)['data']) == 100
+
+
+def test_bench_json_loads_tender_page(benchmark, backend, tender_page_bytes):
+    """Benchmark parsing an upstream 100-record tender page body."""
+    result = benchmark(json_codec.loads, tender_page_bytes)
+    assert len(result['data']) == 100
+
+
+def test_bench_json_dumps_tender_page(benchmark, backend, tender_page):
+    """Benchmark serializing a 100-record tender page for the cache."""
+    benchmark(json_codec.dumps, tender_page)
@@ -0,0 +1,109 @@
+"""
+Benchmarks for tender models.
+
+The slotted, schema-driven models are compared with plain dataclasses of
+the same fields (the previous models, reproduced below as Legacy*) on a
+100-record tender page.
+"""
+import json
+import tracemalloc
+from dataclasses import field, make_dataclass
+from typing import Any, Dict
+import pytest
+from app.core.models.base import Model
+from app.core.models.tender import ItemLicitacao, OrgaoEntidade, Tender
+
+pytest.importorskip('pytest_benchmark')
+
+
+def legacy_dataclass(model: Model) -> type:
+    """Plain (unslotted) dataclass with the same fields as a model, like the previous models."""
+    return make_dataclass(f'Legacy{model.__name__}', [
+        (f.name, Any, field(default_factory=list) if f.many else field(default=f.default))
+        for f in model.SCHEMA
+    ])
+
+
+LegacyOrgaoEntidade = legacy_dataclass(OrgaoEntidade)
+LegacyTender = legacy_dataclass(Tender)
+PLAIN_FIELDS = [f.name for f in Tender.SCHEMA if f.model is None and not f.timestamp]
+
+
+def legacy_from_record(record: Dict[str, Any]) -> Any:
+    """Build a legacy tender the way callers had to: field by field."""
+    orgao = record.get('orgaoEntidade') or {}
+    return LegacyTender(
+        orgaoEntidade=LegacyOrgaoEntidade(orgao.get('cnpj'), orgao.get('razaoSocial'), orgao.get('ufSigla')),
+        **{name: record.get(name) for name in PLAIN_FIELDS}
+    )
+
+
+@pytest.fixture(scope='module')
+def tender_page_bytes(tender_page):
+    """Upstream body of a 100-record tender page (the records array)."""
+    return json.dumps(tender_page['data']).encode('utf-8')
+
+
+def test_bench_tender_to_dict(benchmark, tender_page):
+    """Benchmark converting a tender with 20 items to a dict."""
+    record = tender_page['data'][0]
+    tender = Tender(
+        numeroCompra=record['numeroCompra'],
+        processo=record['processo'],
+        orgaoEntidade=OrgaoEntidade(**record['orgaoEntidade']),
+        objetoCompra=record['objetoCompra'],
+        modalidadeNome=record['modalidadeNome'],
+        modalidadeId=record['modalidadeId'],
+        valorTotalEstimado=record['valorTotalEstimado'],
+        dataAberturaProposta=record['dataAberturaProposta'],
+        dataEncerramentoProposta=record['dataEncerramentoProposta'],
+        numeroControlePNCP=record['numeroControlePNCP'],
+        itens=[
+            ItemLicitacao(numeroItem=i, descricao=f"Item {i}", quantidade=10.0,
+                          valorUnitario=100.0, valorTotal=1000.0)
+            for i in range(1, 21)
+        ]
+    )
+
+    result = benchmark(tender.to_dict)
+    assert len(result['itens']) == 20
+
+
+def test_bench_decode_tender_page(benchmark, tender_page_bytes):
+    """Benchmark decoding a 100-record page straight into slotted models."""
+    tenders = benchmark(Tender.decode, tender_page_bytes)
+    assert len(tenders) == 100 and tenders[0].orgaoEntidade.cnpj
+
+
+def test_bench_decode_tender_page_legacy(benchmark, tender_page_bytes):
+    """Benchmark decoding the same page into the legacy dataclasses."""
+    tenders = benchmark(lambda raw: [legacy_from_record(r) for r in json.loads(raw)], tender_page_bytes)
+    assert len(tenders) == 100
+
+
+def test_bench_encode_tender_page(benchmark, tender_page_bytes):
+    """Benchmark encoding 100 slotted tenders to JSON bytes."""
+    tenders = Tender.decode(tender_page_bytes)
+    benchmark(lambda: [tender.encode() for tender in tenders])
+
+
+def _allocated(build) -> int:
+    """Bytes still allocated by the objects that ``build`` returns."""
+    tracemalloc.start()
+    try:
+        objects = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objects
+    return size
+
+
+def test_slotted_models_use_less_memory(tender_page):
+    """Test 1000 slotted tenders take less memory than 1000 legacy dataclasses."""
+    records = tender_page['data'] * 10
+
+    slotted = _allocated(lambda: [Tender.from_pncp(r) for r in records])
+    legacy = _allocated(lambda: [legacy_from_record(r) for r in records])
+
+    assert slotted < legacy, f"1000 tenders: slotted {slotted / 1024:.0f} KiB, dataclass {legacy / 1024:.0f} KiB"
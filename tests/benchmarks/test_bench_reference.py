@@ -0,0 +1,23 @@
+"""
+Reference benchmark the other benchmarks are normalized against.
+
+It exercises no project code, only the kind of interpreter work the
+project's hot paths are made of (dict and string handling, sorting), so
+its timing tracks the speed of the machine and not of the code under test.
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+RECORDS = [{"id": f"{i:06d}", "uf": "SP" if i % 2 else "MG", "valor": i * 1.5} for i in range(50)]
+
+
+def _reference_workload():
+    """Filter, sort and format a small list of records."""
+    selected = sorted((r for r in RECORDS if r["uf"] == "SP"), key=lambda r: r["valor"], reverse=True)
+    return "|".join(f"{r['id']}:{r['valor']:.2f}" for r in selected)
+
+
+def test_bench_reference(benchmark):
+    """Benchmark the reference workload."""
+    assert benchmark(_reference_workload).startswith("000049:")
@@ -0,0 +1,64 @@
+"""
+Benchmarks for service, cache and rate limiter hot paths.
+"""
+import pytest
+from app.core.services.pncp_service import PNCPService
+from app.core.utils.projection import parse_fields
+from app.extensions.rate_limiter import RateLimiter
+from app.extensions.redis_client import RedisClient
+
+pytest.importorskip('pytest_benchmark')
+
+
+def test_bench_redis_encode_tender_page(benchmark, tender_page):
+    """Benchmark serializing a 100-record tender page for Redis."""
+    benchmark(RedisClient.encode, tender_page)
+
+
+def test_bench_redis_decode_tender_page(benchmark, tender_page):
+    """Benchmark deserializing a 100-record tender page from Redis."""
+    encoded = RedisClient.encode(tender_page)
+    result = benchmark(RedisClient.decode, encoded)
+    assert len(result['data']) == 100
+
+
+def test_bench_project_tender_page_list(benchmark, tender_page):
+    """Benchmark projecting a 100-record tender page onto the list preset."""
+    fields = parse_fields('list')
+    result = benchmark(PNCPService._project_tenders, tender_page, fields)
+    assert 'amparoLegal' not in result['data'][0]
+
+
+def test_bench_redis_encode_projected_page(benchmark, tender_page):
+    """Benchmark serializing a list-projected tender page (compare with the full page)."""
+    projected = PNCPService._project_tenders(tender_page, parse_fields('list'))
+    benchmark(RedisClient.encode, projected)
+
+
+def test_bench_transform_uf_stats(benchmark, uf_stats_payload):
+    """Benchmark the stats transform-and-sort loop on a UF payload."""
+    def build_item(item):
+        return {
+            "uf": item.get("uf", "N/A"),
+            "quantidade": item.get("quantidade", 0),
+            "valor": item.get("valorTotal", 0)
+        }
+    
+    stats = benchmark(PNCPService._transform_stats, {"data": uf_stats_payload}, build_item)
+    assert len(stats) == 27
+
+
+def test_bench_rate_limiter(benchmark, app):
+    """Benchmark the rate limiter decorator with a warm request history."""
+    limiter = RateLimiter()
+    view = limiter.limit(max_requests=60, window=60)(lambda: 'ok')
+    app.config['TESTING'] = False
+    
+    with app.test_request_context('/api/licitacoes/abertas', environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+        def setup():
+            # Keep a steady history of 30 recent requests for the client
+            limiter.requests = {'10.0.0.1:<lambda>': [limiter.last_cleanup] * 30}
+        
+        result = benchmark.pedantic(view, setup=setup, rounds=2000, iterations=1)
+    
+    assert result == 'ok'
@@ -0,0 +1,111 @@
+"""
+Unit tests for admission control of upstream-bound routes.
+"""
+import threading
+from unittest.mock import patch, MagicMock, PropertyMock
+import pytest
+from app.core.services.upstream import UpstreamClient
+from app.extensions.admission import ConcurrencyLimit, admission
+
+
+class FakeBytesCache:
+    """Binary get/set of the Redis client, in memory."""
+
+    def __init__(self):
+        self.values = {}
+        self.tags = {}
+
+    def set_bytes(self, key, value, expire=3600, tags=()):
+        self.values[key] = value
+        self.tags[key] = list(tags)
+        return True
+
+    def get_bytes(self, key):
+        return self.values.get(key)
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    """Admission control enabled with one slot per worker and per proxy route, and no waiting."""
+    monkeypatch.setattr(admission, 'enabled', True)
+    monkeypatch.setattr(admission, 'max_concurrent', 1)
+    monkeypatch.setattr(admission, 'route_limits', {'proxy': 1})
+    monkeypatch.setattr(admission, 'queue_timeout', 0)
+    admission.reset()
+    cache = FakeBytesCache()
+    with patch('app.extensions.admission.redis_client', cache):
+        yield cache
+    admission.reset()
+
+
+@pytest.fixture
+def upstream():
+    """PNCP answering every call with a small JSON body."""
+    session = MagicMock()
+    session.get.return_value = MagicMock(status_code=200, content=b'{"data": [1]}',
+                                         headers={'Content-Type': 'application/json'})
+    with patch.object(UpstreamClient, 'session', new_callable=PropertyMock, return_value=session):
+        yield session
+
+
+def test_limit_queues_a_bounded_number_of_waiters():
+    """Test a full limit lets queue_size callers wait for a slot and refuses the rest."""
+    limit = ConcurrencyLimit(1, queue_size=1)
+    assert limit.acquire(0)
+    assert not limit.acquire(0)
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(limit.acquire(5)))
+    waiter.start()
+    while limit.waiting == 0:
+        pass
+    # The queue is full, so another caller is refused without waiting
+    assert not limit.acquire(5)
+    limit.release()
+    waiter.join()
+    assert results == [True]
+    assert limit.active == 1
+
+
+def test_overflow_is_shed_with_retry_after(client, limited, upstream):
+    """Test an upstream-bound request without a slot gets 503 while cheap routes still answer."""
+    assert admission.worker.acquire(0)
+    try:
+        response = client.get('/api/pncp/v1/orgaos')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == str(admission.retry_after)
+        upstream.get.assert_not_called()
+
+        assert client.get('/api/test').status_code == 200
+        assert client.get('/api/health/live').status_code == 200
+    finally:
+        admission.worker.release()
+
+    assert client.get('/api/pncp/v1/orgaos').status_code == 200
+    assert admission.worker.active == 0
+
+
+def test_shed_request_served_stale_copy(client, limited, upstream):
+    """Test the last good response of a URL is served, marked stale, when the request is shed."""
+    assert client.get('/api/pncp/v1/orgaos?pagina=1').get_json() == {"data": [1]}
+
+    assert admission.route('proxy').acquire(0)
+    try:
+        response = client.get('/api/pncp/v1/orgaos?pagina=1')
+        assert response.status_code == 200
+        assert response.get_json() == {"data": [1]}
+        assert response.headers['X-Served-Stale'] == '1'
+        # Another URL has no stale copy
+        assert client.get('/api/pncp/v1/orgaos?pagina=2').status_code == 503
+    finally:
+        admission.route('proxy').release()
+    assert upstream.get.call_count == 1
+
+
+def test_stale_copy_tagged_from_query(client, limited, upstream):
+    """Test the stale copy carries the invalidation tags of its query, so a purge drops it too."""
+    client.get('/api/pncp/v1/contratacoes/publicacao?uf=sp&dataInicial=20240301&dataFinal=20240415')
+
+    (key, tags), = limited.tags.items()
+    assert key.startswith('stale:proxy:')
+    assert tags == ['uf:SP', 'data:202403', 'data:202404']
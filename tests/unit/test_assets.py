@@ -0,0 +1,48 @@
+"""
+Unit tests for the static asset bundles.
+"""
+import gzip
+import pytest
+from app.extensions import assets
+
+
+@pytest.fixture
+def built_assets(app, tmp_path, monkeypatch):
+    """Fake build output with a gzip variant."""
+    (tmp_path / 'main.0123456789ab.js').write_bytes(b'console.log(1);')
+    (tmp_path / 'main.0123456789ab.js.gz').write_bytes(gzip.compress(b'console.log(1);'))
+    monkeypatch.setattr(assets, 'dist_dir', str(tmp_path))
+    monkeypatch.setattr(assets, 'manifest', {'main.js': 'main.0123456789ab.js'})
+    return tmp_path
+
+
+def test_asset_url_resolution(app, built_assets):
+    """Test bundles win over raw files, and unbuilt libraries use the CDN."""
+    with app.test_request_context():
+        assert assets.url('main.js') == '/static/dist/main.0123456789ab.js'
+        assert assets.url('advanced-filters.js') == '/static/js/advanced-filters.js'
+        assert assets.url('jquery.js').startswith('https://')
+        with pytest.raises(ValueError):
+            assets.url('missing.js')
+
+
+def test_bundle_served_precompressed_and_immutable(client, built_assets):
+    """Test bundles are served precompressed with a far-future immutable Cache-Control."""
+    response = client.get('/static/dist/main.0123456789ab.js', headers={'Accept-Encoding': 'gzip, br'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype in ('application/javascript', 'text/javascript')
+    assert 'immutable' in response.headers['Cache-Control']
+    assert 'max-age=31536000' in response.headers['Cache-Control']
+    assert gzip.decompress(response.data) == b'console.log(1);'
+
+
+def test_bundle_identity_and_variants_hidden(client, built_assets):
+    """Test clients without gzip get the plain file and variants are not addressable."""
+    plain = client.get('/static/dist/main.0123456789ab.js', headers={'Accept-Encoding': 'identity'})
+
+    assert plain.data == b'console.log(1);'
+    assert 'Content-Encoding' not in plain.headers
+    assert client.get('/static/dist/main.0123456789ab.js.gz').status_code == 404
+    assert client.get('/static/dist/manifest.json').status_code == 404
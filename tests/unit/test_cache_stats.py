@@ -0,0 +1,73 @@
+"""
+Unit tests for the cache analytics.
+"""
+from unittest.mock import MagicMock
+import pytest
+from app.extensions.cache_stats import CacheStats, SpaceSaving, cache_stats
+from app.extensions.redis_client import RedisClient
+
+
+def test_space_saving_keeps_frequent_keys():
+    """Test the sketch keeps the heavy hitters within its capacity."""
+    sketch = SpaceSaving(capacity=5)
+    for key in ["a"] * 10 + ["b"] * 5 + [f"rare{n}" for n in range(8)] + ["a"]:
+        sketch.add(key)
+
+    top = sketch.top(2)
+    assert [key for key, count, error in top] == ["a", "b"]
+    # Counts are overestimated by at most the error
+    assert top[0][1] - top[0][2] <= 11 <= top[0][1]
+    assert len(sketch.top(10)) == 5
+
+
+def test_namespace_counters_and_fill_latency():
+    """Test lookups and fills are counted by namespace, timing fills from their miss."""
+    stats = CacheStats()
+    stats.record_lookup("uf_stats", "uf_stats:1", hit=False)
+    stats.record_fill("uf_stats", "uf_stats:1", 120)
+    stats.record_lookup("uf_stats", "uf_stats:1", hit=True)
+    stats.record_fill("open_tenders", "open_tenders:1", 80)
+
+    report = stats.report()
+    assert report["namespaces"]["uf_stats"]["hits"] == 1
+    assert report["namespaces"]["uf_stats"]["misses"] == 1
+    assert report["namespaces"]["uf_stats"]["hit_ratio"] == 50.0
+    assert report["namespaces"]["uf_stats"]["bytes"] == 120
+    assert report["namespaces"]["uf_stats"]["avg_fill_ms"] is not None
+    # A fill without a preceding miss is not timed
+    assert report["namespaces"]["open_tenders"]["avg_fill_ms"] is None
+    assert report["hot_keys"][0] == {"key": "uf_stats:1", "namespace": "uf_stats", "lookups": 2, "error": 0}
+
+
+def test_redis_client_reports_lookups_and_fills():
+    """Test the Redis client feeds the analytics on reads and writes."""
+    client = RedisClient()
+    client.redis_client = MagicMock()
+    client.redis_client.get.return_value = None
+    client.redis_client.setex.return_value = True
+
+    cache_stats.reset()
+    client.get("details:1")
+    client.set("details:1", {"a": 1})
+
+    namespace = cache_stats.report()["namespaces"]["details"]
+    assert (namespace["misses"], namespace["fills"], namespace["bytes"]) == (1, 1, len(b'{"a":1}'))
+
+
+@pytest.fixture
+def admin_client(app, client):
+    """Client of an app with the admin API enabled."""
+    app.config['ADMIN_TOKEN'] = 'secret'
+    return client
+
+
+def test_admin_report(admin_client):
+    """Test the admin endpoint reports the worker's counters."""
+    cache_stats.reset()
+    cache_stats.record_lookup("uf_stats", "uf_stats:1", hit=True)
+
+    response = admin_client.get('/api/admin/cache/stats?top=5', headers={'X-Admin-Token': 'secret'})
+
+    assert response.status_code == 200
+    assert response.get_json()["namespaces"]["uf_stats"]["hits"] == 1
+    assert admin_client.get('/api/admin/cache/stats?top=x', headers={'X-Admin-Token': 'secret'}).status_code == 400
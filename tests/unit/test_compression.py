@@ -0,0 +1,82 @@
+"""
+Unit tests for response compression.
+"""
+import gzip
+import json
+from flask import jsonify
+import pytest
+from app.extensions import compression
+from app.extensions.compression import BROTLI_AVAILABLE
+from app.extensions.redis_client import redis_client
+
+PAYLOAD = {"data": [{"objetoCompra": f"Aquisição de material {i}", "valor": i} for i in range(200)]}
+
+
+@pytest.fixture
+def compress_client(app):
+    """Client with a large and a small JSON route, the large one cacheable."""
+    def large():
+        precompressed = compression.serve_cached("test_ns:key")
+        if precompressed is not None:
+            return precompressed
+        return jsonify(PAYLOAD)
+
+    app.add_url_rule('/test/large', 'large', large)
+    app.add_url_rule('/test/small', 'small', lambda: jsonify({"ok": True}))
+    return app.test_client()
+
+
+def test_gzip_negotiated(compress_client):
+    """Test large responses are gzip-compressed when the client accepts it."""
+    response = compress_client.get('/test/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert json.loads(gzip.decompress(response.data)) == PAYLOAD
+
+
+def test_brotli_preferred(compress_client):
+    """Test brotli wins over gzip when both are accepted."""
+    if not BROTLI_AVAILABLE:
+        pytest.skip("brotli not installed")
+    import brotli
+
+    response = compress_client.get('/test/large', headers={'Accept-Encoding': 'gzip, deflate, br'})
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert json.loads(brotli.decompress(response.data)) == PAYLOAD
+
+
+def test_not_compressed(compress_client):
+    """Test small responses and clients without compression get identity."""
+    small = compress_client.get('/test/small', headers={'Accept-Encoding': 'gzip'})
+    identity = compress_client.get('/test/large')
+
+    assert 'Content-Encoding' not in small.headers
+    assert 'Content-Encoding' not in identity.headers
+    assert identity.get_json() == PAYLOAD
+
+
+def test_variant_stored_with_entry_ttl(compress_client, monkeypatch):
+    """Test the compressed body is stored next to the cache entry."""
+    stored = {}
+    monkeypatch.setattr(redis_client, 'get_bytes', lambda key: None)
+    monkeypatch.setattr(redis_client, 'ttl', lambda key: 321)
+    monkeypatch.setattr(redis_client, 'set_bytes',
+                        lambda key, value, expire: stored.update({key: (value, expire)}) or True)
+
+    response = compress_client.get('/test/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert stored == {"test_ns:key:gzip": (response.data, 321)}
+
+
+def test_precompressed_hit(compress_client, monkeypatch):
+    """Test cache hits are served from the stored compressed variant."""
+    body = gzip.compress(b'{"cached": true}')
+    monkeypatch.setattr(redis_client, 'get_bytes', lambda key: body if key == "test_ns:key:gzip" else None)
+
+    response = compress_client.get('/test/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.data == body
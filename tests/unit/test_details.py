@@ -0,0 +1,170 @@
+"""
+Unit tests for the tender detail engine.
+"""
+import json
+import threading
+import time
+from unittest.mock import patch, MagicMock
+import pytest
+from app.core.services.details import TenderDetails, tender_details
+
+TENDER_ID = "18428888000123-1-000178/2024"
+BASE = "/v1/orgaos/18428888000123/compras/2024/178"
+
+COMPRA = {
+    "numeroControlePNCP": TENDER_ID,
+    "numeroCompra": "178",
+    "objetoCompra": "Aquisição de material de escritório",
+    "orgaoEntidade": {"cnpj": "18428888000123", "razaoSocial": "Prefeitura"},
+    "unidadeOrgao": {"ufSigla": "MG"},
+    "situacaoCompraId": 1,
+    "dataEncerramentoProposta": "2024-03-01T10:00:00",
+    "dataPublicacaoPncp": "2024-02-01T09:00:00"
+}
+ITEMS = [
+    {"numeroItem": n, "descricao": f"Item {n}", "valorUnitarioEstimado": 2.5,
+     "situacaoCompraItem": 2, "temResultado": n % 2 == 0}
+    for n in range(1, 151)
+]
+
+
+def _fake_pncp(overrides=None):
+    """Fake PNCP compra routes; overrides map a path suffix to a status code."""
+    overrides = overrides or {}
+
+    def fake_get(url, params=None, timeout=None, stream=None):
+        path = url.split("/api/pncp", 1)[-1]
+        suffix = path[len(BASE):]
+        response = MagicMock(status_code=overrides.get(suffix, 200))
+        payload = None
+        if suffix == "":
+            payload = COMPRA
+        elif suffix == "/itens/quantidade":
+            payload = len(ITEMS)
+        elif suffix == "/itens":
+            page, size = params['pagina'], params['tamanhoPagina']
+            payload = ITEMS[(page - 1) * size:page * size]
+        elif suffix == "/arquivos":
+            payload = [{"sequencialDocumento": 1, "titulo": "Edital", "url": "https://x/1"}]
+        elif suffix.endswith("/resultados"):
+            numero = int(suffix.split("/")[2])
+            payload = [{"sequencialResultado": 1, "nomeRazaoSocialFornecedor": f"Fornecedor {numero}"}]
+        response.content = json.dumps(payload).encode()
+        return response
+
+    return fake_get
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Detail engine with small item pages."""
+    monkeypatch.setattr(tender_details, 'items_page_size', 50)
+    return tender_details
+
+
+@patch('app.core.services.upstream.requests.Session.get', side_effect=_fake_pncp())
+def test_fetch_aggregates_sub_resources(mock_get, engine):
+    """Test the compra, every item page, documents and item results are assembled."""
+    data, ttl = engine.fetch("18428888000123", 2024, 178)
+
+    assert [item["numeroItem"] for item in data["itens"]] == list(range(1, 151))
+    assert data["itens"][1]["resultados"][0]["nomeRazaoSocialFornecedor"] == "Fornecedor 2"
+    assert data["itens"][0]["resultados"] == []
+    assert data["documentos"][0]["titulo"] == "Edital"
+    assert data["orgaoEntidade"]["ufSigla"] == "MG"
+    assert data["parcial"] is False
+    # Closed and every item decided: cached for long
+    assert ttl == engine.closed_ttl
+    # compra + count + documents + 3 item pages + 75 results
+    assert mock_get.call_count == 81
+
+
+def test_partial_details_cached_briefly(engine):
+    """Test a failed sub-resource flags the aggregate and shortens its TTL."""
+    with patch('app.core.services.upstream.requests.Session.get', side_effect=_fake_pncp({"/arquivos": 500})):
+        data, ttl = engine.fetch("18428888000123", 2024, 178)
+
+    assert data["parcial"] is True
+    assert data["documentos"] == []
+    assert len(data["itens"]) == len(ITEMS)
+    assert ttl == engine.open_ttl
+
+
+def test_is_final():
+    """Test only settled tenders are considered immutable."""
+    assert TenderDetails.is_final(dict(COMPRA, situacaoCompraId=3), [])
+    assert not TenderDetails.is_final(dict(COMPRA, dataEncerramentoProposta="2999-01-01T00:00:00"), [])
+    assert not TenderDetails.is_final(COMPRA, [{"situacaoCompraItem": 1}])
+
+
+@patch('app.core.services.upstream.requests.Session.get', side_effect=_fake_pncp())
+def test_details_route_cached(mock_get, client, engine):
+    """Test the route serves the aggregate and caches it."""
+    with patch('app.core.services.pncp_service.redis_client') as mock_redis:
+        mock_redis.get_many.return_value = [None, None]
+        response = client.get(f'/api/licitacoes/detalhes/{TENDER_ID}')
+
+    assert response.status_code == 200
+    assert response.get_json()["pncp_web_url"] == "https://pncp.gov.br/app/editais/18428888000123/2024/178"
+    key, payload, ttl, tags = mock_redis.set.call_args.args
+    assert key.startswith("tender_details:")
+    assert tags == ["uf:MG", "data:202402"]
+    assert len(payload["itens"]) == len(ITEMS)
+    assert ttl == engine.closed_ttl
+
+
+@patch('app.core.services.upstream.requests.Session.get', side_effect=_fake_pncp())
+def test_batch_streams_hits_then_misses(mock_get, client, engine):
+    """Test the batch endpoint serves cached tenders from one MGET and fetches the rest."""
+    other_id = "11111111000111-1-000001/2024"
+    ids = [other_id, f" {TENDER_ID} ", "18428888000123-1-178/2024", "invalid"]
+    with patch('app.core.services.pncp_service.redis_client') as mock_redis:
+        # The other tender is cached, ours is not (and neither has a negative entry)
+        mock_redis.get_many.return_value = [{"numeroControlePNCP": other_id}, None, None, None]
+        response = client.post('/api/licitacoes/lote', json={"ids": ids})
+        lines = [json.loads(line) for line in response.data.splitlines()]
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert mock_redis.get_many.call_count == 1
+    assert len(mock_redis.get_many.call_args.args[0]) == 4
+    # Invalid first, then the cache hit, then the fetched miss; duplicates dropped
+    assert [(entry["numeroControlePNCP"], entry["status"]) for entry in lines] == [
+        ("invalid", 400), (other_id, 200), (TENDER_ID, 200)
+    ]
+    assert len(lines[2]["data"]["itens"]) == len(ITEMS)
+    mock_redis.set.assert_called_once()
+
+
+def test_batch_rejects_bad_bodies(client):
+    """Test the batch endpoint validates the body before doing any work."""
+    assert client.post('/api/licitacoes/lote', json={"ids": []}).status_code == 400
+    assert client.post('/api/licitacoes/lote', json={"ids": ["x"] * 501}).status_code == 400
+    assert client.post('/api/licitacoes/lote', data="not json").status_code == 400
+
+
+def test_batch_disconnect_drops_queued_fetches(client, monkeypatch):
+    """Test a client leaving mid-stream cancels the misses still queued instead of fetching them."""
+    from app.api.routes.api import pncp_service
+    monkeypatch.setattr(pncp_service, 'batch_concurrency', 1)
+    release = threading.Event()
+    calls = []
+
+    def resolve(numeroControlePNCP, parts):
+        calls.append(numeroControlePNCP)
+        if len(calls) > 1:
+            release.wait(5)
+        return {"numeroControlePNCP": numeroControlePNCP}, 200
+
+    monkeypatch.setattr(pncp_service, '_resolve_tender_details', resolve)
+    ids = [f"18428888000123-1-{n:06d}/2024" for n in range(1, 5)]
+    with patch('app.core.services.pncp_service.redis_client') as mock_redis:
+        mock_redis.get_many.return_value = [None] * (2 * len(ids))
+        response = client.post('/api/licitacoes/lote', json={"ids": ids}, buffered=False)
+        assert json.loads(next(iter(response.response)))["status"] == 200
+        response.close()
+
+    release.set()
+    time.sleep(0.05)
+    # The fetch in progress when the client left may finish; the queued ones never start
+    assert len(calls) <= 2
@@ -0,0 +1,105 @@
+"""
+Unit tests for the background health prober.
+"""
+from unittest.mock import patch, MagicMock
+import pytest
+from app.extensions.outbound_governor import WARMER, UpstreamThrottled
+from app.utils.health import HealthProber, LatencyWindow, health_prober
+
+
+@pytest.fixture
+def fresh_prober(app, monkeypatch):
+    """Force the next health request to run a new probe."""
+    monkeypatch.setattr(health_prober, '_checked_at', 0.0)
+    monkeypatch.setattr(health_prober, '_snapshot', None)
+    return health_prober
+
+
+def test_latency_window_summary():
+    """Test the rolling window keeps only the most recent results."""
+    window = LatencyWindow(size=3)
+    for latency in [500.0, 10.0, 20.0, 30.0]:
+        window.add(latency, True)
+    window.add(None, False)
+
+    summary = window.summary()
+    assert summary["samples"] == 3
+    assert summary["success_ratio"] == pytest.approx(0.667)
+    assert summary["max_ms"] == 30.0
+
+
+@patch('app.utils.health.redis_client')
+@patch('app.core.services.upstream.requests.Session.get')
+def test_health_served_from_snapshot(mock_get, mock_redis, client, fresh_prober):
+    """Test /api/health answers from the cached probe results."""
+    mock_get.return_value = MagicMock(status_code=200)
+    mock_redis.ping.return_value = True
+    mock_redis.info.return_value = {'keyspace_hits': 3, 'keyspace_misses': 1}
+
+    first = client.get('/api/health')
+    second = client.get('/api/health')
+
+    assert first.status_code == 200
+    assert first.get_json()["overall_status"] == "healthy"
+    assert second.get_json()["services"]["pncp_api"]["window"]["samples"] == 1
+    # Only the first request probed the dependencies
+    assert mock_get.call_count == 1
+    assert mock_get.call_args[0][0].endswith('/v1/orgaos/siafi')
+
+
+@patch('app.utils.health.redis_client')
+@patch('app.core.services.upstream.requests.Session.get')
+def test_readiness_when_all_dependencies_down(mock_get, mock_redis, client, fresh_prober):
+    """Test readiness fails when neither Redis nor PNCP can serve data."""
+    mock_get.side_effect = ConnectionError("unreachable")
+    mock_redis.ping.return_value = False
+
+    response = client.get('/api/health/ready')
+
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "not_ready"
+    assert client.get('/api/health').status_code == 503
+
+
+def test_liveness(client):
+    """Test liveness never touches the dependencies."""
+    with patch('app.utils.health.HealthChecker.check_pncp_api_health') as check:
+        response = client.get('/api/health/live')
+
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "alive"}
+    check.assert_not_called()
+
+
+def test_probe_thread_started_once_per_process(app):
+    """Test the probe thread is started lazily and only once per process."""
+    prober = HealthProber()
+    prober.init_app(app)
+    prober.enabled = True
+
+    with patch('app.utils.health.threading.Thread') as thread:
+        prober.ensure_started()
+        prober.ensure_started()
+
+    assert thread.call_count == 1
+    prober.stop()
+
+
+@patch('app.utils.health.redis_client')
+@patch('app.utils.health.upstream_client')
+def test_throttled_probe_keeps_last_result(mock_upstream, mock_redis, fresh_prober):
+    """Test the probe yields to user traffic and a refused check does not mark PNCP unhealthy."""
+    mock_redis.ping.return_value = True
+    mock_redis.info.return_value = {}
+    mock_upstream.get.return_value = MagicMock(status_code=200)
+    assert fresh_prober.probe()["services"]["pncp_api"]["status"] == "healthy"
+    assert mock_upstream.get.call_args.kwargs["priority"] == WARMER
+
+    mock_upstream.get.side_effect = UpstreamThrottled("budget exhausted")
+    snapshot = fresh_prober.probe()
+
+    assert snapshot["overall_status"] == "healthy"
+    assert snapshot["services"]["pncp_api"]["status"] == "healthy"
+    assert "throttled_at" in snapshot["services"]["pncp_api"]
+    assert snapshot["services"]["pncp_api"]["window"]["samples"] == 1
+    assert fresh_prober.is_ready()[0]
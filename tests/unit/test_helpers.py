@@ -7,7 +7,12 @@ from app.core.utils.helpers import (
     format_date, 
     get_modalidade_name, 
     truncate_text,
-    convert_pncp_id_to_url
+    convert_pncp_id_to_url,
+    parse_pncp_id,
+    normalize_pncp_ids,
+    build_cache_key,
+    encode_cursor,
+    decode_cursor
 )
 
 
@@ -53,4 +58,49 @@ def test_convert_pncp_id_to_url():
     assert convert_pncp_id_to_url("18428888000123-1-000178/2024") == "18428888000123/2024/178"
     
     # Test invalid format
-    assert convert_pncp_id_to_url("invalid") == "invalid"
\ No newline at end of file
+    assert convert_pncp_id_to_url("invalid") == "invalid"
+
+
+def test_build_cache_key():
+    """Test cache keys are stable and independent of parameter order."""
+    key = build_cache_key("uf_stats", {"dataInicial": "20240101", "dataFinal": "20240131"})
+    
+    assert key.startswith("uf_stats:")
+    assert key == build_cache_key("uf_stats", {"dataFinal": "20240131", "dataInicial": "20240101"})
+    assert key != build_cache_key("uf_stats", {"dataInicial": "20240101", "dataFinal": "20240201"})
+
+
+def test_cursor_round_trip():
+    """Test cursors are URL-safe, decode back to their state and cannot be forged."""
+    state = {"f": {"uf": "SP"}, "k": ["2024-03-01T10:00:00", "123-1-000001/2024"], "n": 20}
+    cursor = encode_cursor(state, "secret")
+    
+    assert all(c.isalnum() or c in '-_.' for c in cursor)
+    assert decode_cursor(cursor, "secret") == state
+    assert decode_cursor(cursor, "other-secret") is None
+    assert decode_cursor("%%%", "secret") is None
+    assert decode_cursor(encode_cursor([1, 2], "secret"), "secret") is None
+    # Changing the payload invalidates the signature
+    signature = cursor.rsplit('.', 1)[1]
+    forged = encode_cursor({"f": {"uf": "RJ"}, "k": state["k"], "n": 20}, "secret").rsplit('.', 1)[0]
+    assert decode_cursor(f"{forged}.{signature}", "secret") is None
+
+
+def test_parse_pncp_id():
+    """Test parsing a numeroControlePNCP into its API path parts."""
+    assert parse_pncp_id("18428888000123-1-000178/2024") == ("18428888000123", 2024, 178)
+    assert parse_pncp_id("18428888000123-1-000178") is None
+    assert parse_pncp_id("invalid") is None
+
+
+def test_normalize_pncp_ids():
+    """Test IDs are validated and de-duplicated in one pass."""
+    valid, invalid = normalize_pncp_ids([
+        " 18428888000123-1-000178/2024", "18428888000123-1-178/2024", "bad", 42, "11111111000111-1-000001/2023"
+    ])
+    
+    assert valid == {
+        "18428888000123-1-000178/2024": ("18428888000123", 2024, 178),
+        "11111111000111-1-000001/2023": ("11111111000111", 2023, 1)
+    }
+    assert invalid == ["bad", 42]
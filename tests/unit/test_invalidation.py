@@ -0,0 +1,49 @@
+"""
+Unit tests for cache tags and the admin purge endpoint.
+"""
+from unittest.mock import patch
+import pytest
+from app.core.utils.helpers import cache_tags
+
+HEADERS = {'X-Admin-Token': 'secret'}
+
+
+@pytest.fixture
+def admin_client(app, client):
+    """Client of an app with the admin API enabled."""
+    app.config['ADMIN_TOKEN'] = 'secret'
+    return client
+
+
+def test_cache_tags():
+    """Test entries are tagged by UF, modality and every month of their date range."""
+    params = {"uf": "sp", "codigoModalidadeContratacao": 6, "dataInicial": "20231215", "dataFinal": "20240214"}
+
+    assert cache_tags(params) == ["uf:SP", "modalidade:6", "data:202312", "data:202401", "data:202402"]
+    assert cache_tags({"dataPublicacaoPncp": "2024-02-01T09:00:00", "modalidadeId": None}) == ["data:202402"]
+    assert cache_tags({"dataFinal": "invalid"}) == []
+
+
+@patch('app.core.services.invalidation.redis_client')
+def test_purge_by_tags(mock_redis, admin_client):
+    """Test the endpoint purges each tag with the compressed variants of its entries."""
+    mock_redis.purge.side_effect = lambda tag, related: {"uf:SP": 3, "ns:open_tenders": 5}[tag]
+
+    response = admin_client.post('/api/admin/cache/purge', headers=HEADERS,
+                                 json={"tags": ["uf:SP", "ns:open_tenders", "uf:SP"]})
+
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "purged", "deleted": {"uf:SP": 3, "ns:open_tenders": 5}, "total": 8}
+    related = mock_redis.purge.call_args.kwargs["related"]
+    assert related("open_tenders:abc") == ["open_tenders:abc:br", "open_tenders:abc:gzip"]
+
+
+@patch('app.core.services.invalidation.redis_client')
+def test_purge_rejects_invalid_requests(mock_redis, admin_client, client):
+    """Test invalid tags, empty bodies and unauthenticated calls purge nothing."""
+    assert admin_client.post('/api/admin/cache/purge', headers=HEADERS,
+                             json={"tags": ["uf:SP", "*"]}).status_code == 400
+    assert admin_client.post('/api/admin/cache/purge', headers=HEADERS, json={}).status_code == 400
+    assert client.post('/api/admin/cache/purge', json={"all": True}).status_code == 403
+    mock_redis.purge.assert_not_called()
+    mock_redis.flush.assert_not_called()
@@ -0,0 +1,61 @@
+"""
+Unit tests for the JSON codec and provider.
+"""
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+import pytest
+from app.extensions.json_codec import ORJSON_AVAILABLE, FastJSONProvider, json_codec
+
+
+@pytest.fixture(params=[True, False], ids=['fast', 'stdlib'])
+def codec(request, monkeypatch):
+    """The codec with each backend (the fast one only when orjson is installed)."""
+    if request.param and not ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_codec, 'fast', request.param)
+    return json_codec
+
+
+def test_round_trip(codec):
+    """Test both backends encode the same data to equivalent compact JSON."""
+    value = {"b": [1, 2.5, None, True], "a": "Licitação", 1: "int key", "big": 2 ** 70}
+
+    encoded = codec.dumps(value)
+
+    assert b'\n' not in encoded
+    assert codec.loads(encoded) == {"b": [1, 2.5, None, True], "a": "Licitação", "1": "int key", "big": 2 ** 70}
+    assert codec.loads(encoded.decode('utf-8')) == codec.loads(encoded)
+
+
+def test_invalid_document(codec):
+    """Test invalid JSON raises ValueError with both backends."""
+    with pytest.raises(ValueError):
+        codec.loads(b'{"data": ')
+
+
+def test_provider_registered(app):
+    """Test the app serializes responses with the codec provider."""
+    assert isinstance(app.json, FastJSONProvider)
+
+    with app.test_request_context():
+        response = app.json.response({"quando": datetime(2024, 3, 1, 10, 0), "valor": Decimal("1.50")})
+
+    # Same conversions as Flask's default provider
+    assert json.loads(response.data) == {"quando": "Fri, 01 Mar 2024 10:00:00 GMT", "valor": "1.50"}
+    assert response.data.endswith(b'\n')
+
+
+@patch('app.core.services.upstream.requests.Session.get')
+def test_proxy_passthrough(mock_get, client):
+    """Test the proxy relays the upstream body without re-encoding it."""
+    body = b'{"z": 1, "a": [1.0, 2]}'
+    mock_get.return_value = MagicMock(status_code=200, content=body,
+                                      headers={'Content-Type': 'application/json;charset=UTF-8'})
+
+    response = client.get('/api/consulta/v1/contratacoes/proposta?pagina=1')
+
+    assert response.status_code == 200
+    assert response.data == body
+    assert response.headers['Content-Type'] == 'application/json;charset=UTF-8'
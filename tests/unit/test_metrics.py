@@ -0,0 +1,84 @@
+"""
+Unit tests for metrics extension.
+"""
+from unittest.mock import patch, MagicMock
+import pytest
+import requests
+from app.core.services.upstream import upstream_client
+
+pytest.importorskip('prometheus_client')
+
+
+def _sample(name, labels):
+    """Read a sample value from the default registry."""
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_endpoint(client):
+    """Test /metrics exposes the request metrics in Prometheus format."""
+    client.get('/api/test')
+    response = client.get('/metrics')
+    
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain')
+    assert b'pncp_http_request_duration_seconds' in response.data
+    assert b'endpoint="api.test_api"' in response.data
+
+
+def test_request_counter_by_route(client):
+    """Test request counter is labelled by blueprint route and status."""
+    labels = {'endpoint': 'api.test_api', 'method': 'GET', 'status': '200'}
+    before = _sample('pncp_http_requests_total', labels)
+    client.get('/api/test')
+    assert _sample('pncp_http_requests_total', labels) == before + 1
+
+
+@patch('app.core.services.upstream.requests.Session.get')
+def test_upstream_metrics(mock_get):
+    """Test upstream calls are recorded per endpoint and status."""
+    mock_get.return_value = MagicMock(status_code=404)
+    labels = {'endpoint': '/v1/test', 'status': '404'}
+    before = _sample('pncp_upstream_requests_total', labels)
+    
+    upstream_client.get('http://example.com/v1/test', '/v1/test')
+    
+    assert _sample('pncp_upstream_requests_total', labels) == before + 1
+
+
+@patch('app.core.services.upstream.requests.Session.get')
+def test_upstream_timeout_metrics(mock_get):
+    """Test upstream timeouts are recorded and re-raised."""
+    mock_get.side_effect = requests.exceptions.Timeout()
+    labels = {'endpoint': '/v1/slow', 'status': 'timeout'}
+    before = _sample('pncp_upstream_requests_total', labels)
+    
+    with pytest.raises(requests.exceptions.Timeout):
+        upstream_client.get('http://example.com/v1/slow', '/v1/slow')
+    
+    assert _sample('pncp_upstream_requests_total', labels) == before + 1
+
+
+def test_rate_limited_counter_by_route(app, monkeypatch):
+    """Test rejected requests are counted under their blueprint route, like the request metrics."""
+    from app.extensions.rate_limiter import rate_limiter
+    monkeypatch.setitem(app.config, 'TESTING', False)
+    labels = {'endpoint': 'api.test_api'}
+    before = _sample('pncp_rate_limited_total', labels)
+
+    with app.test_request_context('/api/test'):
+        view = rate_limiter.limit(max_requests=0, window=60)(lambda: "ok")
+        assert view()[1] == 429
+    assert _sample('pncp_rate_limited_total', labels) == before + 1
+
+
+def test_disabled_metrics_record_nothing(monkeypatch):
+    """Test the record helpers are no-ops with METRICS_ENABLED=False."""
+    from app.extensions.metrics import metrics
+    monkeypatch.setattr(metrics, 'enabled', False)
+    labels = {'namespace': 'disabled_ns', 'result': 'hit'}
+
+    metrics.record_cache('disabled_ns', True)
+    with metrics.track_upstream('disabled_endpoint'):
+        pass
+    assert _sample('pncp_cache_requests_total', labels) == 0
@@ -0,0 +1,144 @@
+"""
+Unit tests for the negative cache.
+"""
+import json
+from unittest.mock import patch, MagicMock
+import pytest
+import requests
+from app.core.services.negative_cache import BAD_REQUEST, EMPTY, NOT_FOUND, UPSTREAM_ERROR, negative_cache
+
+
+class FakeCache:
+    """In-memory stand-in for the Redis client, recording TTLs."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key, (None, None))[0]
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, expire=3600, tags=()):
+        self.entries[key] = (value, expire)
+        return True
+
+    def set_many(self, values, expire=3600, tags=()):
+        for key, value in values.items():
+            self.set(key, value, expire, tags)
+        return True
+
+    def ttl(self, key):
+        return self.entries[key][1] if key in self.entries else -2
+
+    def negative_ttls(self):
+        return {value["kind"]: ttl for key, (value, ttl) in self.entries.items() if key.startswith("negative:")}
+
+
+@pytest.fixture
+def cache():
+    """Fake cache shared by the service and the negative cache."""
+    fake = FakeCache()
+    with patch('app.core.services.pncp_service.redis_client', fake), \
+            patch('app.core.services.negative_cache.redis_client', fake):
+        yield fake
+
+
+def _response(status_code, payload=None):
+    response = MagicMock(status_code=status_code, text="")
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+@patch('app.core.services.upstream.requests.Session.get')
+def test_bad_request_answered_locally(mock_get, client, cache):
+    """Test a query PNCP rejected is answered from the negative cache afterwards."""
+    mock_get.return_value = _response(400, {"message": "bad"})
+
+    first = client.get('/api/licitacoes/abertas?uf=SP&codigoModalidadeContratacao=99')
+    second = client.get('/api/licitacoes/abertas?uf=SP&codigoModalidadeContratacao=99')
+
+    assert first.status_code == second.status_code == 400
+    assert second.get_json() == first.get_json() == {"error": "Invalid request parameters"}
+    assert mock_get.call_count == 1
+    assert cache.negative_ttls() == {BAD_REQUEST: negative_cache.ttls[BAD_REQUEST]}
+
+
+@patch('app.core.services.upstream.requests.Session.get')
+def test_empty_result_cached_briefly(mock_get, client, cache):
+    """Test an empty result is served as an empty page and only remembered briefly."""
+    mock_get.return_value = _response(204)
+
+    response = client.get('/api/licitacoes/abertas?uf=AC')
+
+    assert response.status_code == 200
+    assert response.get_json()["data"] == []
+    assert cache.negative_ttls() == {EMPTY: negative_cache.ttls[EMPTY]}
+    assert not [key for key in cache.entries if key.startswith("open_tenders:")]
+
+
+@patch('app.core.services.upstream.requests.Session.get', side_effect=requests.exceptions.Timeout("slow"))
+def test_stats_outage_not_fabricated(mock_get, client, cache):
+    """Test a failing stats query returns the error, not placeholder data, and is retried only after the TTL."""
+    first = client.get('/api/estatisticas/uf')
+    second = client.get('/api/estatisticas/uf')
+
+    assert first.status_code == second.status_code == 504
+    assert "error" in second.get_json()
+    assert mock_get.call_count == 1
+    assert cache.negative_ttls() == {UPSTREAM_ERROR: negative_cache.ttls[UPSTREAM_ERROR]}
+    # Nothing is cached as if it were data
+    assert not [key for key in cache.entries if not key.startswith("negative:")]
+
+
+@patch('app.core.services.upstream.requests.Session.get')
+def test_missing_tender_answered_locally(mock_get, client, cache):
+    """Test a tender PNCP does not know is not looked up again within the TTL."""
+    mock_get.return_value = _response(404)
+    url = '/api/licitacoes/detalhes/18428888000123-1-000178/2024'
+
+    assert client.get(url).status_code == 404
+    calls = mock_get.call_count
+    response = client.get(url)
+
+    assert response.status_code == 404
+    assert response.get_json()["pncp_web_url"].endswith("/18428888000123/2024/178")
+    assert mock_get.call_count == calls
+    assert cache.negative_ttls() == {NOT_FOUND: negative_cache.ttls[NOT_FOUND]}
+
+
+STATS_ROUTES = ['modalidades', 'uf', 'tipo_orgao', 'contratos', 'atas', 'planos']
+
+
+@pytest.mark.parametrize('route', STATS_ROUTES)
+@patch('app.core.services.upstream.requests.Session.get')
+def test_stats_error_status_cached_by_kind(mock_get, route, client, cache):
+    """Test every stats route answers PNCP error statuses and 204 from the negative cache."""
+    mock_get.return_value = _response(500)
+    assert client.get(f'/api/estatisticas/{route}?dataInicial=20240101&ano=2021').status_code == 503
+    assert client.get(f'/api/estatisticas/{route}?dataInicial=20240101&ano=2021').status_code == 503
+
+    mock_get.return_value = _response(400)
+    assert client.get(f'/api/estatisticas/{route}?dataInicial=20240102&ano=2022').status_code == 400
+
+    mock_get.return_value = _response(204)
+    response = client.get(f'/api/estatisticas/{route}?dataInicial=20240103&ano=2023')
+    assert response.status_code == 200
+    assert response.get_json() == []
+
+    assert mock_get.call_count == 3
+    assert sorted(cache.negative_ttls()) == sorted([UPSTREAM_ERROR, BAD_REQUEST, EMPTY])
+
+
+@pytest.mark.parametrize('route', STATS_ROUTES)
+@patch('app.core.services.upstream.requests.Session.get')
+def test_stats_unreadable_payload_not_fabricated(mock_get, route, client, cache):
+    """Test a 200 whose payload cannot be read is a short-lived 502, not placeholder stats."""
+    mock_get.return_value = _response(200, {"unexpected": True})
+
+    response = client.get(f'/api/estatisticas/{route}')
+
+    assert response.status_code == 502
+    assert cache.negative_ttls() == {UPSTREAM_ERROR: negative_cache.ttls[UPSTREAM_ERROR]}
+    assert not [key for key in cache.entries if not key.startswith("negative:")]
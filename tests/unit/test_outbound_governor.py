@@ -0,0 +1,73 @@
+"""
+Unit tests for the fleet-wide outbound budget.
+"""
+from unittest.mock import patch, MagicMock, PropertyMock
+import pytest
+from app.core.services.upstream import UpstreamClient
+from app.extensions.admission import admission
+from app.extensions.outbound_governor import (
+    BACKFILL, BUCKET_KEY, INTERACTIVE, TOKEN_BUCKET_SCRIPT, WARMER, OutboundGovernor, UpstreamThrottled,
+    outbound_governor
+)
+
+
+@pytest.fixture
+def bucket():
+    """Redis client whose token bucket script replies are set by the test."""
+    with patch('app.extensions.outbound_governor.redis_client') as mock_redis:
+        yield mock_redis.run_script
+
+
+def test_priority_classes_leave_their_reserve(bucket):
+    """Test only interactive calls may drain the bucket; lower classes keep a larger reserve."""
+    bucket.return_value = [1, "10", "0"]
+    governor = OutboundGovernor()
+
+    for priority in (INTERACTIVE, WARMER, BACKFILL):
+        governor.acquire(priority)
+    reserves = [call.args[2][2] for call in bucket.call_args_list]
+    assert reserves == [0.0, 0.3 * governor.burst, 0.6 * governor.burst]
+    assert bucket.call_args.args[:2] == (TOKEN_BUCKET_SCRIPT, [BUCKET_KEY])
+
+    with pytest.raises(ValueError):
+        governor.acquire("urgent")
+
+
+@patch('app.extensions.outbound_governor.time.sleep')
+def test_background_calls_wait_for_a_token(mock_sleep, bucket):
+    """Test a call without a token sleeps until the bucket refills, within its wait."""
+    bucket.side_effect = [[0, "5.2", "0.5"], [1, "5.1", "0"]]
+    OutboundGovernor().acquire(WARMER)
+
+    assert bucket.call_count == 2
+    assert 0.5 <= mock_sleep.call_args.args[0] <= 0.6
+
+
+def test_interactive_calls_fail_fast_and_redis_outage_lets_calls_through(bucket):
+    """Test interactive calls give up past GOVERNOR_MAX_WAIT and a Redis outage bypasses the budget."""
+    governor = OutboundGovernor()
+    bucket.return_value = [0, "0.1", "5"]
+    with pytest.raises(UpstreamThrottled):
+        governor.acquire(INTERACTIVE)
+    assert bucket.call_count == 1
+
+    bucket.return_value = None
+    governor.acquire(BACKFILL)
+
+
+def test_throttled_request_is_shed(client, bucket, monkeypatch):
+    """Test a user request refused a token is shed by admission control without calling PNCP."""
+    monkeypatch.setattr(outbound_governor, 'enabled', True)
+    monkeypatch.setattr(admission, 'enabled', True)
+    bucket.return_value = [0, "0", "5"]
+    session = MagicMock()
+
+    with patch.object(UpstreamClient, 'session', new_callable=PropertyMock, return_value=session), \
+            patch('app.extensions.admission.redis_client') as mock_cache:
+        mock_cache.get_bytes.return_value = None
+        response = client.get('/api/pncp/v1/orgaos')
+
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+    session.get.assert_not_called()
+    assert admission.worker.active == 0
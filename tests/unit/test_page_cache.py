@@ -0,0 +1,49 @@
+"""
+Unit tests for the rendered page cache.
+"""
+import gzip
+from unittest.mock import patch
+import pytest
+from app.extensions import page_cache
+
+
+@pytest.fixture
+def cached_client(app, monkeypatch):
+    """Client with the page cache enabled (it is off in debug/testing)."""
+    monkeypatch.setattr(page_cache, 'enabled', True)
+    monkeypatch.setattr(page_cache, '_pages', {})
+    return app.test_client()
+
+
+def test_page_rendered_once(cached_client):
+    """Test pages are rendered on first use and then served from memory."""
+    with patch('app.extensions.page_cache.render_template', return_value='<html>ok</html>') as render:
+        first = cached_client.get('/licitacoes')
+        second = cached_client.get('/licitacoes')
+
+    assert render.call_count == 1
+    assert first.data == second.data == b'<html>ok</html>'
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert 'Last-Modified' in first.headers
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+
+def test_page_precompressed(cached_client):
+    """Test the precompressed variant is served with its own ETag."""
+    plain = cached_client.get('/')
+    compressed = cached_client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+
+
+def test_page_not_modified(cached_client):
+    """Test revalidation with a current ETag returns 304 without a body."""
+    etag = cached_client.get('/estatisticas').headers['ETag']
+
+    response = cached_client.get('/estatisticas', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
@@ -0,0 +1,75 @@
+"""
+Unit tests for profiler extension.
+"""
+import os
+import time
+import threading
+from app.extensions.profiler import SamplingProfiler, profiler
+
+
+def _busy_loop(seconds):
+    """Burn CPU for a while."""
+    end = time.time() + seconds
+    while time.time() < end:
+        sum(range(1000))
+
+
+def test_sampling_profiler_collapsed_output():
+    """Test sampled stacks are written in collapsed format."""
+    sampler = SamplingProfiler(interval=0.001, thread_ids={threading.get_ident()}).start()
+    _busy_loop(0.1)
+    sampler.stop()
+    
+    assert sampler.sample_count > 0
+    output = sampler.collapsed()
+    assert '_busy_loop' in output
+    stack, count = output.splitlines()[0].rsplit(' ', 1)
+    assert ';' in stack
+    assert int(count) > 0
+
+
+def test_admin_endpoints_require_token(app, client):
+    """Test profiler endpoints reject requests without a valid admin token."""
+    app.config['ADMIN_TOKEN'] = 'secret'
+    
+    assert client.get('/api/admin/profiler/captures').status_code == 403
+    response = client.get('/api/admin/profiler/captures', headers={'X-Admin-Token': 'wrong'})
+    assert response.status_code == 403
+
+
+def test_admin_endpoints_disabled_without_token(client):
+    """Test admin API is disabled when no token is configured."""
+    assert client.get('/api/admin/profiler/captures').status_code == 404
+
+
+def test_profile_request_and_download(app, client, tmp_path, monkeypatch):
+    """Test a request profiled on demand can be listed and downloaded."""
+    app.config['ADMIN_TOKEN'] = 'secret'
+    monkeypatch.setattr(profiler, 'output_dir', str(tmp_path))
+    headers = {'X-Admin-Token': 'secret'}
+    
+    client.get('/api/test', headers={**headers, 'X-Profile': '1'})
+    
+    captures = client.get('/api/admin/profiler/captures', headers=headers).get_json()['captures']
+    assert captures
+    assert captures[0]['name'].startswith('request-api.test_api-')
+    
+    response = client.get(f"/api/admin/profiler/captures/{captures[0]['name']}", headers=headers)
+    assert response.status_code == 200
+    assert b' ' in response.data
+
+
+def test_save_keeps_newest_captures(tmp_path, monkeypatch):
+    """Test saving a capture deletes the oldest ones beyond PROFILER_MAX_CAPTURES."""
+    monkeypatch.setattr(profiler, 'output_dir', str(tmp_path))
+    monkeypatch.setattr(profiler, 'max_captures', 2)
+    for age, name in enumerate(("newer-1.collapsed", "older-1.collapsed")):
+        path = tmp_path / name
+        path.write_text("main 1\n")
+        os.utime(path, (time.time() - 60 * (age + 1),) * 2)
+
+    sampler = SamplingProfiler()
+    sampler.samples["main;handler"] = 3
+    name = profiler.save(sampler, 'window')
+
+    assert sorted(os.listdir(tmp_path)) == sorted([name, "newer-1.collapsed"])
@@ -0,0 +1,52 @@
+"""
+Unit tests for field projection.
+"""
+import json
+from unittest.mock import patch, MagicMock
+import pytest
+from app.core.utils.projection import FIELD_PRESETS, compile_fields, parse_fields, project
+
+TENDER = {
+    "numeroControlePNCP": "18428888000123-1-000178/2024",
+    "objetoCompra": "Aquisição de material",
+    "valorTotalEstimado": 1500.0,
+    "orgaoEntidade": {"cnpj": "18428888000123", "razaoSocial": "Prefeitura", "poderId": "E"},
+    "unidadeOrgao": {"ufSigla": "SP", "municipioNome": "Campinas", "codigoUnidade": "1"},
+    "amparoLegal": {"codigo": 1, "nome": "Lei 14.133/2021", "descricao": "Pregão"}
+}
+
+
+def test_parse_fields():
+    """Test presets and paths are combined into a canonical tuple."""
+    assert parse_fields(None) is None
+    assert parse_fields("full") is None
+    assert parse_fields("list") == tuple(sorted(FIELD_PRESETS['list']))
+    assert parse_fields("objetoCompra, amparoLegal.nome") == ("amparoLegal.nome", "objetoCompra")
+    with pytest.raises(ValueError):
+        parse_fields("objetoCompra,../etc")
+
+
+def test_project_nested_fields():
+    """Test nested paths keep only the selected leaves and a parent path wins."""
+    tree = compile_fields(("objetoCompra", "orgaoEntidade.razaoSocial", "unidadeOrgao", "unidadeOrgao.ufSigla"))
+
+    assert project([TENDER], tree) == [{
+        "objetoCompra": "Aquisição de material",
+        "orgaoEntidade": {"razaoSocial": "Prefeitura"},
+        "unidadeOrgao": TENDER["unidadeOrgao"]
+    }]
+
+
+@patch('app.core.services.upstream.requests.Session.get')
+def test_open_tenders_list_preset(mock_get, client):
+    """Test the list preset trims records but keeps the paging metadata."""
+    mock_response = MagicMock(status_code=200)
+    mock_response.content = json.dumps({"data": [TENDER], "totalRegistros": 1, "totalPaginas": 1}).encode()
+    mock_get.return_value = mock_response
+
+    data = client.get('/api/licitacoes/abertas?fields=list&uf=RJ').get_json()
+
+    assert data["totalRegistros"] == 1
+    assert "amparoLegal" not in data["data"][0]
+    assert data["data"][0]["orgaoEntidade"] == {"cnpj": "18428888000123", "razaoSocial": "Prefeitura"}
+    assert client.get('/api/licitacoes/abertas?fields=bad-field').status_code == 400
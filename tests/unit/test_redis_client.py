@@ -0,0 +1,227 @@
+"""
+Unit tests for the Redis client: multi-key operations, pipelines and reconnection.
+"""
+import importlib
+import json
+from unittest.mock import MagicMock
+import pytest
+import redis
+from app.extensions.redis_client import RedisClient
+
+# The package re-exports the client instance under the module's name
+redis_client_module = importlib.import_module('app.extensions.redis_client')
+
+
+@pytest.fixture
+def cache():
+    """Redis client wrapper over a mocked connection."""
+    client = RedisClient()
+    client.redis_client = MagicMock()
+    return client
+
+
+def test_get_many_decodes_in_key_order(cache):
+    """Test get_many issues one MGET and decodes hits."""
+    cache.redis_client.mget.return_value = [b'{"a": 1}', None]
+
+    assert cache.get_many(["ns:1", "ns:2"]) == [{"a": 1}, None]
+    cache.redis_client.mget.assert_called_once_with(["ns:1", "ns:2"])
+
+
+def test_set_many_per_key_ttl(cache):
+    """Test set_many queues one SETEX per key on a single pipeline."""
+    pipe = cache.redis_client.pipeline.return_value
+    pipe.execute.return_value = [True, True]
+
+    assert cache.set_many({"ns:1": {"a": 1}, "ns:2": [2]}, {"ns:1": 60, "ns:2": 120})
+
+    cache.redis_client.pipeline.assert_called_once_with(transaction=False)
+    calls = [call.args for call in pipe.setex.call_args_list]
+    assert [(key, ttl, json.loads(value)) for key, ttl, value in calls] == [
+        ("ns:1", 60, {"a": 1}), ("ns:2", 120, [2])
+    ]
+    pipe.execute.assert_called_once()
+
+
+def test_delete_many_single_command(cache):
+    """Test delete_many removes every key with one DEL."""
+    cache.redis_client.delete.return_value = 2
+
+    assert cache.delete_many(["ns:1", "ns:2", "ns:3"]) == 2
+    cache.redis_client.delete.assert_called_once_with("ns:1", "ns:2", "ns:3")
+
+
+def test_pipeline_results(cache):
+    """Test pipeline results are decoded for reads and failed commands yield None."""
+    pipe = cache.redis_client.pipeline.return_value
+    pipe.execute.return_value = [b'{"a": 1}', 42, ValueError("WRONGTYPE")]
+
+    with cache.pipeline(transaction=True) as batch:
+        batch.get("ns:1").ttl("ns:1").get("ns:2")
+
+    assert batch.results == [{"a": 1}, 42, None]
+    cache.redis_client.pipeline.assert_called_once_with(transaction=True)
+    pipe.reset.assert_called_once()
+
+
+def test_pipeline_not_sent_when_block_raises(cache):
+    """Test a block that raises sends nothing."""
+    pipe = cache.redis_client.pipeline.return_value
+
+    with pytest.raises(RuntimeError):
+        with cache.pipeline() as batch:
+            batch.set("ns:1", 1)
+            raise RuntimeError("boom")
+
+    pipe.execute.assert_not_called()
+    pipe.reset.assert_called_once()
+
+
+def test_without_connection():
+    """Test the multi-key operations degrade like the single-key ones."""
+    cache = RedisClient()
+
+    assert cache.get_many(["ns:1"]) == [None]
+    assert not cache.set_many({"ns:1": 1})
+    assert cache.delete_many(["ns:1"]) == 0
+    with cache.pipeline() as batch:
+        batch.get("ns:1").set("ns:2", 2)
+    assert batch.results == [None, None]
+
+
+@pytest.fixture
+def flaky_redis(app, monkeypatch):
+    """Client initialized against a Redis that is down at startup, and a controllable clock."""
+    connection = MagicMock()
+    connection.ping.side_effect = redis.ConnectionError("refused")
+    clock = [1000.0]
+    monkeypatch.setattr(redis_client_module.redis, 'Redis', MagicMock(return_value=connection))
+    monkeypatch.setattr(redis_client_module.time, 'monotonic', lambda: clock[0])
+    client = RedisClient(app)
+    return client, connection, clock
+
+
+def test_reconnects_with_backoff(flaky_redis):
+    """Test a Redis that was down at startup is retried lazily with exponential backoff."""
+    client, connection, clock = flaky_redis
+    assert not client.available and connection.ping.call_count == 1
+
+    # Within the backoff window the cache stays off without contacting Redis
+    assert client.get("ns:1") is None
+    assert connection.ping.call_count == 1
+
+    clock[0] += client.backoff_min
+    assert client.get("ns:1") is None
+    assert connection.ping.call_count == 2
+
+    # The delay doubled after the second failure
+    clock[0] += client.backoff_min
+    client.get("ns:1")
+    assert connection.ping.call_count == 2
+
+    connection.ping.side_effect = None
+    connection.get.return_value = b'{"a": 1}'
+    clock[0] += client.backoff_min
+    assert client.get("ns:1") == {"a": 1}
+    assert client.available
+
+
+def test_connection_error_disables_cache(flaky_redis):
+    """Test a connection error in use disables the cache until the backoff expires."""
+    client, connection, clock = flaky_redis
+    connection.ping.side_effect = None
+    clock[0] += client.backoff_min
+    assert client.ping()
+
+    connection.setex.side_effect = redis.ConnectionError("reset by peer")
+    assert not client.set("ns:1", 1)
+    assert not client.available
+    assert client.raw_client is None
+
+    client.reset()
+    assert client.ping()
+    connection.connection_pool.reset.assert_called()
+
+
+def test_exhausted_pool_only_misses(flaky_redis):
+    """Test a pool checkout timeout misses that call and keeps the cache enabled."""
+    client, connection, clock = flaky_redis
+    connection.ping.side_effect = None
+    clock[0] += client.backoff_min
+    assert client.ping()
+
+    pool = redis_client_module._BlockingPool(max_connections=1, timeout=0.01)
+    pool.pool.get_nowait()
+    with pytest.raises(redis_client_module.PoolExhausted):
+        pool.get_connection()
+
+    connection.get.side_effect = redis_client_module.PoolExhausted("No connection available.")
+    assert client.get("ns:1") is None
+    assert client.available
+
+
+def test_tagged_set_indexes_key(cache):
+    """Test a tagged set adds the key to each tag set in the same pipeline."""
+    pipe = cache.redis_client.pipeline.return_value
+    pipe.execute.return_value = [True, 1, True, 0, True]
+
+    assert cache.set("ns:1", {"a": 1}, 600, ["uf:SP", "data:202403"])
+
+    assert [call.args for call in pipe.sadd.call_args_list] == [("tag:uf:SP", "ns:1"), ("tag:data:202403", "ns:1")]
+    assert [call.args for call in pipe.expire.call_args_list] == [
+        ("tag:uf:SP", cache.tag_ttl), ("tag:data:202403", cache.tag_ttl)
+    ]
+
+
+def test_set_bytes_records_tags(cache):
+    """Test a tagged binary value is added to its tag sets in the same round-trip."""
+    cache.raw_client = MagicMock()
+    pipe = cache.raw_client.pipeline.return_value
+    pipe.execute.return_value = [True, 1, True]
+
+    assert cache.set_bytes("stale:a", b"body", 60, ["uf:SP"])
+    pipe.setex.assert_called_once_with("stale:a", 60, b"body")
+    pipe.sadd.assert_called_once_with("tag:uf:SP", "stale:a")
+    pipe.expire.assert_called_once_with("tag:uf:SP", cache.tag_ttl)
+
+
+def test_purge_tag_in_batches(cache):
+    """Test a tag purge unlinks its members and their related keys in batches, then the tag set."""
+    cache.purge_batch_size = 4
+    cache.redis_client.sscan_iter.return_value = iter(["ns:1", "ns:2", "ns:3"])
+    cache.redis_client.unlink.side_effect = lambda *keys: len(keys)
+
+    deleted = cache.purge("uf:SP", related=lambda key: [f"{key}:gzip"])
+
+    assert [call.args for call in cache.redis_client.unlink.call_args_list] == [
+        ("ns:1", "ns:1:gzip", "ns:2", "ns:2:gzip"), ("ns:3", "ns:3:gzip"), ("tag:uf:SP",)
+    ]
+    assert deleted == 6
+
+
+def test_purge_namespace_and_flush_keep_protected(cache):
+    """Test namespace purges scan by pattern and a flush skips protected namespaces."""
+    cache.protected_namespaces = ("ratelimit",)
+    cache.redis_client.scan_iter.side_effect = lambda **kwargs: iter(["ns:1", "ratelimit:x", "other:2"])
+    cache.redis_client.unlink.side_effect = lambda *keys: len(keys)
+
+    cache.purge("ns:ns")
+    assert cache.redis_client.scan_iter.call_args.kwargs["match"] == "ns:*"
+
+    assert cache.flush()
+    assert cache.redis_client.unlink.call_args.args == ("ns:1", "other:2")
+    cache.redis_client.flushdb.assert_not_called()
+
+
+def test_pipeline_counters_and_lists(cache):
+    """Test counters and capped lists are queued with their upkeep, and list reads are decoded."""
+    pipe = cache.redis_client.pipeline.return_value
+    pipe.execute.return_value = [3, True, 2, True, True, [b'"b"', b'"a"']]
+
+    with cache.pipeline() as batch:
+        batch.incr("ns:count", 2, 60).push("ns:list", ["a", "b"], 10, 60).lrange("ns:list")
+
+    assert batch.results == [3, 2, ["b", "a"]]
+    pipe.incrby.assert_called_once_with("ns:count", 2)
+    pipe.ltrim.assert_called_once_with("ns:list", 0, 9)
+    assert pipe.lpush.call_args.args == ("ns:list", b'"a"', b'"b"')
@@ -0,0 +1,47 @@
+"""
+Unit tests for request timing extension.
+"""
+import logging
+from app.extensions.request_timing import RequestTiming, request_timing
+
+
+def test_server_timing_header(client):
+    """Test responses carry a Server-Timing header with the serialize phase."""
+    response = client.get('/api/test')
+    header = response.headers['Server-Timing']
+    
+    assert 'serialize;dur=' in header
+    assert 'total;dur=' in header
+
+
+def test_format_header():
+    """Test Server-Timing header formatting."""
+    header = RequestTiming.format_header({'cache': 1.234, 'custom': 2.0}, 10.0)
+    
+    assert header == 'cache;dur=1.23;desc="Redis cache", custom;dur=2.00, total;dur=10.00'
+
+
+def test_phases_accumulate(app):
+    """Test repeated phases are summed within a request."""
+    with app.test_request_context('/api/test'):
+        app.preprocess_request()
+        request_timing.record('cache', 1.5)
+        request_timing.record('cache', 2.5)
+        
+        from flask import g
+        assert g.request_timings['cache'] == 4.0
+
+
+def test_slow_request_log(app, client, caplog):
+    """Test requests over the threshold are written to the slow log."""
+    request_timing.slow_threshold_ms = 0
+    try:
+        with caplog.at_level(logging.WARNING, logger='app.slow_requests'):
+            client.get('/api/test')
+    finally:
+        request_timing.slow_threshold_ms = app.config['SLOW_REQUEST_THRESHOLD_MS']
+    
+    records = [r for r in caplog.records if r.name == 'app.slow_requests']
+    assert records
+    assert records[0].endpoint == 'api.test_api'
+    assert 'serialize' in records[0].phases_ms
@@ -0,0 +1,192 @@
+"""
+Unit tests for saved searches and their matcher.
+"""
+from unittest.mock import patch
+import pytest
+from app.core.services.saved_searches import SavedSearches, SearchIndex, tokenize
+
+CLIENT = {"X-Client-Id": "0f8e2a4c-6b1d-4e3f-9a7c-2d5b8e1f4a6c"}
+
+NOTEBOOKS_SP = {
+    "numeroControlePNCP": "1-1-000001/2024", "objetoCompra": "Aquisição de Notebooks para a Secretaria",
+    "unidadeOrgao": {"ufSigla": "SP"}, "modalidadeId": 6, "valorTotalEstimado": 250000.0
+}
+OBRA_MG = {
+    "numeroControlePNCP": "2-1-000002/2024", "objetoCompra": "Reforma da escola municipal",
+    "unidadeOrgao": {"ufSigla": "MG"}, "modalidadeId": 1, "valorTotalEstimado": 3500000.0
+}
+
+
+class FakeRedis:
+    """Enough of the Redis client for saved searches, in memory."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.lists = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def get_many(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value, expire=3600, tags=()):
+        self.values[key] = value
+        return True
+
+    def delete_many(self, keys):
+        return sum(self.values.pop(key, None) is not None or self.lists.pop(key, None) is not None for key in keys)
+
+    def members(self, key):
+        return list(self.sets.get(key, ()))
+
+    def add_members(self, key, members, expire):
+        added = [member for member in members if member not in self.sets.setdefault(key, set())]
+        self.sets[key].update(members)
+        return added
+
+    def remove_members(self, key, members):
+        removed = self.sets.get(key, set()) & set(members)
+        self.sets.get(key, set()).difference_update(removed)
+        return len(removed)
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Applies the queued commands when the block exits."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.results = [command() for command in self.commands]
+
+    def _queue(self, command):
+        self.commands.append(command)
+        return self
+
+    def get(self, key):
+        return self._queue(lambda: self.redis.values.get(key))
+
+    def expire(self, key, ttl):
+        return self._queue(lambda: True)
+
+    def delete(self, *keys):
+        return self._queue(lambda: self.redis.delete_many(keys))
+
+    def incr(self, key, amount=1, expire=None):
+        def incr():
+            self.redis.values[key] = self.redis.values.get(key, 0) + amount
+            return self.redis.values[key]
+        return self._queue(incr)
+
+    def push(self, key, values, max_length, expire):
+        def push():
+            self.redis.lists[key] = (list(reversed(values)) + self.redis.lists.get(key, []))[:max_length]
+            return len(self.redis.lists[key])
+        return self._queue(push)
+
+    def lrange(self, key, start=0, stop=-1):
+        return self._queue(lambda: list(self.redis.lists.get(key, [])))
+
+
+@pytest.fixture
+def fake_redis():
+    """Fake Redis behind the saved searches service."""
+    fake = FakeRedis()
+    with patch('app.core.services.saved_searches.redis_client', fake):
+        yield fake
+
+
+def test_tokenize_folds_case_and_accents():
+    """Test keyword tokens are lowercase, accent-free and skip short words."""
+    assert tokenize("Aquisição de NOTEBOOKS") == {"aquisicao", "notebooks"}
+
+
+def test_index_anchors_on_most_selective_condition():
+    """Test each search is posted once, under its most selective condition."""
+    assert SearchIndex.anchors({"palavraChave": "notebooks novos", "uf": "SP"}) == [("token", "notebooks")]
+    assert SearchIndex.anchors({"uf": "SP", "codigoModalidadeContratacao": "6"}) == [("uf", "SP")]
+    assert SearchIndex.anchors({"valorMinimo": 1000.0, "valorMaximo": 50000.0}) == [("valor", 3), ("valor", 4)]
+    assert SearchIndex.anchors({}) == [("all", None)]
+
+
+def test_index_matches_only_through_postings():
+    """Test candidates come from the tender's postings and are verified against every filter."""
+    index = SearchIndex()
+    index.add("notebooks", {"palavraChave": "notebooks", "uf": "SP"})
+    index.add("notebooks-mg", {"palavraChave": "notebooks", "uf": "MG"})
+    index.add("pregao", {"codigoModalidadeContratacao": "6"})
+    index.add("grandes", {"valorMinimo": 1000000.0})
+    index.add("tudo", {})
+
+    assert index.match(NOTEBOOKS_SP) == {"notebooks", "pregao", "tudo"}
+    assert index.match(OBRA_MG) == {"grandes", "tudo"}
+
+    # Searches anchored elsewhere are never even considered
+    with patch.object(SearchIndex, 'verify', wraps=SearchIndex.verify) as verify:
+        index.match(OBRA_MG)
+    assert {call.args[0].get('palavraChave') for call in verify.call_args_list} == {None}
+
+    index.remove("tudo")
+    assert index.match(OBRA_MG) == {"grandes"}
+
+
+def test_new_tenders_counted_until_viewed(client, fake_redis):
+    """Test saved searches count matching new tenders and viewing one returns and resets them."""
+    response = client.post('/api/buscas', headers=CLIENT,
+                           json={"name": "Notebooks SP", "filters": {"uf": "sp", "palavraChave": "notebooks"}})
+    assert response.status_code == 201
+    search_id = response.get_json()["id"]
+    client.post('/api/buscas', headers=CLIENT, json={"name": "Obras", "filters": {"valorMinimo": "1000000"}})
+
+    service = SavedSearches()
+    assert service.ingest([NOTEBOOKS_SP, OBRA_MG]) == 2
+    assert service.ingest([dict(NOTEBOOKS_SP, numeroControlePNCP="3-1-000003/2024")]) == 1
+
+    listing = {search["name"]: search for search in client.get('/api/buscas', headers=CLIENT).get_json()}
+    assert listing["Notebooks SP"]["novas_count"] == 2
+    assert listing["Obras"]["novas_count"] == 1
+    assert listing["Notebooks SP"]["filters"] == {"uf": "SP", "palavraChave": "notebooks"}
+
+    viewed = client.post(f'/api/buscas/{search_id}/visto', headers=CLIENT).get_json()
+    assert viewed["novas"] == ["3-1-000003/2024", "1-1-000001/2024"]
+    listing = {search["name"]: search for search in client.get('/api/buscas', headers=CLIENT).get_json()}
+    assert listing["Notebooks SP"]["novas_count"] == 0
+
+
+def test_searches_belong_to_their_client(client, fake_redis):
+    """Test another browser can neither see nor change a search, and bad input is rejected."""
+    search_id = client.post('/api/buscas', headers=CLIENT, json={"filters": {"uf": "SP"}}).get_json()["id"]
+    other = {"X-Client-Id": "ffffffff-ffff-4fff-8fff-ffffffffffff"}
+
+    assert client.get('/api/buscas', headers=other).get_json() == []
+    assert client.post(f'/api/buscas/{search_id}/visto', headers=other).status_code == 404
+    assert client.delete(f'/api/buscas/{search_id}', headers=other).status_code == 404
+    assert client.get('/api/buscas').status_code == 400
+    assert client.post('/api/buscas', headers=CLIENT, json={"filters": {"uf": "São Paulo"}}).status_code == 400
+    assert client.post('/api/buscas', headers=CLIENT,
+                       json={"filters": {"valorMinimo": 10, "valorMaximo": 1}}).status_code == 400
+
+    assert client.delete(f'/api/buscas/{search_id}', headers=CLIENT).status_code == 200
+
+
+def test_expired_searches_stop_matching(client, fake_redis):
+    """Test a search that expired gets no new counters and leaves the index of every worker."""
+    search_id = client.post('/api/buscas', headers=CLIENT, json={"filters": {"uf": "SP"}}).get_json()["id"]
+    service = SavedSearches()
+    assert service.ingest([NOTEBOOKS_SP]) == 1
+
+    del fake_redis.values[SavedSearches.key(search_id)]
+    assert service.ingest([NOTEBOOKS_SP]) == 0
+    assert SavedSearches.counter_key(search_id) not in fake_redis.values
+    assert fake_redis.members("saved_search:all") == []
+    assert len(service._index) == 0
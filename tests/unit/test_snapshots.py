@@ -0,0 +1,95 @@
+"""
+Unit tests for cursor pagination over open tender snapshots.
+"""
+import json
+from collections import OrderedDict
+from unittest.mock import patch, MagicMock
+import pytest
+import requests
+from app.core.services.pncp_service import current_config
+from app.core.services.snapshots import TenderSnapshot, sort_key, tender_snapshots
+from app.core.utils.helpers import encode_cursor
+
+RECORDS = [
+    {"numeroControlePNCP": f"00000000000{i:03d}-1-{i:06d}/2024",
+     "dataEncerramentoProposta": f"2024-03-{i % 28 + 1:02d}T10:00:00"}
+    for i in range(95)
+]
+
+
+def _upstream_page(url, params=None, timeout=None, stream=None):
+    """Fake PNCP listing page (records in upstream order, not sorted)."""
+    page, size = params['pagina'], params['tamanhoPagina']
+    response = MagicMock(status_code=200)
+    response.content = json.dumps({
+        "data": RECORDS[(page - 1) * size:page * size],
+        "totalPaginas": -(-len(RECORDS) // size)
+    }).encode()
+    return response
+
+
+@pytest.fixture
+def empty_snapshots(monkeypatch):
+    """Start without any snapshot held by this worker."""
+    monkeypatch.setattr(tender_snapshots, '_local', OrderedDict())
+    return tender_snapshots
+
+
+def test_page_after_uses_sort_key():
+    """Test pages continue after the last key, not at an offset."""
+    records = sorted(RECORDS, key=sort_key)
+    snapshot = TenderSnapshot(records, 0, False)
+
+    first = snapshot.page_after(None, 10)
+    assert first == records[:10]
+    # A record inserted before the cursor does not shift the next page
+    rebuilt = TenderSnapshot(sorted(RECORDS + [{"numeroControlePNCP": "0", "dataEncerramentoProposta": "2024-01-01"}],
+                                    key=sort_key), 0, False)
+    assert rebuilt.page_after(sort_key(first[-1]), 10) == records[10:20]
+
+
+@patch('app.core.services.upstream.requests.Session.get', side_effect=_upstream_page)
+def test_cursor_walk(mock_get, client, empty_snapshots):
+    """Test a cursor walk returns every record once, in order, from one snapshot."""
+    seen = []
+    response = client.get('/api/licitacoes/abertas?cursor=&tamanhoPagina=20&uf=SP').get_json()
+    seen.extend(response["data"])
+    while response["proximoCursor"]:
+        response = client.get(f'/api/licitacoes/abertas?cursor={response["proximoCursor"]}').get_json()
+        seen.extend(response["data"])
+
+    assert seen == sorted(RECORDS, key=sort_key)
+    assert response["totalRegistros"] == len(RECORDS)
+    # Two upstream pages of 50 for the snapshot, none for the following pages
+    assert mock_get.call_count == 2
+    assert all(call.kwargs['params']['uf'] == 'SP' for call in mock_get.call_args_list)
+
+
+def test_invalid_cursor(client):
+    """Test malformed, forged and mistyped cursors are rejected."""
+    assert client.get('/api/licitacoes/abertas?cursor=not-a-cursor').status_code == 400
+    for state in (
+        {"f": {}, "k": ["only-one"], "n": 10},
+        {"f": {}, "k": [1, 2], "n": 10},
+        {"f": {}, "k": ["a", "b"], "n": "10"},
+        {"f": {"tamanhoPagina": "500"}, "k": ["a", "b"], "n": 10},
+        {"f": {"uf": ["SP"]}, "k": ["a", "b"], "n": 10},
+    ):
+        cursor = encode_cursor(state, current_config.SECRET_KEY)
+        assert client.get(f'/api/licitacoes/abertas?cursor={cursor}').status_code == 400
+
+    # Well formed, but not signed by this server
+    forged = encode_cursor({"f": {"uf": "SP"}, "k": ["a", "b"], "n": 10}, "not-the-secret")
+    assert client.get(f'/api/licitacoes/abertas?cursor={forged}').status_code == 400
+
+
+@patch('app.core.services.upstream.requests.Session.get', side_effect=requests.exceptions.ConnectionError("down"))
+def test_cursor_upstream_failure(mock_get, client, empty_snapshots):
+    """Test a snapshot that cannot be built while PNCP is down answers 503, without a negative entry."""
+    cursor = encode_cursor({"f": {"uf": "SP"}, "k": ["a", "b"], "n": 10}, current_config.SECRET_KEY)
+    with patch('app.core.services.pncp_service.negative_cache') as mock_negative:
+        response = client.get(f'/api/licitacoes/abertas?cursor={cursor}')
+
+    assert response.status_code == 503
+    assert response.get_json() == {"error": "Unable to connect to PNCP API"}
+    mock_negative.store.assert_not_called()
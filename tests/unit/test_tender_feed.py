@@ -0,0 +1,123 @@
+"""
+Unit tests for the live feed of new tenders.
+"""
+import json
+from unittest.mock import patch, MagicMock
+from app.core.services.tender_feed import SEEN_KEY, TenderFeed, matches, tender_feed
+
+SP_PREGAO = {
+    "numeroControlePNCP": "1-1-000001/2024", "objetoCompra": "Aquisição de NOTEBOOKS",
+    "unidadeOrgao": {"ufSigla": "SP"}, "modalidadeId": 6, "processo": "x"
+}
+MG_PREGAO = dict(SP_PREGAO, numeroControlePNCP="2-1-000002/2024", unidadeOrgao={"ufSigla": "MG"})
+
+
+def test_matches_filters():
+    """Test every given filter must match."""
+    assert matches(SP_PREGAO, {})
+    assert matches(SP_PREGAO, {"uf": "SP", "codigoModalidadeContratacao": "6", "palavraChave": "notebooks"})
+    assert not matches(SP_PREGAO, {"uf": "MG"})
+    assert not matches(SP_PREGAO, {"codigoModalidadeContratacao": "8"})
+    assert not matches(SP_PREGAO, {"palavraChave": "cadeiras"})
+
+
+@patch('app.core.services.tender_feed.upstream_client')
+@patch('app.core.services.tender_feed.redis_client')
+def test_poll_publishes_only_new_tenders(mock_redis, mock_upstream):
+    """Test the first poll only seeds the seen set and later polls publish what is new."""
+    page = MagicMock(status_code=200)
+    mock_upstream.get.return_value = page
+    mock_upstream.parse_json.return_value = {"data": [SP_PREGAO, MG_PREGAO], "totalPaginas": 1}
+    feed = TenderFeed()
+
+    mock_redis.exists.return_value = False
+    mock_redis.add_members.return_value = [SP_PREGAO["numeroControlePNCP"], MG_PREGAO["numeroControlePNCP"]]
+    assert feed.poll() == 0
+    mock_redis.publish.assert_not_called()
+
+    mock_redis.exists.return_value = True
+    mock_redis.add_members.return_value = [MG_PREGAO["numeroControlePNCP"]]
+    assert feed.poll() == 1
+    channel, message = mock_redis.publish.call_args.args
+    assert channel == feed.channel
+    assert message["tenders"] == [MG_PREGAO]
+    assert mock_redis.add_members.call_args.args[0] == SEEN_KEY
+    # One page was enough
+    assert mock_upstream.get.call_count == 2
+
+
+@patch('app.core.services.tender_feed.redis_client')
+def test_only_the_leader_polls(mock_redis):
+    """Test the poll loop runs only while this worker holds the leader lock."""
+    lock = mock_redis.lock.return_value
+    lock.acquire.return_value = False
+    feed = TenderFeed()
+
+    assert not feed._lead()
+    lock.acquire.return_value = True
+    assert feed._lead()
+    # The leader extends its lock instead of acquiring it again
+    assert feed._lead()
+    lock.reacquire.assert_called_once()
+
+    lock.reacquire.side_effect = Exception("not owned")
+    assert not feed._lead()
+
+
+def test_stream_delivers_matching_tenders(client, monkeypatch):
+    """Test a stream receives the published tenders matching its filters, projected."""
+    monkeypatch.setattr(tender_feed, 'enabled', True)
+    monkeypatch.setattr(tender_feed, 'heartbeat', 0.01)
+    monkeypatch.setattr(tender_feed, 'max_stream_seconds', 0.2)
+    monkeypatch.setattr(tender_feed, 'ensure_listening', lambda: None)
+
+    response = client.get('/api/licitacoes/stream?uf=sp&fields=numeroControlePNCP,objetoCompra')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    events = (chunk.decode('utf-8') for chunk in response.response)
+    assert next(events).startswith("retry:")
+    assert tender_feed.dispatch({"tenders": [SP_PREGAO, MG_PREGAO]}) == 1
+    event = next(events)
+    while event.startswith(":"):
+        event = next(events)
+    name, data = event.strip().split("\n")
+    assert name == "event: tenders"
+    assert json.loads(data[len("data: "):]) == [
+        {"numeroControlePNCP": SP_PREGAO["numeroControlePNCP"], "objetoCompra": SP_PREGAO["objetoCompra"]}
+    ]
+
+    # Once the stream ends the subscriber is gone
+    list(events)
+    assert tender_feed.dispatch({"tenders": [SP_PREGAO]}) == 0
+
+
+def test_stream_rejects_bad_filters_and_overload(client, monkeypatch):
+    """Test invalid filters are rejected and streams are capped per worker."""
+    assert client.get('/api/licitacoes/stream').status_code == 404
+
+    monkeypatch.setattr(tender_feed, 'enabled', True)
+    assert client.get('/api/licitacoes/stream?uf=S').status_code == 400
+    assert client.get('/api/licitacoes/stream?codigoModalidadeContratacao=x').status_code == 400
+
+    monkeypatch.setattr(tender_feed, 'max_clients', 0)
+    response = client.get('/api/licitacoes/stream')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '5'
+
+
+def test_stream_slot_reserved_before_streaming(client, monkeypatch):
+    """Test a stream holds its slot as soon as it is accepted and frees it when closed unread."""
+    monkeypatch.setattr(tender_feed, 'enabled', True)
+    monkeypatch.setattr(tender_feed, 'max_clients', 1)
+
+    first = client.get('/api/licitacoes/stream')
+    assert first.status_code == 200
+    assert client.get('/api/licitacoes/stream').status_code == 503
+
+    first.close()
+    assert tender_feed.dispatch({"tenders": [SP_PREGAO]}) == 0
+    second = client.get('/api/licitacoes/stream')
+    assert second.status_code == 200
+    second.close()
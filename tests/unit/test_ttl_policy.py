@@ -0,0 +1,62 @@
+"""
+Unit tests for the cache TTL policy.
+"""
+import json
+from datetime import date
+from unittest.mock import patch, MagicMock
+import pytest
+from app.core.services.ttl_policy import TTLPolicy, ttl_policy
+
+TODAY = date(2024, 6, 15)
+
+
+@pytest.fixture
+def policy():
+    """Policy with round numbers."""
+    policy = TTLPolicy({"uf_stats": 900, "planos_stats": 21600})
+    policy.default_ttl = 600
+    policy.recent_past_ttl = 3600
+    policy.closed_past_ttl = 86400
+    policy.settle_days = 3
+    policy.max_ttl = 172800
+    return policy
+
+
+def test_current_window_uses_namespace_ttl(policy):
+    """Test a window that includes today keeps the namespace's short TTL."""
+    assert policy.ttl("uf_stats", TODAY, today=TODAY) == 900
+    assert policy.ttl("uf_stats", date(2024, 7, 1), today=TODAY) == 900
+    assert policy.ttl("uf_stats", None, today=TODAY) == 900
+    assert policy.ttl("unknown", None, today=TODAY) == 600
+
+
+def test_past_windows_cached_longer(policy):
+    """Test past windows are cached for an hour until they settle, then for a day."""
+    assert policy.ttl("uf_stats", date(2024, 6, 13), today=TODAY) == 3600
+    assert policy.ttl("uf_stats", date(2024, 6, 1), today=TODAY) == 86400
+    # Never shorter than the namespace's own TTL, never longer than the tag sets
+    assert policy.ttl("planos_stats", date(2024, 6, 14), today=TODAY) == 21600
+    policy.max_ttl = 7200
+    assert policy.ttl("uf_stats", date(2023, 12, 31), today=TODAY) == 7200
+
+
+def test_window_end():
+    """Test the window ends on dataFinal, or on the last day of ano."""
+    assert TTLPolicy.window_end({"dataInicial": "20240101", "dataFinal": "20240131"}) == date(2024, 1, 31)
+    assert TTLPolicy.window_end({"ano": "2023"}) == date(2023, 12, 31)
+    assert TTLPolicy.window_end({"dataFinal": "31/01/2024"}) is None
+    assert TTLPolicy.window_end({"pagina": 1}) is None
+
+
+@patch('app.core.services.upstream.requests.Session.get')
+def test_closed_stats_window_cached_long(mock_get, client):
+    """Test a stats query over a closed past window is cached with the closed TTL."""
+    mock_get.return_value = MagicMock(status_code=200, content=json.dumps([{"uf": "SP", "quantidade": 3}]).encode())
+    with patch('app.core.services.pncp_service.redis_client') as mock_redis:
+        mock_redis.get_many.return_value = [None, None]
+        response = client.get('/api/estatisticas/uf?dataInicial=2020-01-01&dataFinal=2020-01-31')
+
+    assert response.status_code == 200
+    key, _, ttl, _ = mock_redis.set.call_args.args
+    assert key.startswith("uf_stats:")
+    assert ttl == min(ttl_policy.closed_past_ttl, ttl_policy.max_ttl)